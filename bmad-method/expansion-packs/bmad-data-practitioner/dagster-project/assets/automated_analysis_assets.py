@@ -21,7 +21,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-analysis')
 
 from eda_automation import EDAAutomation
 from hypothesis_generation import HypothesisGenerator
-from statistical_testing import StatisticalTester
+from statistical_testing import StatisticalTester, suite_load_options
 from pattern_detection import PatternDetector
 
 
@@ -169,7 +169,8 @@ def statistical_testing(context: AssetExecutionContext, config: AnalysisConfig)
         # Initialize statistical tester
         tester = StatisticalTester(
             alpha=config.statistical_alpha,
-            correction_method='benjamini_hochberg'
+            correction_method='benjamini_hochberg',
+            result_cache={'enabled': config.cache_enabled}
         )
         
         # Load data and hypotheses
@@ -194,8 +195,8 @@ def statistical_testing(context: AssetExecutionContext, config: AnalysisConfig)
             }
             test_specifications.append(test_spec)
         
-        # Load data
-        data = tester.load_data(data_source)
+        # Load only the columns the tests use
+        data = tester.load_data(data_source, **suite_load_options({'tests': test_specifications}))
         
         # Execute test suite
         test_results = tester.execute_test_suite(data, test_specifications)
@@ -217,6 +218,7 @@ def statistical_testing(context: AssetExecutionContext, config: AnalysisConfig)
             metadata={
                 "tests_executed": MetadataValue.int(successful_tests),
                 "significant_results": MetadataValue.int(significant_results),
+                "cached_tests": MetadataValue.int(test_results['metadata'].get('cached_tests', 0)),
                 "alpha_level": MetadataValue.float(config.statistical_alpha),
                 "correction_method": MetadataValue.text("benjamini_hochberg"),
                 "output_path": MetadataValue.path(output_path)
@@ -9,10 +9,67 @@ from dagster import (
     DefaultScheduleStatus,
     RunRequest,
     SkipReason,
-    job
+    job,
+    op,
+    OpExecutionContext,
+    Config
 )
 from datetime import datetime, time
+from typing import Any, Dict, Optional
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-analysis'))
+
+from pattern_detection import run_command
+
+
+class AnomalyScoringConfig(Config):
+    """Incremental anomaly scoring of the lookback window (pattern_detection.py `score` command)"""
+    data_source: str = "/tmp/ingested_data.csv"  # Placeholder, as in the analysis assets
+    method: str = "isolation_forest"
+    time_column: str = "timestamp"
+    reference_window_hours: Optional[int] = 168
+    refit_hours: int = 24
+
+
+class HourlyIncrementalConfig(Config):
+    """Configuration for the hourly incremental run"""
+    incremental_only: bool = True
+    max_runtime_minutes: int = 15
+    execution_hour: int = 0
+    lookback_hours: int = 2
+    schedule_name: str = "hourly_incremental"
+    anomaly_scoring: AnomalyScoringConfig
+
+
+@op(
+    name="hourly_incremental_pipeline",
+    description="Score the last lookback_hours of data against a reference model fitted on history"
+)
+def hourly_incremental_pipeline_op(context: OpExecutionContext, config: HourlyIncrementalConfig) -> Dict[str, Any]:
+    """Score only the recent partition; the reference model is refitted every refit_hours"""
+    scoring = config.anomaly_scoring
+    result = run_command('score', {
+        'data_source': scoring.data_source,
+        'method': scoring.method,
+        'incremental': {
+            'time_column': scoring.time_column,
+            'lookback_hours': config.lookback_hours,
+            'reference_window_hours': scoring.reference_window_hours,
+            'refit_hours': scoring.refit_hours
+        }
+    })
+    if not result['success']:
+        raise RuntimeError(f"Incremental anomaly scoring failed: {result['error']}")
+    
+    metadata = result['metadata']
+    context.log.info(
+        f"Scored {metadata['scored_rows']} rows from the last {config.lookback_hours}h: "
+        f"{len(result['anomalies'])} anomalies (reference model refitted: {metadata['refitted']})"
+    )
+    return metadata
+
 
 @job(
     name="hourly_incremental_pipeline",
@@ -24,7 +81,7 @@ def hourly_incremental_pipeline_job():
     Job definition for hourly incremental pipeline execution
     Focuses on incremental updates and real-time data processing
     """
-    pass
+    hourly_incremental_pipeline_op()
 
 @schedule(
     job=hourly_incremental_pipeline_job,
@@ -64,7 +121,16 @@ def hourly_incremental_schedule(context: ScheduleEvaluationContext):
                     "max_runtime_minutes": 15,
                     "execution_hour": hour,
                     "lookback_hours": 2,  # Process data from last 2 hours
-                    "schedule_name": "hourly_incremental"
+                    "schedule_name": "hourly_incremental",
+                    # Score only the lookback window against a reference model
+                    # fitted on history (pattern_detection.py `score` command)
+                    "anomaly_scoring": {
+                        "data_source": os.getenv('ANOMALY_DATA_SOURCE', '/tmp/ingested_data.csv'),
+                        "method": os.getenv('ANOMALY_METHOD', 'isolation_forest'),
+                        "time_column": os.getenv('ANOMALY_TIME_COLUMN', 'timestamp'),
+                        "reference_window_hours": int(os.getenv('ANOMALY_REFERENCE_WINDOW_HOURS', '168')),
+                        "refit_hours": int(os.getenv('ANOMALY_REFIT_HOURS', '24'))
+                    }
                 }
             }
         }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Analysis Cache
+Persistent on-disk cache and data fingerprinting for the python-analysis scripts
+Supports size-bounded LRU eviction and schema-plus-content dataset fingerprints
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def frame_fingerprint(data: pd.DataFrame, sample_rows: Optional[int] = None) -> str:
+    """Schema plus content hash of a DataFrame
+
+    When ``sample_rows`` is set and the frame is larger, only an evenly
+    strided row sample (always including the first and last rows) is hashed.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(name), str(dtype)] for name, dtype in data.dtypes.items()]).encode())
+    digest.update(str(data.shape).encode())
+
+    if sample_rows and len(data) > sample_rows:
+        data = data.iloc[np.linspace(0, len(data) - 1, sample_rows).astype(int)]
+
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def column_fingerprint(series: pd.Series) -> str:
+    """Dtype plus content hash of a single column"""
+    digest = hashlib.sha256()
+    digest.update(f"{series.name}:{series.dtype}:{len(series)}".encode())
+    digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Pickle-backed on-disk cache with size-bounded LRU eviction
+
+    Each entry is one file named by ``prefix`` plus its key. Reads refresh
+    the file's modification time, which orders eviction once ``max_bytes``
+    is exceeded. Only files with the prefix count toward the limit or are
+    evicted, so other files kept in the same directory are left alone.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024, prefix: str = 'entry-'):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+        # Ensure cache directory exists
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Stable key for JSON-serializable parts"""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f'{self.prefix}{key}.pkl'
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entry_path(key)
+        try:
+            with open(entry, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except Exception:
+            # Corrupt or incompatible entry: drop it and treat as a miss
+            entry.unlink(missing_ok=True)
+            self.misses += 1
+            return default
+
+        os.utime(entry)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        entry = self._entry_path(key)
+        temp_path = entry.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in self.path.glob(f'{self.prefix}*.pkl'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def stats(self) -> Dict[str, Any]:
+        sizes = [entry.stat().st_size for entry in self.path.glob(f'{self.prefix}*.pkl')]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(sizes),
+            'bytes': sum(sizes),
+            'max_bytes': self.max_bytes
+        }
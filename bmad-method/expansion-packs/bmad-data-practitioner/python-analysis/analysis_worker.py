@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Analysis Worker
+Long-lived worker serving the python-analysis scripts over newline-delimited JSON
+Keeps the interpreter, imported libraries and loaded datasets warm between requests
+"""
+
+import os
+import sys
+import json
+import argparse
+import importlib
+import threading
+import traceback
+import contextlib
+import socketserver
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from data_loader import load_options
+
+SCRIPTS = ('pattern_detection', 'statistical_testing', 'hypothesis_generation', 'eda_automation')
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for numpy scalars/arrays and other non-native values"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class DatasetCache:
+    """LRU cache of loaded DataFrames
+
+    Entries are keyed by source path, the file's size and modification time,
+    and any load options, so an edited file is read again. Sources that are
+    not files on disk (missing paths, table names) are never cached. Cached
+    frames are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, max_datasets: int = 4):
+        self.max_datasets = max_datasets
+        self.hits = 0
+        self.misses = 0
+        self._frames: 'OrderedDict[tuple, pd.DataFrame]' = OrderedDict()
+
+    def get(self, source: str, loader: Callable[[], pd.DataFrame],
+            options: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        try:
+            stat = os.stat(source)
+        except (OSError, TypeError):
+            return loader()
+
+        key = (os.path.abspath(source), stat.st_size, stat.st_mtime_ns,
+               json.dumps(options, sort_keys=True, default=str))
+        if key in self._frames:
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return self._frames[key]
+
+        self.misses += 1
+        frame = loader()
+        self._frames[key] = frame
+        while len(self._frames) > self.max_datasets:
+            self._frames.popitem(last=False)
+        return frame
+
+    def clear(self):
+        self._frames.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'datasets': len(self._frames),
+            'max_datasets': self.max_datasets,
+            'bytes': int(sum(frame.memory_usage(deep=True).sum() for frame in self._frames.values()))
+        }
+
+
+class AnalysisWorker:
+    """Dispatches requests to the analysis scripts, sharing loaded datasets
+
+    A request is ``{"id": ..., "script": ..., "command": ..., "params": {...}}``
+    where ``params`` has the same shape as the script's CLI input. Requests
+    without a ``script`` are worker control commands (``ping``, ``stats``,
+    ``clear_cache``, ``shutdown``).
+    """
+
+    def __init__(self, max_datasets: int = 4):
+        self.datasets = DatasetCache(max_datasets)
+        self.requests_served = 0
+        self.started_at = datetime.now()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request; never raises"""
+        request_id = request.get('id')
+        try:
+            # Keep stray prints from libraries off the response stream
+            with contextlib.redirect_stdout(sys.stderr):
+                result = self._dispatch(request)
+            return {'id': request_id, 'success': True, 'result': result}
+        except Exception as e:
+            return {
+                'id': request_id,
+                'success': False,
+                'error': str(e),
+                'traceback': traceback.format_exc()
+            }
+        finally:
+            self.requests_served += 1
+
+    def _dispatch(self, request: Dict[str, Any]) -> Any:
+        script = request.get('script')
+        command = request.get('command')
+        params = request.get('params') or {}
+
+        if script is None:
+            if command == 'ping':
+                return {'status': 'ok'}
+            if command == 'stats':
+                return self.stats()
+            if command == 'clear_cache':
+                self.datasets.clear()
+                return self.stats()
+            raise ValueError(f"Unknown worker command: {command}")
+
+        handlers = {
+            'pattern_detection': self._run_pattern_detection,
+            'statistical_testing': self._run_statistical_testing,
+            'hypothesis_generation': self._run_hypothesis_generation,
+            'eda_automation': self._run_eda_automation
+        }
+        if script not in handlers:
+            raise ValueError(f"Unknown script: {script}. Available: {list(SCRIPTS)}")
+
+        return handlers[script](command, params)
+
+    def _run_pattern_detection(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        module = importlib.import_module('pattern_detection')
+        data = None
+        if not (command == 'detect' and params.get('streaming', False)):
+            detector = module.PatternDetector(params.get('config', {}))
+            source = params['data_source']
+            options = load_options(params.get('load'))
+            data = self.datasets.get(source, lambda: detector.load_data(source, **options), options or None)
+        return module.run_command(command, params, data)
+
+    def _run_statistical_testing(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        module = importlib.import_module('statistical_testing')
+        data = None
+        if not params.get('streaming', False):
+            tester = module.StatisticalTester()
+            source = params['data_source']
+            # Only an explicit projection is applied, so one full frame serves every suite
+            options = load_options(params.get('load'))
+            data = self.datasets.get(source, lambda: tester.load_data(source, **options), options or None)
+        return module.run_tests(params, data)
+
+    def _run_hypothesis_generation(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        module = importlib.import_module('hypothesis_generation')
+        data = None
+        source = params.get('data')
+        if source:
+            generator = module.HypothesisGenerator(params.get('config') or {})
+            options = load_options(params.get('load'))
+            data = self.datasets.get(source, lambda: generator.load_data(source, **options), options or None)
+
+        result = module.run_command(command, params, data)
+        if isinstance(result, str):
+            return {'format': params.get('output', 'json'), 'content': result}
+        return result
+
+    def _run_eda_automation(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        module = importlib.import_module('eda_automation')
+        eda = module.EDAAutomation(params)
+        data_config = params.get('data_config', {})
+
+        # A plain full CSV read is the same frame the other scripts load
+        options = None
+        if (data_config.get('type', 'csv') != 'csv' or eda.sampling.get('enabled', False)
+                or any(data_config.get(key) for key in ('columns', 'filters', 'optimize'))):
+            options = {'data_config': data_config, 'sampling': eda.sampling}
+
+        data = self.datasets.get(data_config.get('source'), eda.load_data, options)
+        return eda.run_analysis(data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'started_at': self.started_at.isoformat(),
+            'uptime_seconds': (datetime.now() - self.started_at).total_seconds(),
+            'requests_served': self.requests_served,
+            'loaded_scripts': [name for name in SCRIPTS if name in sys.modules],
+            'dataset_cache': self.datasets.stats()
+        }
+
+
+def _parse_request(line: str) -> Dict[str, Any]:
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError('Request must be a JSON object')
+    return request
+
+
+def _respond(worker: AnalysisWorker, line: str) -> Optional[Dict[str, Any]]:
+    """Response for one request line, or None to stop serving"""
+    try:
+        request = _parse_request(line)
+    except ValueError as e:
+        return {'id': None, 'success': False, 'error': f'Invalid request: {str(e)}'}
+
+    if request.get('script') is None and request.get('command') == 'shutdown':
+        return None
+    return worker.handle(request)
+
+
+def _encode(response: Dict[str, Any]) -> str:
+    return json.dumps(response, default=_json_default) + '\n'
+
+
+def serve_stdio(worker: AnalysisWorker):
+    """Serve newline-delimited JSON requests from stdin until EOF or shutdown"""
+    output = sys.stdout
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        response = _respond(worker, line)
+        if response is None:
+            output.write(_encode({'id': None, 'success': True, 'result': {'status': 'shutdown'}}))
+            output.flush()
+            break
+        output.write(_encode(response))
+        output.flush()
+
+
+def serve_socket(worker: AnalysisWorker, socket_path: str):
+    """Serve newline-delimited JSON requests on a unix socket
+
+    Connections are handled one at a time, so requests never run concurrently
+    against the shared dataset cache.
+    """
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode('utf-8')
+                if not line.strip():
+                    continue
+                response = _respond(worker, line)
+                if response is None:
+                    self.wfile.write(_encode({'id': None, 'success': True, 'result': {'status': 'shutdown'}}).encode('utf-8'))
+                    # shutdown() blocks until serve_forever returns, so call it off this thread
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                self.wfile.write(_encode(response).encode('utf-8'))
+                self.wfile.flush()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    try:
+        with socketserver.UnixStreamServer(socket_path, RequestHandler) as server:
+            print(f"Analysis worker listening on {socket_path}", file=sys.stderr)
+            server.serve_forever()
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Long-lived worker for the python-analysis scripts')
+    parser.add_argument('--socket', type=str, help='Serve on this unix socket path instead of stdin/stdout')
+    parser.add_argument('--max-datasets', type=int, default=4, help='Number of loaded datasets kept in memory')
+    parser.add_argument('--preload', nargs='*', default=[], choices=SCRIPTS,
+                        help='Script modules to import before the first request')
+
+    args = parser.parse_args()
+
+    worker = AnalysisWorker(max_datasets=args.max_datasets)
+    for name in args.preload:
+        with contextlib.redirect_stdout(sys.stderr):
+            importlib.import_module(name)
+
+    if args.socket:
+        serve_socket(worker, args.socket)
+    else:
+        serve_stdio(worker)
+
+
+if __name__ == '__main__':
+    main()
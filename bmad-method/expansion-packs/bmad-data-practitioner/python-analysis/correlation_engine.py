@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Correlation Engine
+Blocked Pearson correlation for wide tables
+Computes the matrix one strip of rows at a time and yields only the pairs above a threshold
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Iterator, Tuple, Union
+
+
+def _standardized(values: np.ndarray, dtype) -> np.ndarray:
+    """Columns centred and scaled to unit norm, so a dot product is their correlation"""
+    centered = values - values.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', centered, centered))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Constant columns become NaN, as in DataFrame.corr()
+        return (centered / norms).astype(dtype, copy=False)
+
+
+def _complete_strip(standardized: np.ndarray, start: int, stop: int) -> np.ndarray:
+    return standardized[:, start:stop].T @ standardized[:, start:]
+
+
+def _pairwise_strip(filled: np.ndarray, squared: np.ndarray, present: np.ndarray,
+                    start: int, stop: int) -> np.ndarray:
+    """Correlations over the rows where both columns are present (DataFrame.corr() semantics)"""
+    rows = slice(start, stop)
+    later = slice(start, None)
+
+    count = present[:, rows].T @ present[:, later]
+    sum_left = filled[:, rows].T @ present[:, later]
+    sum_right = present[:, rows].T @ filled[:, later]
+    sum_left_sq = squared[:, rows].T @ present[:, later]
+    sum_right_sq = present[:, rows].T @ squared[:, later]
+    sum_product = filled[:, rows].T @ filled[:, later]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = sum_product - sum_left * sum_right / count
+        variance_left = sum_left_sq - sum_left ** 2 / count
+        variance_right = sum_right_sq - sum_right ** 2 / count
+        correlation = covariance / np.sqrt(variance_left * variance_right)
+    correlation[count < 2] = np.nan
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def iter_correlation_strips(data: Union[pd.DataFrame, np.ndarray], block_size: int = 256,
+                            dtype=np.float64) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield ``(start, strip)`` where ``strip[a, b]`` is corr(column start + a, column start + b)
+
+    Each strip covers ``block_size`` columns against themselves and every
+    later column, so together the strips cover the upper triangle and only
+    ``block_size x n_columns`` values are held at a time. Missing values are
+    excluded pairwise as in ``DataFrame.corr()``. Columns are centred before
+    the cast to ``dtype``, which keeps float32 accurate to about 1e-6.
+    """
+    if isinstance(data, pd.DataFrame):
+        # Nullable extension dtypes hold pd.NA, which only converts with an explicit fill
+        values = data.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        values = np.asarray(data, dtype=np.float64)
+    n_columns = values.shape[1]
+    missing = np.isnan(values)
+
+    if not missing.any():
+        standardized = _standardized(values, dtype)
+        for start in range(0, n_columns, block_size):
+            yield start, _complete_strip(standardized, start, min(start + block_size, n_columns))
+        return
+
+    present = (~missing).astype(dtype)
+    # Centring on the column means keeps the one-pass sums numerically stable
+    filled = np.where(missing, 0.0, values - np.nanmean(values, axis=0)).astype(dtype)
+    squared = filled ** 2
+    for start in range(0, n_columns, block_size):
+        yield start, _pairwise_strip(filled, squared, present, start, min(start + block_size, n_columns))
+
+
+def iter_high_correlations(data: Union[pd.DataFrame, np.ndarray], threshold: float = 0.7,
+                           block_size: int = 256, dtype=np.float64
+                           ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield ``(left, right, correlation)`` arrays of column pairs with ``|r| > threshold``
+
+    Pairs come out with ``left < right`` in row-major order of the upper
+    triangle, the same order as walking ``DataFrame.corr()`` pair by pair.
+    """
+    for start, strip in iter_correlation_strips(data, block_size, dtype):
+        # Keep only pairs right of the diagonal
+        upper = np.arange(strip.shape[1]) > np.arange(strip.shape[0])[:, None]
+        left, right = np.nonzero(upper & (np.abs(strip) > threshold))
+        if len(left):
+            yield left + start, right + start, strip[left, right].astype(np.float64)
+
+
+def correlation_matrix(data: Union[pd.DataFrame, np.ndarray], block_size: int = 256,
+                       dtype=np.float64) -> np.ndarray:
+    """Full symmetric correlation matrix assembled from the strips"""
+    n_columns = np.shape(data)[1]
+    matrix = np.zeros((n_columns, n_columns))
+    for start, strip in iter_correlation_strips(data, block_size, dtype):
+        matrix[start:start + len(strip), start:] = strip
+    return np.triu(matrix) + np.triu(matrix, 1).T
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Data Loader
+Shared loading path for the python-analysis scripts
+Reads CSV/JSON/Excel, Parquet, Arrow IPC/Feather and DuckDB with column projection and filter pushdown
+Optionally shrinks the loaded frame with lossless numeric downcasts, categoricals and Arrow strings
+Uniform and stratified samples are drawn inside DuckDB so only the sampled rows reach pandas
+"""
+
+import os
+import sys
+import operator
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+LOADER_FORMATS = ('csv', 'json', 'jsonl', 'xlsx', 'parquet', 'arrow', 'duckdb')
+# Options accepted by load_frame, e.g. from a script's ``load`` parameter
+LOAD_OPTIONS = ('columns', 'filters', 'source_type', 'table', 'query', 'database_path', 'memory_map', 'limit',
+                'optimize', 'sample')
+SAMPLE_METHODS = ('reservoir', 'stratified')
+
+_EXTENSIONS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.xlsx': 'xlsx',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.arrows': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+    '.duckdb': 'duckdb',
+    '.ddb': 'duckdb'
+}
+
+_COMPARISONS = {
+    '=': operator.eq, '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge
+}
+
+
+def source_format(source: str, source_type: Optional[str] = None) -> str:
+    """Format of a source, from ``source_type`` or the file extension"""
+    if source_type:
+        if source_type not in LOADER_FORMATS:
+            raise ValueError(f"Unsupported source type: {source_type}. Available: {list(LOADER_FORMATS)}")
+        return source_type
+    if os.path.isdir(source):
+        # Directories are read as (possibly partitioned) Parquet datasets
+        return 'parquet'
+    extension = os.path.splitext(source)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"Unsupported file format: {source}")
+    return _EXTENSIONS[extension]
+
+
+def _disjunction(filters: Optional[Sequence]) -> List[List[Tuple[str, str, Any]]]:
+    """Filters as OR-of-AND groups; a flat list of (column, op, value) is one AND group"""
+    if not filters:
+        return []
+    if isinstance(filters[0], (list, tuple)) and filters[0] and isinstance(filters[0][0], (list, tuple)):
+        return [[tuple(term) for term in group] for group in filters]
+    return [[tuple(term) for term in filters]]
+
+
+def _filter_columns(filters: Optional[Sequence]) -> List[str]:
+    return list(dict.fromkeys(column for group in _disjunction(filters) for column, _, _ in group))
+
+
+def _filter_frame(frame: pd.DataFrame, filters: Optional[Sequence]) -> pd.DataFrame:
+    groups = _disjunction(filters)
+    if not groups:
+        return frame
+
+    keep = pd.Series(False, index=frame.index)
+    for group in groups:
+        match = pd.Series(True, index=frame.index)
+        for column, op, value in group:
+            if op == 'in':
+                match &= frame[column].isin(value)
+            elif op == 'not in':
+                match &= ~frame[column].isin(value)
+            elif op in _COMPARISONS:
+                match &= _COMPARISONS[op](frame[column], value)
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        keep |= match
+    return frame[keep]
+
+
+def _sql_filters(filters: Optional[Sequence]) -> Tuple[str, List[Any]]:
+    groups = _disjunction(filters)
+    if not groups:
+        return '', []
+
+    clauses, values = [], []
+    for group in groups:
+        terms = []
+        for column, op, value in group:
+            if op in ('in', 'not in'):
+                value = list(value)
+                terms.append(f"{_quote(column)} {op.upper()} ({', '.join('?' for _ in value)})")
+                values.extend(value)
+            elif op in _COMPARISONS:
+                terms.append(f"{_quote(column)} {'=' if op == '==' else op} ?")
+                values.append(value)
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        clauses.append('(' + ' AND '.join(terms) + ')')
+    return ' WHERE ' + ' OR '.join(clauses), values
+
+
+def _quote(identifier: str) -> str:
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _read_arrow(source: str, columns: Optional[List[str]], filters: Optional[Sequence], memory_map: bool):
+    import pyarrow as pa
+
+    # A mapped file is read without copying, so only the filtered rows and
+    # projected columns are materialized by to_pandas()
+    handle = pa.memory_map(source) if memory_map else pa.OSFile(source)
+    try:
+        table = pa.ipc.open_file(handle).read_all()
+    except pa.ArrowInvalid:
+        handle.seek(0)
+        table = pa.ipc.open_stream(handle).read_all()
+
+    if filters:
+        import pyarrow.parquet as pq
+        table = table.filter(pq.filters_to_expression(filters))
+    return table.select(columns) if columns else table
+
+
+def _file_relation(fmt: str, source: str) -> str:
+    """DuckDB table function scanning a CSV or Parquet source"""
+    if fmt == 'csv':
+        return f"read_csv_auto({_literal(source)})"
+    if os.path.isdir(source):
+        return f"read_parquet({_literal(os.path.join(source, '**', '*.parquet'))}, hive_partitioning = true)"
+    return f"read_parquet({_literal(source)})"
+
+
+def _literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _sample_spec(sample: Dict[str, Any]) -> Dict[str, Any]:
+    spec = {'method': 'reservoir', 'size': 10000, 'seed': 42, 'strata': [], 'min_per_stratum': 1, **sample}
+    if isinstance(spec['strata'], str):
+        spec['strata'] = [spec['strata']]
+    if spec['method'] not in SAMPLE_METHODS:
+        raise ValueError(f"Unknown sample method: {spec['method']}. Available: {list(SAMPLE_METHODS)}")
+    if spec['method'] == 'stratified' and not spec['strata']:
+        raise ValueError("Stratified sampling needs 'strata' columns")
+    return spec
+
+
+def _plain(value: Any) -> Any:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
+
+
+def _sample_report(frame: pd.DataFrame, spec: Dict[str, Any], population_rows: int, pushed_down: bool,
+                   strata: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Size, seed and per-stratum coverage of a drawn sample"""
+    report = {
+        'method': spec['method'],
+        'requested_size': spec['size'],
+        'seed': spec['seed'],
+        'sample_rows': len(frame),
+        'population_rows': int(population_rows),
+        'sampling_fraction': len(frame) / population_rows if population_rows else 0.0,
+        'pushed_down': pushed_down
+    }
+    if strata is not None:
+        report['strata'] = strata
+    return report
+
+
+def _strata_summary(keys: pd.DataFrame, stratum_rows: np.ndarray, sampled: np.ndarray) -> List[Dict[str, Any]]:
+    """Population and sample rows per stratum, from per-row stratum sizes and sample flags"""
+    ids = keys.groupby(list(keys.columns), dropna=False, observed=True).ngroup().to_numpy()
+    _, first = np.unique(ids, return_index=True)
+    counts = np.bincount(ids, weights=sampled.astype(float))
+    return [
+        {
+            'values': {column: _plain(keys[column].iloc[row]) for column in keys.columns},
+            'population_rows': int(stratum_rows[row]),
+            'sample_rows': int(counts[group])
+        }
+        for group, row in enumerate(first)
+    ]
+
+
+def _numpy_dtypes(frame: pd.DataFrame) -> pd.DataFrame:
+    """DuckDB's nullable columns as the numpy dtypes pandas readers produce
+
+    Integers with nulls become float64 with NaN and booleans with nulls
+    become object, so a sampled load has the same dtypes as a full one.
+    """
+    for column in frame.columns:
+        dtype = frame[column].dtype
+        if not isinstance(dtype, pd.api.extensions.ExtensionDtype) or dtype.kind not in 'iufb':
+            continue
+        values = frame[column]
+        if not values.hasnans:
+            frame[column] = values.to_numpy(dtype=dtype.numpy_dtype)
+        elif dtype.kind == 'b':
+            frame[column] = values.astype(object).where(values.notna(), np.nan)
+        else:
+            frame[column] = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return frame
+
+
+def _read_duckdb(relation: str, columns: Optional[List[str]], filters: Optional[Sequence],
+                 database_path: Optional[str], limit: Optional[int],
+                 sample: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    import duckdb
+
+    select = ', '.join(_quote(column) for column in columns) if columns else '*'
+    where, values = _sql_filters(filters)
+
+    spec = _sample_spec(sample) if sample else None
+    strata = []
+    if spec and spec['method'] == 'stratified':
+        strata = [column for column in spec['strata'] if columns and column not in columns]
+        if strata:
+            select += ', ' + ', '.join(map(_quote, strata))
+    statement = f'SELECT {select} FROM {relation} AS source{where}'
+
+    read_only = database_path is not None and os.path.exists(database_path)
+    conn = duckdb.connect(database_path or ':memory:', read_only=read_only)
+    try:
+        if spec is None:
+            if limit is not None:
+                statement += f' LIMIT {int(limit)}'
+            return _numpy_dtypes(conn.execute(statement, values).df())
+
+        if spec['method'] == 'reservoir':
+            population_rows = conn.execute(f'SELECT count(*) FROM ({statement}) AS filtered', values).fetchone()[0]
+            frame = conn.execute(
+                f"SELECT * FROM ({statement}) AS filtered "
+                f"USING SAMPLE reservoir({int(spec['size'])} ROWS) REPEATABLE ({int(spec['seed'])})",
+                values
+            ).df()
+            frame = _numpy_dtypes(frame)
+            report = _sample_report(frame, spec, population_rows, True)
+        else:
+            numbered = None
+            if _has_rowid(conn, relation):
+                numbered = f'SELECT {select}, source.rowid AS __row FROM {relation} AS source{where}'
+            frame = _numpy_dtypes(conn.execute(_stratified_sql(statement, spec, numbered), values * 2).df())
+            population_rows = int(frame['__population_rows'].iloc[0]) if len(frame) else 0
+            summary = _strata_summary(frame[spec['strata']], frame['__stratum_rows'].to_numpy(),
+                                      np.ones(len(frame), dtype=bool))
+            frame = frame.drop(columns=['__stratum_rows', '__population_rows'])
+            report = _sample_report(frame, spec, population_rows, True, summary)
+            frame = frame.drop(columns=strata)
+    finally:
+        conn.close()
+
+    if limit is not None:
+        frame = frame.head(limit)
+    frame.attrs['sampling'] = report
+    return frame
+
+
+def _has_rowid(conn, relation: str) -> bool:
+    """Whether a DuckDB relation is a base table with stable row ids"""
+    import duckdb
+
+    try:
+        conn.execute(f'SELECT rowid FROM {relation} AS source LIMIT 0')
+    except duckdb.Error:
+        return False
+    return True
+
+
+def _stratified_sql(statement: str, spec: Dict[str, Any], numbered: Optional[str] = None) -> str:
+    """Proportional stratified sample of ``statement``'s rows, at least ``min_per_stratum`` per stratum
+
+    Strata are counted in one aggregate pass. Rows are then ranked by a
+    seeded hash of their row number (not of their values, which would keep
+    or drop duplicate rows all together). ``numbered`` is ``statement`` with
+    a stable ``__row`` column, such as a base table's rowid. Without one
+    (file scans, views and queries, whose scan order is not guaranteed)
+    rows are numbered in the order of their values, which sorts the
+    filtered rows once; rows that compare equal are interchangeable, so
+    either way the draw is reproducible for the same rows. A hash threshold
+    keeps about 1.5 times each stratum's allocation as candidates, so only
+    those are ranked.
+    """
+    if numbered is None:
+        numbered = f"SELECT *, row_number() OVER (ORDER BY scanned) AS __row FROM ({statement}) AS scanned"
+    keys = ', '.join(_quote(column) for column in spec['strata'])
+    match = ' AND '.join(f'filtered.{_quote(c)} IS NOT DISTINCT FROM alloc.{_quote(c)}' for c in spec['strata'])
+    row_key = f"hash(filtered.__row, {int(spec['seed'])})"
+    allocation = (
+        f"SELECT *, least(n_h, greatest({int(spec['min_per_stratum'])}, "
+        f"round({int(spec['size'])} * n_h / population))) AS k_h "
+        f"FROM (SELECT {keys}, count(*) AS n_h, sum(count(*)) OVER () AS population "
+        f"FROM ({statement}) AS counted GROUP BY ALL) AS strata"
+    )
+    return (
+        f"SELECT filtered.* EXCLUDE (__row), alloc.n_h AS __stratum_rows, alloc.population AS __population_rows "
+        f"FROM ({numbered}) AS filtered "
+        f"JOIN ({allocation}) AS alloc ON {match} "
+        f"WHERE {row_key}::DOUBLE / 18446744073709551616.0 < 1.5 * alloc.k_h / alloc.n_h + 10.0 / alloc.n_h "
+        f"QUALIFY row_number() OVER (PARTITION BY {', '.join(f'filtered.{_quote(c)}' for c in spec['strata'])} "
+        f"ORDER BY {row_key}) <= alloc.k_h "
+        f"ORDER BY filtered.__row"
+    )
+
+
+def _sample_frame(frame: pd.DataFrame, sample: Dict[str, Any]) -> pd.DataFrame:
+    """The same sampling on an already loaded frame, for sources DuckDB does not scan"""
+    spec = _sample_spec(sample)
+    order = np.random.default_rng(spec['seed']).permutation(len(frame))
+    shuffled = frame.iloc[order]
+
+    if spec['method'] == 'reservoir':
+        result = shuffled.head(int(spec['size']))
+        result.attrs['sampling'] = _sample_report(result, spec, len(frame), False)
+        return result
+
+    groups = shuffled.groupby(spec['strata'], dropna=False, observed=True, sort=False)
+    stratum_rows = groups[spec['strata'][0]].transform('size').to_numpy()
+    allocation = np.minimum(stratum_rows, np.maximum(spec['min_per_stratum'],
+                                                     np.round(spec['size'] * stratum_rows / len(frame))))
+    keep = groups.cumcount().to_numpy() < allocation
+    result = shuffled[keep]
+    summary = _strata_summary(shuffled[spec['strata']], stratum_rows, keep)
+    result.attrs['sampling'] = _sample_report(result, spec, len(frame), False, summary)
+    return result
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def _optimized_column(series: pd.Series, category_threshold: float) -> pd.Series:
+    """Smallest lossless representation of one column, or the column itself"""
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series
+
+    if pd.api.types.is_integer_dtype(series.dtype) and isinstance(series.dtype, np.dtype):
+        # Arithmetic keeps the narrow type and wraps around, so never go below int32 and
+        # only when values fit in half its range: a sum or difference of two still fits
+        if series.dtype.itemsize <= 4 or not len(series):
+            return series
+        limit = np.iinfo(np.int32).max // 2
+        if series.min() >= -limit and series.max() <= limit:
+            return series.astype(np.int32)
+        return series
+
+    if pd.api.types.is_float_dtype(series.dtype) and series.dtype == np.float64:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        # Keep float32 only when every value round-trips exactly
+        with np.errstate(over='ignore', invalid='ignore'):
+            exact = (narrowed.astype(np.float64) == values) | (np.isnan(values) & np.isnan(narrowed))
+        return series.astype(np.float32) if exact.all() else series
+
+    if series.dtype == object:
+        if pd.api.types.infer_dtype(series, skipna=True) != 'string':
+            return series
+    elif not isinstance(series.dtype, pd.StringDtype):
+        return series
+
+    present = series.count()
+    if present and series.nunique() <= category_threshold * present:
+        return series.astype('category')
+    return series if isinstance(series.dtype, pd.StringDtype) else series.astype(pd.StringDtype('pyarrow'))
+
+
+def optimize_memory(frame: pd.DataFrame, category_threshold: float = 0.5, log: bool = True) -> pd.DataFrame:
+    """Frame with numerics downcast losslessly and strings as categoricals or Arrow strings
+
+    64-bit integer columns become int32 when their values fit in half its
+    range (so sums and differences of two values cannot overflow) and
+    float64 columns become float32 when every value is exactly representable.
+    String columns with at most ``category_threshold`` distinct values per
+    non-missing value become ``category``, the rest Arrow-backed strings.
+    Per-column sizes before and after are logged to stderr and kept in
+    ``frame.attrs['memory_optimization']``.
+    """
+    optimized = {}
+    report = []
+    for column in frame.columns:
+        series = frame[column]
+        before = int(series.memory_usage(index=False, deep=True))
+        result = _optimized_column(series, category_threshold)
+        after = int(result.memory_usage(index=False, deep=True))
+        if after >= before:
+            result, after = series, before
+        optimized[column] = result
+        report.append({
+            'column': str(column),
+            'dtype_before': str(series.dtype),
+            'dtype_after': str(result.dtype),
+            'bytes_before': before,
+            'bytes_after': after
+        })
+
+    result = pd.DataFrame(optimized, index=frame.index)
+    result.attrs.update(frame.attrs)
+    result.attrs['memory_optimization'] = report
+
+    if log:
+        for entry in report:
+            print(f"Memory: {entry['column']}: {entry['dtype_before']} {_format_bytes(entry['bytes_before'])}"
+                  f" -> {entry['dtype_after']} {_format_bytes(entry['bytes_after'])}", file=sys.stderr)
+        before = sum(entry['bytes_before'] for entry in report)
+        after = sum(entry['bytes_after'] for entry in report)
+        print(f"Memory: total {_format_bytes(before)} -> {_format_bytes(after)}", file=sys.stderr)
+    return result
+
+
+def load_frame(source: str, columns: Optional[List[str]] = None, filters: Optional[Sequence] = None,
+               source_type: Optional[str] = None, table: Optional[str] = None, query: Optional[str] = None,
+               database_path: Optional[str] = None, memory_map: bool = True,
+               limit: Optional[int] = None, optimize: Union[bool, Dict[str, Any]] = False,
+               sample: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """Load a source as a DataFrame, reading only ``columns`` and the rows matching ``filters``
+
+    ``filters`` use the pyarrow form: a list of ``(column, op, value)``
+    terms that must all hold, or a list of such lists of which any may
+    hold. Parquet and Arrow IPC apply projection and filters while
+    scanning, and DuckDB pushes them into the query. CSV, JSON and Excel
+    keep the pandas readers, so types are inferred as before, and are
+    filtered after reading. ``limit`` keeps the first rows only. Errors
+    are raised, never replaced with placeholder data.
+
+    ``optimize`` (True or ``optimize_memory`` keyword arguments) shrinks
+    the frame after loading; Arrow sources then convert strings straight
+    to Arrow-backed columns instead of Python objects.
+
+    ``sample`` draws ``{'method': 'reservoir' | 'stratified', 'size',
+    'seed', 'strata', 'min_per_stratum'}`` from the filtered rows. For CSV,
+    Parquet and DuckDB sources the draw runs inside DuckDB (``USING SAMPLE``
+    for reservoir samples), so only sampled rows are materialized; CSV
+    types then come from DuckDB's reader. A seeded stratified draw returns
+    the same rows for the same data, in any row order; it sorts the
+    filtered rows once unless the source is a DuckDB table with row ids.
+    The sample's size, seed and strata are reported in
+    ``frame.attrs['sampling']``.
+    """
+    frame = _load(source, columns, filters, source_type, table, query, database_path, memory_map, limit,
+                  bool(optimize), sample)
+    if optimize:
+        frame = optimize_memory(frame, **(optimize if isinstance(optimize, dict) else {}))
+    return frame
+
+
+def _load(source: Optional[str], columns: Optional[List[str]], filters: Optional[Sequence],
+          source_type: Optional[str], table: Optional[str], query: Optional[str], database_path: Optional[str],
+          memory_map: bool, limit: Optional[int], arrow_strings: bool,
+          sample: Optional[Dict[str, Any]]) -> pd.DataFrame:
+    fmt = source_format(source, source_type) if source or source_type else 'duckdb'
+    columns = list(columns) if columns else None
+
+    if fmt == 'duckdb':
+        if database_path is None and source and os.path.splitext(source)[1].lower() in ('.duckdb', '.ddb'):
+            database_path, source = source, None
+        # ``table`` (or the source itself) is used verbatim, so qualified names and table functions work
+        relation = f'({query})' if query else (table or source)
+        if not relation:
+            raise ValueError("DuckDB sources need a table or a query")
+        return _read_duckdb(relation, columns, filters, database_path, limit, sample)
+
+    if sample and fmt in ('csv', 'parquet'):
+        return _read_duckdb(_file_relation(fmt, source), columns, filters, None, limit, sample)
+    if sample:
+        # Strata outside the projection are read for the draw and dropped again
+        extra = [column for column in _sample_spec(sample)['strata'] if columns and column not in columns]
+        frame = _load(source, columns + extra if extra else columns, filters, fmt, table, query, database_path,
+                      memory_map, None, arrow_strings, None)
+        frame = _sample_frame(frame, sample).drop(columns=extra)
+        return frame.head(limit) if limit is not None else frame
+
+    if fmt in ('parquet', 'arrow'):
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            arrow_table = pq.read_table(source, columns=columns, filters=filters or None, memory_map=memory_map)
+        else:
+            arrow_table = _read_arrow(source, columns, filters, memory_map)
+        if limit is not None:
+            arrow_table = arrow_table.slice(0, limit)
+        if arrow_strings:
+            import pyarrow as pa
+            strings = {pa.string(): pd.StringDtype('pyarrow'), pa.large_string(): pd.StringDtype('pyarrow')}
+            return arrow_table.to_pandas(types_mapper=strings.get)
+        return arrow_table.to_pandas()
+
+    # Filter columns are read too and dropped again after filtering
+    needed = list(dict.fromkeys(columns + _filter_columns(filters))) if columns else None
+    if fmt == 'csv':
+        frame = pd.read_csv(source, usecols=needed, nrows=None if filters else limit)
+    elif fmt == 'xlsx':
+        frame = pd.read_excel(source, usecols=needed, nrows=None if filters else limit)
+    else:
+        frame = pd.read_json(source, lines=fmt == 'jsonl')
+        if needed:
+            frame = frame[needed]
+
+    frame = _filter_frame(frame, filters)
+    if columns:
+        frame = frame[columns]
+    if limit is not None:
+        frame = frame.head(limit)
+    return frame
+
+
+def iter_chunks(source: str, chunksize: int = 100000, columns: Optional[List[str]] = None,
+                source_type: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """Yield DataFrame chunks of up to ``chunksize`` rows of ``columns`` without loading the source whole
+
+    CSV and newline-delimited JSON use the chunked pandas readers, Parquet
+    files and dataset directories are scanned batch by batch, and Arrow IPC
+    files are memory-mapped. Other formats cannot be streamed.
+    """
+    fmt = source_format(source, source_type)
+    columns = list(columns) if columns else None
+
+    if fmt in ('csv', 'jsonl'):
+        if fmt == 'csv':
+            reader = pd.read_csv(source, usecols=columns, chunksize=chunksize)
+        else:
+            reader = pd.read_json(source, lines=True, chunksize=chunksize)
+        for chunk in reader:
+            # usecols keeps the file's column order; every format yields the requested one
+            yield chunk[columns] if columns else chunk
+    elif fmt == 'parquet':
+        import pyarrow.dataset as ds
+        for batch in ds.dataset(source, format='parquet').to_batches(columns=columns, batch_size=chunksize):
+            yield batch.to_pandas()
+    elif fmt == 'arrow':
+        for batch in _read_arrow(source, columns, None, True).to_batches(max_chunksize=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Streaming requires a CSV, newline-delimited JSON, Parquet or Arrow source: {source}")
+
+
+def load_options(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """load_frame keyword arguments from a ``load`` parameter dict"""
+    params = params or {}
+    unknown = set(params) - set(LOAD_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown load options: {sorted(unknown)}")
+    return dict(params)
@@ -13,6 +13,10 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 import warnings
 
+from correlation_engine import iter_high_correlations
+from data_loader import load_frame
+from fast_profile import profile_frame
+
 # Suppress warnings to clean up output
 warnings.filterwarnings('ignore')
 
@@ -34,33 +38,31 @@ class EDAAutomation:
         try:
             data_source = self.data_config.get('source')
             source_type = self.data_config.get('type', 'csv')
-            
-            # Load data based on source type
-            if source_type == 'csv':
-                if self.sampling.get('enabled', False):
-                    # Use sampling for large files
-                    sample_size = self.sampling.get('sample_size', 10000)
-                    df = pd.read_csv(data_source, nrows=sample_size)
-                else:
-                    df = pd.read_csv(data_source)
-            elif source_type == 'parquet':
-                df = pd.read_parquet(data_source)
-                if self.sampling.get('enabled', False):
-                    sample_size = self.sampling.get('sample_size', 10000)
-                    df = df.sample(n=min(sample_size, len(df)), random_state=42)
-            elif source_type == 'duckdb':
-                # Handle DuckDB queries
-                import duckdb
-                conn = duckdb.connect(self.data_config.get('database_path', ':memory:'))
-                query = self.data_config.get('query', f'SELECT * FROM {data_source}')
-                if self.sampling.get('enabled', False):
-                    sample_size = self.sampling.get('sample_size', 10000)
-                    query = f'{query} LIMIT {sample_size}'
-                df = conn.execute(query).df()
-                conn.close()
-            else:
+            if source_type not in ('csv', 'parquet', 'duckdb'):
                 raise ValueError(f"Unsupported data source type: {source_type}")
             
+            # Sampling runs inside DuckDB, so only the sampled rows are read into memory
+            sample = None
+            if self.sampling.get('enabled', False):
+                sample = {
+                    'method': self.sampling.get('method', 'reservoir'),
+                    'size': self.sampling.get('sample_size', 10000),
+                    'seed': self.sampling.get('seed', 42),
+                    'strata': self.sampling.get('strata', []),
+                    'min_per_stratum': self.sampling.get('min_per_stratum', 1)
+                }
+            
+            df = load_frame(
+                data_source,
+                columns=self.data_config.get('columns'),
+                filters=self.data_config.get('filters'),
+                source_type=source_type,
+                query=self.data_config.get('query'),
+                database_path=self.data_config.get('database_path'),
+                optimize=self.data_config.get('optimize', False),
+                sample=sample
+            )
+            
             return df
             
         except Exception as e:
@@ -111,17 +113,20 @@ class EDAAutomation:
             # Extract correlations (for numeric columns)
             numeric_cols = df.select_dtypes(include=['number']).columns
             if len(numeric_cols) > 1:
-                corr_matrix = df[numeric_cols].corr()
                 high_correlations = []
-                for i in range(len(corr_matrix.columns)):
-                    for j in range(i+1, len(corr_matrix.columns)):
-                        corr_val = corr_matrix.iloc[i, j]
-                        if abs(corr_val) > 0.7:  # High correlation threshold
-                            high_correlations.append({
-                                'variable_1': corr_matrix.columns[i],
-                                'variable_2': corr_matrix.columns[j],
-                                'correlation': corr_val
-                            })
+                # High correlation threshold; the matrix is computed in column strips
+                pairs = iter_high_correlations(
+                    df[numeric_cols], 0.7,
+                    self.tool_config.get('correlation_block_size', 256),
+                    self.tool_config.get('correlation_precision', 'float64')
+                )
+                for left, right, correlations in pairs:
+                    for i, j, corr_val in zip(left.tolist(), right.tolist(), correlations.tolist()):
+                        high_correlations.append({
+                            'variable_1': numeric_cols[i],
+                            'variable_2': numeric_cols[j],
+                            'correlation': corr_val
+                        })
                 insights['correlations'] = high_correlations
             
             # Check for data quality issues
@@ -135,7 +140,7 @@ class EDAAutomation:
                         'missing_percentage': missing_pct
                     })
                 
-                if df[col].dtype == 'object':
+                if pd.api.types.is_string_dtype(df[col].dtype):
                     unique_pct = (df[col].nunique() / len(df)) * 100
                     if unique_pct > 95:
                         warnings.append({
@@ -164,6 +169,48 @@ class EDAAutomation:
                 'error': f'pandas-profiling analysis failed: {str(e)}'
             }
     
+    def run_fast_profile(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Run the built-in fast profile (no report dependencies)"""
+        try:
+            profile = profile_frame(
+                df,
+                top_k=self.tool_config.get('top_k', 10),
+                bins=self.tool_config.get('histogram_bins', 20),
+                hll_precision=self.tool_config.get('hll_precision', 12),
+                max_top_k_distinct=self.tool_config.get('max_top_k_distinct', 10000),
+                block_size=self.tool_config.get('correlation_block_size', 256),
+                precision=self.tool_config.get('correlation_precision', 'float64')
+            )
+            
+            output_files = {}
+            
+            if 'json' in self.output_formats:
+                json_path = self.cache_path / f'fast_profile_report_{pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")}.json'
+                with open(json_path, 'w') as f:
+                    json.dump(profile, f, indent=2, default=str)
+                output_files['json'] = str(json_path)
+            
+            # Same insight structure as the profiling report, with the per-column profile as summary
+            insights = {
+                'dataset_info': profile['dataset_info'],
+                'correlations': profile['correlations'],
+                'warnings': profile['warnings'],
+                'summary': profile['columns']
+            }
+            
+            return {
+                'success': True,
+                'tool': 'fast_profile',
+                'output_files': output_files,
+                'insights': insights
+            }
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'fast_profile analysis failed: {str(e)}'
+            }
+    
     def run_sweetviz(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Run Sweetviz analysis"""
         try:
@@ -238,7 +285,7 @@ class EDAAutomation:
             if len(df.columns) > max_cols:
                 # Keep most important columns (numeric + target if specified)
                 numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                object_cols = df.select_dtypes(include=['object']).columns.tolist()
+                object_cols = df.select_dtypes(include=['object', 'string', 'category']).columns.tolist()
                 
                 # Balance numeric and categorical columns
                 selected_cols = numeric_cols[:max_cols//2] + object_cols[:max_cols//2]
@@ -305,11 +352,12 @@ class EDAAutomation:
                 'error': f'AutoViz analysis failed: {str(e)}'
             }
     
-    def run_analysis(self) -> Dict[str, Any]:
-        """Run the specified EDA tool analysis"""
+    def run_analysis(self, df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Run the specified EDA tool analysis (on ``df`` when already loaded)"""
         try:
             # Load data
-            df = self.load_data()
+            if df is None:
+                df = self.load_data()
             
             if df.empty:
                 return {
@@ -320,6 +368,8 @@ class EDAAutomation:
             # Run the specified tool
             if self.tool == 'pandas_profiling':
                 result = self.run_pandas_profiling(df)
+            elif self.tool == 'fast_profile':
+                result = self.run_fast_profile(df)
             elif self.tool == 'sweetviz':
                 result = self.run_sweetviz(df)
             elif self.tool == 'autoviz':
@@ -339,7 +389,9 @@ class EDAAutomation:
                     'columns': df.columns.tolist(),
                     'dtypes': df.dtypes.to_dict(),
                     'sampling_applied': self.sampling.get('enabled', False),
-                    'sample_size': len(df) if self.sampling.get('enabled', False) else None
+                    'sample_size': len(df) if self.sampling.get('enabled', False) else None,
+                    # Method, seed, population and per-stratum coverage of the sample
+                    'sampling': df.attrs.get('sampling')
                 }
             
             return result
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Fast Profile
+Built-in dataset profile computed with vectorized column passes
+Per-column stats, nulls, approximate distinct counts, histograms, top-k values and high correlations
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+
+from correlation_engine import iter_high_correlations
+from streaming_sketches import HyperLogLog
+
+
+def _numeric_columns(df: pd.DataFrame) -> List[str]:
+    # Booleans are profiled like categories
+    return [column for column in df.columns
+            if pd.api.types.is_numeric_dtype(df[column].dtype) and not pd.api.types.is_bool_dtype(df[column].dtype)]
+
+
+def _numeric_block(values: np.ndarray, bins: int) -> List[Dict[str, Any]]:
+    """Stats and equal-width histograms of every column of a float block, ignoring NaN"""
+    present = ~np.isnan(values)
+    counts = present.sum(axis=0)
+    stats: List[Dict[str, Any]] = [{} for _ in range(values.shape[1])]
+    observed = counts > 0
+    if not observed.any():
+        return stats
+
+    block = values[:, observed]
+    with np.errstate(invalid='ignore'):
+        minimum, maximum = np.nanmin(block, axis=0), np.nanmax(block, axis=0)
+        mean = np.nanmean(block, axis=0)
+        std = np.nanstd(block, axis=0, ddof=1)
+        quartiles = np.nanquantile(block, [0.25, 0.5, 0.75], axis=0)
+        zeros = np.count_nonzero(block == 0, axis=0)
+
+        # One bincount fills every column's histogram: bin index offset by column
+        span = np.where(maximum > minimum, maximum - minimum, 1.0)
+        index = np.clip(np.floor((block - minimum) / span * bins), 0, bins - 1)
+        valid = ~np.isnan(index)
+        flat = index[valid].astype(np.intp) + (np.nonzero(valid)[1] * bins)
+    histograms = np.bincount(flat, minlength=block.shape[1] * bins).reshape(block.shape[1], bins)
+
+    for position, column in enumerate(np.nonzero(observed)[0]):
+        low, high = float(minimum[position]), float(maximum[position])
+        stats[column] = {
+            'mean': float(mean[position]),
+            'std': float(std[position]) if counts[column] > 1 else None,
+            'min': low,
+            'max': high,
+            'quartiles': {'25%': float(quartiles[0, position]), '50%': float(quartiles[1, position]),
+                          '75%': float(quartiles[2, position])},
+            'zeros': int(zeros[position]),
+            'histogram': {
+                'bin_edges': np.linspace(low, high if high > low else low + 1.0, bins + 1).tolist(),
+                'counts': histograms[position].tolist()
+            }
+        }
+    return stats
+
+
+def _top_values(series: pd.Series, top_k: int) -> List[Dict[str, Any]]:
+    counts = series.value_counts(dropna=True, sort=True).head(top_k)
+    return [{'value': value.item() if isinstance(value, np.generic) else value, 'count': int(count)}
+            for value, count in counts.items()]
+
+
+def profile_frame(df: pd.DataFrame, top_k: int = 10, bins: int = 20, hll_precision: int = 12,
+                  max_top_k_distinct: int = 10000, correlation_threshold: float = 0.7,
+                  block_size: int = 256, precision='float64',
+                  max_block_bytes: int = 256 * 1024 * 1024) -> Dict[str, Any]:
+    """Profile every column of ``df`` plus its highly correlated numeric pairs
+
+    Numeric columns are summarized in blocks of columns sized so one float
+    copy stays under ``max_block_bytes``. Distinct counts are HyperLogLog
+    estimates; top-k values are only counted for columns whose estimate is
+    at most ``max_top_k_distinct`` (every non-numeric column is a candidate).
+    """
+    n_rows, n_columns = df.shape
+    null_counts = df.isna().sum()
+    missing_cells = int(null_counts.sum())
+    numeric = _numeric_columns(df)
+
+    columns: Dict[str, Dict[str, Any]] = {}
+    for column in df.columns:
+        nulls = int(null_counts[column])
+        columns[column] = {
+            'dtype': str(df[column].dtype),
+            'count': n_rows - nulls,
+            'null_count': nulls,
+            'null_percentage': (nulls / n_rows) * 100 if n_rows else 0.0,
+            'distinct_estimate': round(HyperLogLog(hll_precision).update(df[column]).estimate())
+        }
+
+    step = max(1, max_block_bytes // max(1, n_rows * 8))
+    for start in range(0, len(numeric), step):
+        names = numeric[start:start + step]
+        values = df[names].to_numpy(dtype=np.float64, na_value=np.nan)
+        for column, stats in zip(names, _numeric_block(values, bins)):
+            columns[column].update(stats)
+
+    for column in df.columns:
+        if columns[column]['count'] and columns[column]['distinct_estimate'] <= max_top_k_distinct:
+            columns[column]['top_values'] = _top_values(df[column], top_k)
+
+    correlations = []
+    if len(numeric) > 1:
+        for left, right, values in iter_high_correlations(df[numeric], correlation_threshold, block_size, precision):
+            for i, j, corr_val in zip(left.tolist(), right.tolist(), values.tolist()):
+                correlations.append({'variable_1': numeric[i], 'variable_2': numeric[j], 'correlation': corr_val})
+
+    # Same data quality checks as the profiling report, with estimated cardinality
+    warnings = []
+    for column in df.columns:
+        missing_pct = columns[column]['null_percentage']
+        if missing_pct > 50:
+            warnings.append({'type': 'high_missing_data', 'column': column, 'missing_percentage': missing_pct})
+        if n_rows and pd.api.types.is_string_dtype(df[column].dtype):
+            unique_pct = min(columns[column]['distinct_estimate'], columns[column]['count']) / n_rows * 100
+            if unique_pct > 95:
+                warnings.append({'type': 'high_cardinality', 'column': column, 'unique_percentage': unique_pct})
+
+    return {
+        'dataset_info': {
+            'n_rows': n_rows,
+            'n_columns': n_columns,
+            'memory_size': int(df.memory_usage(deep=True).sum()),
+            'missing_cells': missing_cells,
+            'missing_percentage': (missing_cells / (n_rows * n_columns)) * 100 if n_rows * n_columns else 0.0
+        },
+        'columns': columns,
+        'correlations': correlations,
+        'warnings': warnings
+    }
@@ -12,12 +12,17 @@ import warnings
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 import hashlib
 from datetime import datetime
 import re
 
+from data_loader import load_frame, load_options
+from missingness_index import MissingnessIndex
+from correlation_engine import correlation_matrix
+from power_analysis import EFFECT_SIZES, analytic_power, normality_flags, brown_forsythe
+
 # Statistical libraries for validation
 from scipy import stats
 from sklearn.feature_selection import mutual_info_regression, mutual_info_classif
@@ -26,6 +31,17 @@ from sklearn.preprocessing import LabelEncoder
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
+# Power-analysis model used for each hypothesis test
+POWER_TESTS = {
+    'pearson_correlation': 'correlation',
+    'spearman_correlation': 'correlation',
+    'causal_inference': 'correlation',
+    't_test_independent': 't_test',
+    'anova_one_way': 'anova',
+    'comparison': 'anova',
+    'multiple_regression': 'regression'
+}
+
 @dataclass
 class Hypothesis:
     """Container for generated hypotheses"""
@@ -70,12 +86,23 @@ class HypothesisGenerator:
         self.config = config or {}
         self.eda_results = None
         self.data = None
+        self._missingness = None
+        self._profile = None
         
         # Hypothesis generation settings
         self.max_hypotheses = self.config.get('max_hypotheses', 10)
         self.min_confidence = self.config.get('min_confidence', 0.6)
         self.focus_areas = self.config.get('focus_areas', ['correlation', 'comparison', 'prediction', 'causation'])
         
+        # Predictor screening for prediction hypotheses
+        self.screening_sample_size = self.config.get('screening_sample_size', 10000)
+        self.screening_method = self.config.get('screening_method', 'linear')
+        # Shuffled-outcome refits that set the bias baseline of mutual_info scores
+        self.screening_permutations = self.config.get('screening_permutations', 2)
+        self.min_predictor_score = self.config.get('min_predictor_score', 0.01)
+        self.max_predictors = self.config.get('max_predictors', 3)
+        self.max_categorical_levels = self.config.get('max_categorical_levels', 50)
+        
         # Domain knowledge integration
         self.domain_context = self.config.get('domain_context', {})
         self.business_objectives = self.config.get('business_objectives', [])
@@ -84,6 +111,9 @@ class HypothesisGenerator:
         self.min_sample_size = self.config.get('min_sample_size', 30)
         self.power_threshold = self.config.get('power_threshold', 0.8)
         self.alpha_level = self.config.get('alpha_level', 0.05)
+        self.assumption_sample_size = self.config.get('assumption_sample_size', 5000)
+        # Hypotheses below this power at their expected effect size are dropped (None keeps all)
+        self.min_power = self.config.get('min_power')
         
     def load_eda_results(self, eda_file_path: str) -> Dict[str, Any]:
         """Load EDA results for hypothesis generation"""
@@ -159,23 +189,19 @@ class HypothesisGenerator:
             }
         }
     
-    def load_data(self, data_source: str) -> pd.DataFrame:
-        """Load data for hypothesis validation"""
-        try:
-            if data_source.endswith('.csv'):
-                data = pd.read_csv(data_source)
-            elif data_source.endswith('.json'):
-                data = pd.read_json(data_source)
-            elif data_source.endswith('.xlsx'):
-                data = pd.read_excel(data_source)
-            else:
-                raise ValueError(f"Unsupported file format: {data_source}")
-            
-            self.data = data
-            return data
-        except Exception as e:
-            print(f"Warning: Could not load data from {data_source}: {e}", file=sys.stderr)
-            return self._create_mock_data()
+    def load_data(self, data_source: str, **options) -> pd.DataFrame:
+        """Load data for hypothesis validation
+
+        ``options`` are passed to ``data_loader.load_frame``. Load failures are
+        raised; the source ``'mock'`` selects the built-in test data.
+        """
+        if data_source == 'mock':
+            data = self._create_mock_data()
+        else:
+            data = load_frame(data_source, **options)
+        
+        self.data = data
+        return data
     
     def _create_mock_data(self) -> pd.DataFrame:
         """Create mock data for testing"""
@@ -193,6 +219,12 @@ class HypothesisGenerator:
             'region': np.random.choice(['North', 'South', 'East', 'West'], n, p=[0.3, 0.25, 0.25, 0.2])
         })
     
+    def _missingness_index(self) -> MissingnessIndex:
+        """Null bitmaps of the current data, rebuilt only when the frame is replaced"""
+        if self._missingness is None or self._missingness[0] is not self.data:
+            self._missingness = (self.data, MissingnessIndex(self.data))
+        return self._missingness[1]
+    
     def generate_hypotheses(self, data_source: Optional[str] = None, eda_file: Optional[str] = None) -> List[Hypothesis]:
         """Generate hypotheses based on EDA results and data patterns"""
         
@@ -322,39 +354,138 @@ class HypothesisGenerator:
             return hypotheses
         
         numeric_vars = self.data.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_vars = self.data.select_dtypes(exclude=[np.number]).columns.tolist()
+        outcomes = [var for var in numeric_vars if self.data[var].var() > 0]  # Skip constant variables
+        if not outcomes:
+            return hypotheses
+        
+        # Rank every predictor for every outcome in one pass over a sample
+        sample = self.data
+        if len(sample) > self.screening_sample_size:
+            sample = sample.sample(n=self.screening_sample_size, random_state=42)
+        categorical_vars = [
+            var for var in sample.select_dtypes(include=['object', 'string', 'category', 'bool']).columns
+            if sample[var].nunique() <= self.max_categorical_levels
+        ]
+        scores = self._screen_predictors(sample, outcomes, numeric_vars, categorical_vars)
         
-        # Generate predictive hypotheses for high-variance numeric outcomes
-        for outcome_var in numeric_vars:
-            if self.data[outcome_var].var() == 0:  # Skip constant variables
+        for outcome_var in outcomes:
+            ranked = scores.loc[outcome_var].drop(outcome_var, errors='ignore').sort_values(ascending=False)
+            ranked = ranked[ranked >= self.min_predictor_score]
+            
+            # Only a set of at least two promising predictors makes a multivariate hypothesis
+            if len(ranked) < 2:
                 continue
-                
-            # Find potential predictors based on mutual information
-            predictors = [var for var in numeric_vars + categorical_vars if var != outcome_var]
             
-            if len(predictors) >= 2:
-                # Create multivariate prediction hypothesis
-                top_predictors = predictors[:3]  # Limit to top 3 for interpretability
-                
-                hypothesis = Hypothesis(
-                    id=f"pred_{outcome_var}_multi",
-                    statement=f"{outcome_var} can be predicted from {', '.join(top_predictors)}",
-                    null_hypothesis=f"The predictors {', '.join(top_predictors)} have no predictive relationship with {outcome_var}",
-                    alternative_hypothesis=f"The predictors {', '.join(top_predictors)} significantly predict {outcome_var}",
-                    variables=[outcome_var] + top_predictors,
-                    variable_types={var: 'numeric' if var in numeric_vars else 'categorical' for var in [outcome_var] + top_predictors},
-                    statistical_test='multiple_regression',
-                    expected_direction='prediction',
-                    expected_effect_size='medium',
-                    rationale=f"Multiple variables may collectively predict {outcome_var}",
-                    supporting_evidence=[f"Multiple potential predictors identified"],
-                    confidence=0.65,
-                    business_relevance=f"Predictive model for {outcome_var} can support decision making"
-                )
-                hypotheses.append(hypothesis)
+            top_predictors = ranked.index[:self.max_predictors].tolist()
+            explained = min(ranked.iloc[:self.max_predictors].sum(), 1.0)
+            kinds = {var: 'r²' if var in numeric_vars else 'ω²' for var in top_predictors}
+            if self.screening_method == 'mutual_info':
+                kinds = dict.fromkeys(top_predictors, 'MI-based r²')
+            
+            hypothesis = Hypothesis(
+                id=f"pred_{outcome_var}_multi",
+                statement=f"{outcome_var} can be predicted from {', '.join(top_predictors)}",
+                null_hypothesis=f"The predictors {', '.join(top_predictors)} have no predictive relationship with {outcome_var}",
+                alternative_hypothesis=f"The predictors {', '.join(top_predictors)} significantly predict {outcome_var}",
+                variables=[outcome_var] + top_predictors,
+                variable_types={var: 'numeric' if var in numeric_vars else 'categorical' for var in [outcome_var] + top_predictors},
+                statistical_test='multiple_regression',
+                expected_direction='prediction',
+                # Cohen's R² conventions for multiple regression
+                expected_effect_size='large' if explained >= 0.26 else 'medium' if explained >= 0.13 else 'small',
+                rationale=f"Predictor screening over {len(sample)} rows ranks {', '.join(top_predictors)} highest for {outcome_var}",
+                supporting_evidence=[f"{var}: {kinds[var]} = {ranked[var]:.3f}" for var in top_predictors],
+                confidence=float(min(max(0.65, np.sqrt(ranked.iloc[0])), 0.95)),
+                business_relevance=f"Predictive model for {outcome_var} can support decision making"
+            )
+            hypotheses.append(hypothesis)
         
         return hypotheses
     
+    def _screen_predictors(self, sample: pd.DataFrame, outcomes: List[str], numeric_vars: List[str],
+                           categorical_vars: List[str]) -> pd.DataFrame:
+        """Share of each outcome's variance explained by each single predictor
+        
+        Returns an outcomes x predictors frame on one 0-1 scale: r² for
+        numeric predictors, ω² (one-way ANOVA, corrected for the number of
+        levels) for categorical ones. With ``screening_method='mutual_info'``
+        every score is instead 1 - exp(-2 MI), which equals r² for
+        Gaussian data but also picks up non-linear relationships, measured
+        above the noise level of predictors of the same kind (numeric or
+        categorical) against shuffled outcomes.
+        """
+        scores = pd.DataFrame(0.0, index=outcomes, columns=numeric_vars + categorical_vars)
+        codes = {var: pd.Categorical(sample[var]).codes for var in categorical_vars}
+        
+        if self.screening_method == 'mutual_info':
+            # Entirely missing columns have no median to fill with and keep a score of 0
+            values = sample[numeric_vars].to_numpy(dtype=float, na_value=np.nan)
+            usable = ~np.isnan(values).all(axis=0)
+            values = values[:, usable]
+            features = pd.DataFrame(np.where(np.isnan(values), np.nanmedian(values, axis=0), values),
+                                    index=sample.index, columns=[var for var, keep in zip(numeric_vars, usable) if keep])
+            for var in categorical_vars:
+                features[var] = codes[var]
+            if features.empty:
+                return scores
+            discrete = np.array([var in codes for var in features.columns])
+            rng = np.random.default_rng(42)
+            mi, null = {}, []
+            for outcome_var in outcomes:
+                present = sample[outcome_var].notna().to_numpy()
+                if present.sum() < 3:
+                    continue
+                X = features[present]
+                y = sample[outcome_var][present].to_numpy(dtype=float, na_value=np.nan)
+                mi[outcome_var] = mutual_info_regression(X, y, discrete_features=discrete, random_state=42)
+                null.extend(mutual_info_regression(X, rng.permutation(y), discrete_features=discrete, random_state=42)
+                            for _ in range(self.screening_permutations))
+            if not mi:
+                return scores
+            
+            # The kNN estimator is biased upwards and noisy, by more for small samples and
+            # discrete predictors: scores are measured from the mean plus four standard
+            # deviations of each kind's scores against shuffled outcomes, pooled over outcomes
+            null_scores = 1 - np.exp(-2 * np.array(null).reshape(-1, len(discrete)))
+            cutoff = np.zeros(len(discrete))
+            for kind in (discrete, ~discrete):
+                if kind.any() and len(null_scores):
+                    cutoff[kind] = null_scores[:, kind].mean() + 4 * null_scores[:, kind].std()
+            for outcome_var, values in mi.items():
+                scores.loc[outcome_var, features.columns] = np.clip(1 - np.exp(-2 * values) - cutoff, 0.0, 1.0)
+            return scores
+        
+        # Pearson r² for all numeric pairs, one strip of the matrix at a time
+        values = sample[numeric_vars].to_numpy(dtype=float, na_value=np.nan)
+        positions = [numeric_vars.index(var) for var in outcomes]
+        scores[numeric_vars] = np.nan_to_num(correlation_matrix(values)[positions]) ** 2
+        
+        # One-way ANOVA of every outcome on each categorical predictor, all outcomes at once
+        y = values[:, positions]
+        y = y - np.nanmean(y, axis=0)
+        for var in categorical_vars:
+            levels = codes[var].max() + 1
+            if levels < 2:
+                continue
+            one_hot = (codes[var][:, None] == np.arange(levels)).astype(float)
+            present = ~np.isnan(y) & (codes[var] >= 0)[:, None]
+            filled = np.where(present, y, 0.0)
+            
+            counts = one_hot.T @ present
+            sums = one_hot.T @ filled
+            n = counts.sum(axis=0)
+            groups = (counts > 0).sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                correction = sums.sum(axis=0) ** 2 / n
+                ss_total = (filled ** 2).sum(axis=0) - correction
+                ss_between = np.where(counts > 0, sums ** 2 / counts, 0.0).sum(axis=0) - correction
+                ms_within = (ss_total - ss_between) / (n - groups)
+                omega_squared = (ss_between - (groups - 1) * ms_within) / (ss_total + ms_within)
+            valid = (groups >= 2) & (n > groups)
+            scores[var] = np.clip(np.where(valid, np.nan_to_num(omega_squared), 0.0), 0.0, 1.0)
+        
+        return scores
+    
     def _generate_causation_hypotheses(self) -> List[Hypothesis]:
         """Generate hypotheses for potential causal relationships"""
         hypotheses = []
@@ -407,6 +538,14 @@ class HypothesisGenerator:
         # Filter by minimum confidence
         filtered = [h for h in hypotheses if h.confidence >= self.min_confidence]
         
+        # Drop hypotheses the available data cannot test with enough power
+        if self.min_power is not None and self.data is not None:
+            missingness = self._missingness_index()
+            filtered = [
+                h for h in filtered
+                if self._estimate_power(h, missingness.complete_cases(h.variables)) >= self.min_power
+            ]
+        
         # Add testability scores
         for hypothesis in filtered:
             hypothesis.testability_score = self._calculate_testability_score(hypothesis)
@@ -427,6 +566,8 @@ class HypothesisGenerator:
         if self.data is None:
             return 0.5
         
+        missingness = self._missingness_index()
+        
         # Check if all required variables are available
         for var in hypothesis.variables:
             if var not in self.data.columns:
@@ -434,14 +575,14 @@ class HypothesisGenerator:
                 continue
             
             # Check data quality
-            missing_ratio = self.data[var].isnull().sum() / len(self.data)
+            missing_ratio = missingness.null_ratio(var)
             if missing_ratio > 0.3:
                 score *= 0.7  # Penalize high missing data
             elif missing_ratio > 0.1:
                 score *= 0.9
         
         # Check sample size adequacy
-        available_sample_size = len(self.data.dropna(subset=hypothesis.variables))
+        available_sample_size = missingness.complete_cases(hypothesis.variables)
         if available_sample_size < self.min_sample_size:
             score *= 0.5
         elif available_sample_size < self.min_sample_size * 2:
@@ -484,16 +625,10 @@ class HypothesisGenerator:
         
         # Check sample size adequacy
         if self.data is not None:
-            available_data = self.data.dropna(subset=hypothesis.variables)
-            sample_size_adequate = len(available_data) >= self.min_sample_size
+            available_sample_size = self._missingness_index().complete_cases(hypothesis.variables)
+            sample_size_adequate = available_sample_size >= self.min_sample_size
             
-            # Estimate statistical power (simplified)
-            if hypothesis.statistical_test == 'pearson_correlation':
-                power = self._estimate_correlation_power(len(available_data), 0.3)
-            elif hypothesis.statistical_test in ['anova_one_way', 'comparison']:
-                power = self._estimate_anova_power(len(available_data), 0.5)
-            else:
-                power = 0.8 if sample_size_adequate else 0.6
+            power = self._estimate_power(hypothesis, available_sample_size)
         else:
             sample_size_adequate = False
             power = None
@@ -522,36 +657,97 @@ class HypothesisGenerator:
             recommendations=recommendations
         )
     
-    def _estimate_correlation_power(self, n: int, effect_size: float) -> float:
-        """Estimate statistical power for correlation test (simplified)"""
-        if n < 10:
-            return 0.1
-        elif n < 30:
-            return 0.5
-        elif n < 100:
-            return 0.7
-        else:
-            return 0.9
+    def _estimate_power(self, hypothesis: Hypothesis, n: int) -> float:
+        """Analytic power of the hypothesis' test at its expected effect size (Cohen's conventions)"""
+        test = POWER_TESTS.get(hypothesis.statistical_test)
+        if test is None:
+            return 0.8 if n >= self.min_sample_size else 0.6
+        
+        effect_size = EFFECT_SIZES[test].get(hypothesis.expected_effect_size, EFFECT_SIZES[test]['medium'])
+        k = 2
+        if test == 'anova':
+            grouping = [var for var, kind in hypothesis.variable_types.items() if kind == 'categorical']
+            levels = self._assumption_profile()['levels']
+            if grouping and grouping[0] in self.data.columns:
+                if grouping[0] not in levels:
+                    levels[grouping[0]] = int(self.data[grouping[0]].nunique())
+                k = levels[grouping[0]]
+        elif test == 'regression':
+            k = len(hypothesis.variables) - 1
+        
+        return analytic_power(test, n, effect_size, self.alpha_level, k)
     
-    def _estimate_anova_power(self, n: int, effect_size: float) -> float:
-        """Estimate statistical power for ANOVA test (simplified)"""
-        if n < 30:
-            return 0.3
-        elif n < 100:
-            return 0.6
-        else:
-            return 0.85
+    def _assumption_profile(self) -> Dict[str, Any]:
+        """Row sample and per-column normality flags of the current data, computed once per frame"""
+        if self._profile is None or self._profile[0] is not self.data:
+            sample = self.data
+            if len(sample) > self.assumption_sample_size:
+                sample = sample.sample(n=self.assumption_sample_size, random_state=42)
+            numeric_vars = sample.select_dtypes(include=[np.number]).columns.tolist()
+            _, _, normal = normality_flags(sample[numeric_vars].to_numpy(dtype=float))
+            self._profile = (self.data, {
+                'sample': sample,
+                'normal': dict(zip(numeric_vars, normal.tolist())),
+                'levels': {}
+            })
+        return self._profile[1]
     
     def _check_basic_assumptions(self, hypothesis: Hypothesis) -> Dict[str, bool]:
-        """Check basic statistical assumptions for the hypothesis"""
+        """Check basic statistical assumptions for the hypothesis on sampled data
+        
+        Normality uses skewness/kurtosis limits per numeric variable. Equal
+        variances are checked with Brown-Forsythe across the groups of a
+        categorical variable, or across quartiles of the fitted values of a
+        regression on the numeric variables. Linearity holds when the means
+        of the first variable over deciles of each other numeric variable
+        explain at most 0.05 more of its variance than a straight line.
+        Independence cannot be checked from the data and is assumed.
+        """
         assumptions = {
-            'independence': True,  # Assume independence unless known otherwise
-            'normality': True,     # Will need to be tested with actual data
-            'linearity': True,     # Assume linear relationships initially
-            'homoscedasticity': True  # Assume equal variances initially
+            'independence': True,
+            'normality': True,
+            'linearity': True,
+            'homoscedasticity': True
         }
+        if self.data is None:
+            return assumptions
+        
+        profile = self._assumption_profile()
+        sample = profile['sample']
+        kinds = hypothesis.variable_types
+        numeric = [var for var in hypothesis.variables if kinds.get(var) == 'numeric' and var in profile['normal']]
+        categorical = [var for var in hypothesis.variables if kinds.get(var) == 'categorical' and var in sample.columns]
+        
+        assumptions['normality'] = all(profile['normal'][var] for var in numeric)
+        
+        if categorical and numeric:
+            codes = pd.Categorical(sample[categorical[0]]).codes
+            p_value = brown_forsythe(sample[numeric[0]].to_numpy(dtype=float), codes)
+            assumptions['homoscedasticity'] = p_value >= self.alpha_level
+        elif len(numeric) >= 2:
+            complete = sample[numeric].dropna().to_numpy(dtype=float)
+            if len(complete) >= self.min_sample_size:
+                outcome, predictors = complete[:, 0], complete[:, 1:]
+                design = np.column_stack([np.ones(len(complete)), predictors])
+                coefficients = np.linalg.lstsq(design, outcome, rcond=None)[0]
+                fitted = design @ coefficients
+                quartiles = np.searchsorted(np.quantile(fitted, [0.25, 0.5, 0.75]), fitted)
+                p_value = brown_forsythe(outcome - fitted, quartiles)
+                assumptions['homoscedasticity'] = p_value >= self.alpha_level
+                
+                # Correlation ratio over predictor deciles against the linear r²: a clearly
+                # larger share explained by the decile means indicates curvature
+                total = np.sum((outcome - outcome.mean()) ** 2)
+                gaps = []
+                for i in range(predictors.shape[1]):
+                    deciles = np.searchsorted(np.quantile(predictors[:, i], np.linspace(0.1, 0.9, 9)), predictors[:, i])
+                    counts = np.bincount(deciles)
+                    means = np.bincount(deciles, outcome) / np.maximum(counts, 1)
+                    eta_squared = np.sum(counts * (means - outcome.mean()) ** 2) / total if total else 0.0
+                    r = np.corrcoef(outcome, predictors[:, i])[0, 1]
+                    gaps.append(eta_squared - np.nan_to_num(r) ** 2)
+                assumptions['linearity'] = bool(np.all(np.array(gaps) <= 0.05))
         
-        # These would be properly tested with actual data in practice
         return assumptions
     
     def _calculate_feasibility_score(self, data_availability: Dict[str, bool], 
@@ -616,6 +812,19 @@ class HypothesisGenerator:
                          format: str = 'json') -> str:
         """Export hypotheses and validations in specified format"""
         
+        if format == 'json':
+            return json.dumps(self.build_export(hypotheses, validations), indent=2)
+        elif format == 'csv':
+            # Convert to CSV format (simplified)
+            df = pd.DataFrame([h.to_dict() for h in hypotheses])
+            return df.to_csv(index=False)
+        else:
+            raise ValueError(f"Unsupported export format: {format}")
+    
+    def build_export(self, hypotheses: List[Hypothesis],
+                     validations: Optional[List[HypothesisValidation]] = None) -> Dict[str, Any]:
+        """Hypotheses, validations and generation metadata as a JSON-ready dict"""
+        
         export_data = {
             'hypotheses': [h.to_dict() for h in hypotheses],
             'generation_metadata': {
@@ -634,14 +843,66 @@ class HypothesisGenerator:
                 'high_feasibility_count': sum(1 for v in validations if v.feasibility_score > 0.8)
             }
         
-        if format == 'json':
-            return json.dumps(export_data, indent=2)
-        elif format == 'csv':
-            # Convert to CSV format (simplified)
-            df = pd.DataFrame([h.to_dict() for h in hypotheses])
-            return df.to_csv(index=False)
-        else:
-            raise ValueError(f"Unsupported export format: {format}")
+        return export_data
+
+def run_command(command: str, params: Dict[str, Any], data: Optional[pd.DataFrame] = None) -> Union[Dict[str, Any], str]:
+    """Execute one CLI command and return its output
+
+    ``params`` mirrors the CLI flags (``data``, ``eda``, ``config``, ``output``)
+    plus optional ``load`` options for the data source.
+    JSON output is returned as a dict and CSV output as text. A preloaded
+    ``data`` frame is used instead of reading ``params['data']``.
+    """
+    # Initialize generator
+    generator = HypothesisGenerator(params.get('config') or {})
+    data_source = params.get('data')
+    has_data = data_source is not None or data is not None
+    if data is None and data_source is not None:
+        data = generator.load_data(data_source, **load_options(params.get('load')))
+    if data is not None:
+        generator.data = data
+        data_source = None
+    
+    if command == 'generate':
+        # Generate hypotheses
+        hypotheses = generator.generate_hypotheses(
+            data_source=data_source,
+            eda_file=params.get('eda')
+        )
+        
+        # Validate hypotheses if data is available
+        validations = None
+        if has_data:
+            validations = generator.validate_hypotheses(hypotheses)
+        
+        # Export results
+        output_format = params.get('output', 'json')
+        if output_format == 'json':
+            return generator.build_export(hypotheses, validations)
+        return generator.export_hypotheses(hypotheses, validations, output_format)
+        
+    elif command == 'validate':
+        if not has_data:
+            raise ValueError("Data source required for validation")
+        
+        # Load existing hypotheses (would need to be passed in real implementation)
+        # For now, generate some hypotheses to validate
+        hypotheses = generator.generate_hypotheses(data_source=data_source, eda_file=params.get('eda'))
+        
+        # Validate hypotheses
+        validations = generator.validate_hypotheses(hypotheses)
+        
+        # Export validation results
+        return {
+            'validations': [v.to_dict() for v in validations],
+            'summary': {
+                'total_hypotheses': len(validations),
+                'testable_hypotheses': sum(1 for v in validations if v.is_testable),
+                'high_feasibility': sum(1 for v in validations if v.feasibility_score > 0.8)
+            }
+        }
+    
+    raise ValueError(f"Unknown command: {command}")
 
 def main():
     """Main execution function"""
@@ -658,47 +919,15 @@ def main():
         # Parse configuration
         config = json.loads(args.config) if args.config else {}
         
-        # Initialize generator
-        generator = HypothesisGenerator(config)
+        result = run_command(args.command, {
+            'data': args.data,
+            'eda': args.eda,
+            'config': config,
+            'output': args.output
+        })
         
-        if args.command == 'generate':
-            # Generate hypotheses
-            hypotheses = generator.generate_hypotheses(
-                data_source=args.data,
-                eda_file=args.eda
-            )
-            
-            # Validate hypotheses if data is available
-            validations = None
-            if args.data:
-                validations = generator.validate_hypotheses(hypotheses)
-            
-            # Export results
-            result = generator.export_hypotheses(hypotheses, validations, args.output)
-            print(result)
-            
-        elif args.command == 'validate':
-            if not args.data:
-                raise ValueError("Data source required for validation")
-            
-            # Load existing hypotheses (would need to be passed in real implementation)
-            # For now, generate some hypotheses to validate
-            hypotheses = generator.generate_hypotheses(data_source=args.data, eda_file=args.eda)
-            
-            # Validate hypotheses
-            validations = generator.validate_hypotheses(hypotheses)
-            
-            # Export validation results
-            validation_data = {
-                'validations': [v.to_dict() for v in validations],
-                'summary': {
-                    'total_hypotheses': len(validations),
-                    'testable_hypotheses': sum(1 for v in validations if v.is_testable),
-                    'high_feasibility': sum(1 for v in validations if v.feasibility_score > 0.8)
-                }
-            }
-            
-            print(json.dumps(validation_data, indent=2))
+        # Output results
+        print(result if isinstance(result, str) else json.dumps(result, indent=2))
         
     except Exception as e:
         error_result = {
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Missingness Index
+Packed per-column null bitmaps for a loaded frame
+Answers complete-case counts for any set of columns with bitwise AND and popcount
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, FrozenSet, Iterable
+
+# Set bits per byte value, for numpy releases without bitwise_count
+_BYTE_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def _popcount(bitmap: np.ndarray) -> int:
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(bitmap).sum(dtype=np.int64))
+    return int(_BYTE_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+
+class MissingnessIndex:
+    """Null bitmaps of a frame's columns, packed once
+
+    Only columns with missing values keep a bitmap (one bit per row, set
+    where the value is present); a fully observed column never removes a
+    row. Complete-case counts are memoized per set of columns. Columns the
+    frame does not have count as entirely missing.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.n_rows = len(data)
+        self.null_counts: Dict[str, int] = {}
+        self._present: Dict[str, np.ndarray] = {}
+        self._complete: Dict[FrozenSet[str], int] = {}
+
+        for column in data.columns:
+            present = data[column].notna().to_numpy()
+            nulls = self.n_rows - int(np.count_nonzero(present))
+            self.null_counts[column] = nulls
+            if nulls:
+                self._present[column] = np.packbits(present)
+
+    def null_ratio(self, column: str) -> float:
+        return self.null_counts[column] / self.n_rows if self.n_rows else 0.0
+
+    def complete_cases(self, columns: Iterable[str]) -> int:
+        """Number of rows where every one of ``columns`` is present"""
+        key = frozenset(columns)
+        if key not in self._complete:
+            if any(column not in self.null_counts for column in key):
+                self._complete[key] = 0
+            else:
+                bitmaps = [self._present[column] for column in key if column in self._present]
+                if not bitmaps:
+                    self._complete[key] = self.n_rows
+                else:
+                    # Padding bits of the last byte are zero, so they never count
+                    self._complete[key] = _popcount(np.bitwise_and.reduce(bitmaps))
+        return self._complete[key]
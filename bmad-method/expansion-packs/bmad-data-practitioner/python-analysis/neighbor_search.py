@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Neighbor Search
+Pluggable nearest-neighbor backends for the density-based anomaly detectors
+Supports exact trees, a random-projection forest index and sample-then-score mode
+"""
+
+import time
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+NEIGHBOR_BACKENDS = ('exact', 'random_projection', 'sample')
+# Parameters that configure the neighbor search rather than the detector
+NEIGHBOR_PARAMETERS = ('neighbor_backend', 'algorithm', 'n_trees', 'leaf_size', 'refine_iterations',
+                       'neighbor_sample_size', 'batch_size', 'recall_probes', 'random_state')
+
+
+def _leaf_blocks(data: np.ndarray, leaf_size: int, rng: np.random.Generator) -> np.ndarray:
+    """Leaves of one random-projection tree as a padded (leaves x size) matrix of row ids (-1 pads)
+
+    Each level draws one random direction, and every node splits its rows at
+    the median of their projections on it, until the leaves hold at most
+    ``leaf_size`` rows. All nodes of a level are split together.
+    """
+    n_rows = len(data)
+    depth = max(0, int(np.ceil(np.log2(n_rows / leaf_size)))) if n_rows > leaf_size else 0
+    projections = data @ rng.standard_normal((data.shape[1], depth)) if depth else None
+    order = np.arange(n_rows)
+    bounds = np.array([0, n_rows])
+
+    for level in range(depth):
+        n_nodes = len(bounds) - 1
+        node_of = np.repeat(np.arange(n_nodes), np.diff(bounds))
+        order = order[np.lexsort((projections[order, level], node_of))]
+
+        split = np.empty(2 * n_nodes + 1, dtype=bounds.dtype)
+        split[0::2] = bounds
+        split[1::2] = (bounds[:-1] + bounds[1:]) // 2
+        bounds = split
+
+    sizes = np.diff(bounds)
+    positions = bounds[:-1, None] + np.arange(sizes.max())
+    return np.where(positions < bounds[1:, None], order[np.minimum(positions, n_rows - 1)], -1)
+
+
+def _merge_candidates(best_distance: np.ndarray, best_index: np.ndarray, rows: np.ndarray,
+                      candidate_distance: np.ndarray, candidate_index: np.ndarray):
+    """Fold candidate neighbors into the running top-k of ``rows`` in place, dropping repeats"""
+    k = best_index.shape[1]
+    distance = np.concatenate([best_distance[rows], candidate_distance], axis=1)
+    index = np.concatenate([best_index[rows], candidate_index], axis=1)
+
+    by_index = np.argsort(index, axis=1, kind='stable')
+    index = np.take_along_axis(index, by_index, axis=1)
+    distance = np.take_along_axis(distance, by_index, axis=1)
+    repeated = np.zeros_like(index, dtype=bool)
+    repeated[:, 1:] = index[:, 1:] == index[:, :-1]
+    distance[repeated | (index < 0)] = np.inf
+
+    nearest = np.argpartition(distance, k - 1, axis=1)[:, :k]
+    best_distance[rows] = np.take_along_axis(distance, nearest, axis=1)
+    best_index[rows] = np.take_along_axis(index, nearest, axis=1)
+
+
+def random_projection_knn(data: np.ndarray, k: int, n_trees: int = 8, leaf_size: int = 64,
+                          refine_iterations: int = 1, refine_neighbors: int = 10,
+                          random_state: Optional[int] = 42, max_block_bytes: int = 64 * 1024 * 1024) -> Tuple[np.ndarray, np.ndarray]:
+    """Approximate k nearest neighbors of every row (each row is its own first neighbor)
+
+    Initial candidates are the rows sharing a leaf in any of ``n_trees``
+    random projection trees, with distances inside each leaf computed as one
+    batched matrix product. Each refinement iteration then also considers the
+    ``refine_neighbors`` nearest neighbors of every row's ``refine_neighbors``
+    nearest neighbors. More trees, larger leaves or more
+    iterations raise recall at the cost of time.
+    Returns (distances, indices), each (rows x k), sorted by distance.
+    """
+    rng = np.random.default_rng(random_state)
+    n_rows, n_features = data.shape
+    best_distance = np.full((n_rows, k), np.inf)
+    best_index = np.full((n_rows, k), -1, dtype=np.int64)
+    squared_norms = np.einsum('ij,ij->i', data, data)
+
+    for _ in range(n_trees):
+        leaves = _leaf_blocks(data, leaf_size, rng)
+        leaf_width = leaves.shape[1]
+        batch = max(1, max_block_bytes // (8 * leaf_width * max(leaf_width, n_features) * 3))
+
+        for start in range(0, len(leaves), batch):
+            block = leaves[start:start + batch]
+            valid = block >= 0
+            rows = np.where(valid, block, 0)
+            points = data[rows]
+            norms = squared_norms[rows]
+
+            distance = norms[:, :, None] + norms[:, None, :] - 2 * np.einsum('bid,bjd->bij', points, points)
+            np.maximum(distance, 0, out=distance)
+            distance[~(valid[:, :, None] & valid[:, None, :])] = np.inf
+
+            candidates = np.broadcast_to(np.where(valid, block, -1)[:, None, :], distance.shape)
+            _merge_candidates(best_distance, best_index, rows[valid], distance[valid], candidates[valid])
+
+    # Refinement expands only the nearest few neighbors of each row, as NN-descent samples them
+    expand = min(k, refine_neighbors)
+    batch = max(1, max_block_bytes // (8 * expand * expand * n_features * 2))
+    for _ in range(refine_iterations):
+        for start in range(0, n_rows, batch):
+            rows = np.arange(start, min(start + batch, n_rows))
+            neighbors = best_index[rows, :expand]
+            candidates = np.where(neighbors[:, :, None] >= 0, best_index[np.maximum(neighbors, 0), :expand], -1)
+            candidates = candidates.reshape(len(rows), -1)
+            difference = data[np.maximum(candidates, 0)] - data[rows, None, :]
+            distance = np.einsum('bkd,bkd->bk', difference, difference)
+            _merge_candidates(best_distance, best_index, rows, distance, candidates)
+
+    ordering = np.argsort(best_distance, axis=1, kind='stable')
+    return np.sqrt(np.take_along_axis(best_distance, ordering, axis=1)), np.take_along_axis(best_index, ordering, axis=1)
+
+
+def knn_graph(distances: np.ndarray, indices: np.ndarray, symmetric: bool = False):
+    """Sparse distance graph from k-nearest-neighbor arrays (explicit zeros are kept)"""
+    from scipy.sparse import csr_matrix
+
+    n_rows, k = indices.shape
+    found = np.isfinite(distances) & (indices >= 0)
+    counts = found.sum(axis=1)
+    graph = csr_matrix(
+        (distances[found], indices[found], np.r_[0, np.cumsum(counts)]),
+        shape=(n_rows, n_rows)
+    )
+    if symmetric:
+        graph = graph.maximum(graph.T).tocsr()
+    return graph
+
+
+class NeighborSearch:
+    """Neighbor-search strategy shared by LOF and DBSCAN
+
+    ``exact`` uses scikit-learn's KD/ball trees (``algorithm``) and matches
+    the detectors' default behaviour. ``random_projection`` builds an
+    approximate k-nearest-neighbor graph with a random-projection forest
+    (``n_trees``, ``leaf_size`` and ``refine_iterations`` trade recall for
+    speed; ``recall_probes`` measures recall on a few rows) and hands it to
+    scikit-learn as a precomputed graph. ``sample`` fits on a uniform
+    reservoir sample of ``neighbor_sample_size`` rows and scores the rest in
+    batches of ``batch_size``. ``describe()`` reports the backend, its knobs
+    and what the last search did.
+    """
+
+    def __init__(self, backend: str = 'exact', algorithm: str = 'auto', n_trees: int = 4, leaf_size: int = 64,
+                 refine_iterations: int = 1, sample_size: int = 50000, batch_size: int = 50000, recall_probes: int = 0,
+                 random_state: Optional[int] = 42):
+        if backend not in NEIGHBOR_BACKENDS:
+            raise ValueError(f"Unknown neighbor backend: {backend}. Available: {list(NEIGHBOR_BACKENDS)}")
+        self.backend = backend
+        self.algorithm = algorithm
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.refine_iterations = refine_iterations
+        self.sample_size = sample_size
+        self.batch_size = batch_size
+        self.recall_probes = recall_probes
+        self.random_state = random_state
+        self.stats: Dict[str, Any] = {}
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> 'NeighborSearch':
+        return cls(
+            backend=params.get('neighbor_backend', 'exact'),
+            algorithm=params.get('algorithm', 'auto'),
+            n_trees=params.get('n_trees', 4),
+            leaf_size=params.get('leaf_size', 64),
+            refine_iterations=params.get('refine_iterations', 1),
+            sample_size=params.get('neighbor_sample_size', 50000),
+            batch_size=params.get('batch_size', 50000),
+            recall_probes=params.get('recall_probes', 0),
+            random_state=params.get('random_state', 42)
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        knobs = {
+            'exact': {'algorithm': self.algorithm},
+            'random_projection': {'n_trees': self.n_trees, 'leaf_size': self.leaf_size,
+                                  'refine_iterations': self.refine_iterations},
+            'sample': {'sample_size': self.sample_size, 'batch_size': self.batch_size, 'algorithm': self.algorithm}
+        }[self.backend]
+        return {'backend': self.backend, **knobs, **self.stats}
+
+    def lof(self, data: np.ndarray, n_neighbors: int, contamination: float) -> Tuple[np.ndarray, np.ndarray]:
+        """LOF outlier labels (-1 for outliers) and outlier factors for every row"""
+        from sklearn.neighbors import LocalOutlierFactor
+
+        start_time = time.monotonic()
+        self.stats = {'rows': len(data)}
+
+        if self.backend == 'exact' or len(data) <= n_neighbors + 1:
+            lof = LocalOutlierFactor(n_neighbors=n_neighbors, contamination=contamination, algorithm=self.algorithm)
+            labels = lof.fit_predict(data)
+            scores = -lof.negative_outlier_factor_
+
+        elif self.backend == 'random_projection':
+            graph = knn_graph(*self._approximate_knn(data, n_neighbors + 1))
+            lof = LocalOutlierFactor(n_neighbors=n_neighbors, contamination=contamination, metric='precomputed')
+            labels = lof.fit_predict(graph)
+            scores = -lof.negative_outlier_factor_
+
+        else:
+            sample = self._reservoir(len(data))
+            lof = LocalOutlierFactor(n_neighbors=n_neighbors, contamination=contamination,
+                                     algorithm=self.algorithm, novelty=True).fit(data[sample])
+            scores = np.empty(len(data))
+            scores[sample] = -lof.negative_outlier_factor_
+            rest = np.setdiff1d(np.arange(len(data)), sample, assume_unique=True)
+            for start in range(0, len(rest), self.batch_size):
+                batch = rest[start:start + self.batch_size]
+                scores[batch] = -lof.score_samples(data[batch])
+            # Same decision rule as LocalOutlierFactor.predict: factor above the fitted offset
+            labels = np.where(scores > -lof.offset_, -1, 1)
+
+        self.stats['seconds'] = time.monotonic() - start_time
+        return labels, scores
+
+    def dbscan(self, data: np.ndarray, eps: float = 0.5, min_samples: int = 5) -> np.ndarray:
+        """DBSCAN cluster labels (-1 for noise) for every row"""
+        from sklearn.cluster import DBSCAN
+        from sklearn.neighbors import NearestNeighbors
+
+        start_time = time.monotonic()
+        self.stats = {'rows': len(data)}
+
+        if self.backend == 'exact' or len(data) <= min_samples:
+            labels = DBSCAN(eps=eps, min_samples=min_samples, algorithm=self.algorithm).fit_predict(data)
+
+        elif self.backend == 'random_projection':
+            # Core points and cluster links come from a symmetrized approximate kNN graph;
+            # DBSCAN only follows the edges shorter than eps
+            graph = knn_graph(*self._approximate_knn(data, max(min_samples, 2) * 2), symmetric=True)
+            labels = DBSCAN(eps=eps, min_samples=min_samples, metric='precomputed').fit_predict(graph)
+
+        else:
+            sample = self._reservoir(len(data))
+            # Neighborhood counts shrink with the sampling fraction, so scale min_samples with it
+            sample_min_samples = max(2, int(np.ceil(min_samples * len(sample) / len(data))))
+            dbscan = DBSCAN(eps=eps, min_samples=sample_min_samples, algorithm=self.algorithm).fit(data[sample])
+            self.stats['sample_min_samples'] = sample_min_samples
+
+            labels = np.full(len(data), -1)
+            labels[sample] = dbscan.labels_
+            core = dbscan.core_sample_indices_
+            if len(core):
+                # Remaining rows join the cluster of the nearest core point within eps
+                nearest_core = NearestNeighbors(n_neighbors=1, algorithm=self.algorithm).fit(data[sample][core])
+                rest = np.setdiff1d(np.arange(len(data)), sample, assume_unique=True)
+                for start in range(0, len(rest), self.batch_size):
+                    batch = rest[start:start + self.batch_size]
+                    distance, position = nearest_core.kneighbors(data[batch])
+                    within = distance[:, 0] <= eps
+                    labels[batch[within]] = dbscan.labels_[core[position[within, 0]]]
+
+        self.stats['seconds'] = time.monotonic() - start_time
+        return labels
+
+    def _reservoir(self, n_rows: int) -> np.ndarray:
+        """Uniform sample of row positions (the whole matrix is already in memory)"""
+        rng = np.random.default_rng(self.random_state)
+        size = min(self.sample_size, n_rows)
+        self.stats['sampled_rows'] = size
+        return np.sort(rng.choice(n_rows, size=size, replace=False))
+
+    def _approximate_knn(self, data: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Leaves smaller than k + 1 could not supply enough candidates
+        leaf_size = max(self.leaf_size, 2 * k)
+        build_start = time.monotonic()
+        distances, indices = random_projection_knn(data, k, n_trees=self.n_trees, leaf_size=leaf_size,
+                                                   refine_iterations=self.refine_iterations,
+                                                   random_state=self.random_state)
+        self.stats.update(effective_leaf_size=leaf_size, index_seconds=time.monotonic() - build_start)
+
+        if self.recall_probes:
+            self.stats['estimated_recall'] = self._estimate_recall(data, indices)
+        return distances, indices
+
+    def _estimate_recall(self, data: np.ndarray, indices: np.ndarray) -> float:
+        """Share of the exact k nearest neighbors found, measured on a few probe rows"""
+        from sklearn.neighbors import NearestNeighbors
+
+        rng = np.random.default_rng(self.random_state)
+        probes = rng.choice(len(data), size=min(self.recall_probes, len(data)), replace=False)
+        k = indices.shape[1]
+        _, exact = NearestNeighbors(n_neighbors=k).fit(data).kneighbors(data[probes])
+        hits = sum(len(np.intersect1d(exact[i], indices[probe])) for i, probe in enumerate(probes))
+        return hits / (len(probes) * k)
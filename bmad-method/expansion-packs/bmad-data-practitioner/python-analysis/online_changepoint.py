@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Online Change Point Detection
+Bayesian online change-point detection with bounded, persistable state
+Processes observations one at a time so scheduled runs only look at new points
+"""
+
+import pickle
+import numpy as np
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def _logsumexp(values: np.ndarray) -> float:
+    peak = np.max(values)
+    if not np.isfinite(peak):
+        return float(peak)
+    return float(peak + np.log(np.sum(np.exp(values - peak))))
+
+
+class BayesianOnlineChangePoint:
+    """Bayesian online change-point detection (Adams & MacKay, 2007)
+
+    Observations are Gaussian with unknown mean and variance (Normal-Gamma
+    prior, Student-t predictive) and segment lengths follow a constant
+    hazard. The run-length posterior is truncated to ``window`` hypotheses,
+    with the mass of longer runs folded into the longest kept one, so both
+    the state and the cost per observation are O(window).
+
+    The prior is centred on the first ``warmup`` observations. A change is
+    reported once the posterior probability that the current segment is
+    between ``min_size`` and ``detection_lag`` points long exceeds
+    ``threshold``. Runs that are already ``min_size`` long treat each point
+    as an outlier with probability ``outlier_probability`` and update their
+    statistics with values winsorized at ``outlier_clip`` predictive standard
+    deviations, so isolated spikes are not reported as changes.
+    """
+
+    def __init__(self, hazard: float = 1 / 250, window: int = 300, min_size: int = 10,
+                 detection_lag: int = 20, threshold: float = 0.8, warmup: int = 30,
+                 outlier_probability: float = 0.01, outlier_clip: Optional[float] = 4.0):
+        if not min_size <= detection_lag < window:
+            raise ValueError("Expected min_size <= detection_lag < window")
+        self.hazard = hazard
+        self.window = window
+        self.min_size = min_size
+        self.detection_lag = detection_lag
+        self.threshold = threshold
+        self.warmup = max(warmup, 2)
+        self.outlier_probability = outlier_probability
+        self.outlier_clip = outlier_clip
+
+        # Global position of the next observation and of the current segment start
+        self.position = 0
+        self.last_change = 0
+        # Ordering key of the last observation, used by callers to resume
+        self.last_key: Any = None
+
+        self.prior: Optional[Dict[str, float]] = None
+        self.log_prob: Optional[np.ndarray] = None
+        self.mu: Optional[np.ndarray] = None
+        self.beta: Optional[np.ndarray] = None
+        self._kappa: Optional[np.ndarray] = None
+        self._alpha: Optional[np.ndarray] = None
+        self._log_norm: Optional[np.ndarray] = None
+
+        self.warmup_buffer: List[tuple] = []
+        # (position, label, value) of the observations a detection can point back to
+        self.recent: deque = deque(maxlen=detection_lag + 1)
+
+    @property
+    def initialized(self) -> bool:
+        return self.prior is not None
+
+    def update(self, values: Sequence[float], labels: Optional[Sequence[Any]] = None,
+               keys: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+        """Feed observations in order; returns the change points they confirm
+
+        ``labels`` (e.g. row index values) are echoed back in the detections;
+        ``keys`` only record ``last_key`` for resuming. NaNs are skipped.
+        """
+        values = np.asarray(values, dtype=float)
+        labels = range(self.position, self.position + len(values)) if labels is None else labels
+        detections = []
+
+        for label, value in zip(labels, values):
+            if np.isnan(value):
+                continue
+            if not self.initialized:
+                self.warmup_buffer.append((label, value))
+                if len(self.warmup_buffer) >= self.warmup:
+                    detections.extend(self._initialize())
+                continue
+            detection = self._step(label, value)
+            if detection is not None:
+                detections.append(detection)
+
+        if keys is not None and len(keys):
+            self.last_key = keys[-1]
+        return detections
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Start detection on a short warm-up buffer (for one-shot runs on short series)"""
+        if self.initialized or len(self.warmup_buffer) < 2:
+            return []
+        return self._initialize()
+
+    def _initialize(self) -> List[Dict[str, Any]]:
+        from scipy.special import gammaln
+
+        buffered = np.array([value for _, value in self.warmup_buffer])
+        variance = float(np.var(buffered)) or 1.0
+        self.prior = {'mu': float(np.mean(buffered)), 'kappa': 1.0, 'alpha': 1.0, 'beta': variance}
+
+        # Posterior kappa/alpha and the Student-t normalising constants depend only on the run length
+        run_length = np.arange(self.window)
+        self._kappa = self.prior['kappa'] + run_length
+        self._alpha = self.prior['alpha'] + 0.5 * run_length
+        self._log_norm = gammaln(self._alpha + 0.5) - gammaln(self._alpha) - 0.5 * np.log(2 * np.pi * self._alpha)
+
+        self.log_prob = np.zeros(1)
+        self.mu = np.array([self.prior['mu']])
+        self.beta = np.array([self.prior['beta']])
+
+        pending, self.warmup_buffer = self.warmup_buffer, []
+        detections = []
+        for label, value in pending:
+            detection = self._step(label, value)
+            if detection is not None:
+                detections.append(detection)
+        return detections
+
+    def _step(self, label: Any, value: float) -> Optional[Dict[str, Any]]:
+        run_lengths = len(self.log_prob)
+        kappa = self._kappa[:run_lengths]
+        alpha = self._alpha[:run_lengths]
+
+        # Predictive log-density of the observation under every run length
+        scale2 = self.beta * (kappa + 1) / (alpha * kappa)
+        log_pred = (self._log_norm[:run_lengths] - 0.5 * np.log(scale2)
+                    - (alpha + 0.5) * np.log1p((value - self.mu) ** 2 / (2 * alpha * scale2)))
+
+        established = kappa >= self.prior['kappa'] + self.min_size
+        if self.outlier_probability:
+            # Established runs explain a spike with the broad prior predictive at a small
+            # probability instead of conceding it to a run that starts at the spike
+            log_pred = np.where(established, np.logaddexp(
+                np.log1p(-self.outlier_probability) + log_pred,
+                np.log(self.outlier_probability) + log_pred[0]
+            ), log_pred)
+
+        joint = self.log_prob + log_pred
+        log_prob = np.concatenate([[_logsumexp(joint) + np.log(self.hazard)], joint + np.log1p(-self.hazard)])
+
+        # Established runs absorb outliers winsorized, so one spike cannot inflate their variance
+        deviation = value - self.mu
+        if self.outlier_clip:
+            limit = self.outlier_clip * np.sqrt(scale2)
+            deviation = np.where(established, np.clip(deviation, -limit, limit), deviation)
+        mu = np.concatenate([[self.prior['mu']], self.mu + deviation / (kappa + 1)])
+        beta = np.concatenate([[self.prior['beta']], self.beta + kappa * deviation ** 2 / (2 * (kappa + 1))])
+
+        if len(log_prob) > self.window:
+            # Fold the longest run into the longest one kept
+            log_prob[self.window - 1] = np.logaddexp(log_prob[self.window - 1], log_prob[self.window])
+            log_prob, mu, beta = log_prob[:self.window], mu[:self.window], beta[:self.window]
+
+        self.log_prob = log_prob - _logsumexp(log_prob)
+        self.mu, self.beta = mu, beta
+
+        position = self.position
+        self.position += 1
+        self.recent.append((position, label, value))
+        return self._detect(position)
+
+    def _detect(self, position: int) -> Optional[Dict[str, Any]]:
+        upper = min(self.detection_lag, len(self.log_prob) - 1)
+        if upper < self.min_size:
+            return None
+
+        candidates = self.log_prob[self.min_size:upper + 1]
+        probability = float(np.exp(_logsumexp(candidates)))
+        if probability <= self.threshold:
+            return None
+
+        # Run length r covers the last r observations, so the segment starts r - 1 points back
+        run_length = self.min_size + int(np.argmax(candidates))
+        change = position - run_length + 1
+        if change - self.last_change < self.min_size:
+            return None
+
+        self.last_change = change
+        for recent_position, label, value in self.recent:
+            if recent_position == change:
+                return {
+                    'position': change,
+                    'label': label,
+                    'value': value,
+                    'probability': probability,
+                    'run_length': run_length
+                }
+        return None
+
+    def state_size(self) -> int:
+        """Number of run-length hypotheses currently held"""
+        return 0 if self.log_prob is None else len(self.log_prob)
+
+    def save(self, path: str):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'BayesianOnlineChangePoint':
+        with open(path, 'rb') as f:
+            return pickle.load(f)
@@ -8,52 +8,68 @@ Supports time series analysis, clustering, and visualization
 import json
 import sys
 import argparse
+import importlib
+import subprocess
 import warnings
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 import hashlib
+import multiprocessing
+import pickle
+import time
 from datetime import datetime
 
-# Statistical libraries
-from scipy import stats
-from scipy.spatial.distance import mahalanobis
-from sklearn.ensemble import IsolationForest
-from sklearn.neighbors import LocalOutlierFactor
-from sklearn.svm import OneClassSVM
-from sklearn.covariance import EllipticEnvelope
-from sklearn.cluster import KMeans, DBSCAN
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import silhouette_score
+from analysis_cache import DiskCache, frame_fingerprint
+from streaming_sketches import RunningMoments, QuantileSketch, column_sketches, update_column_sketches
+from online_changepoint import BayesianOnlineChangePoint
+from neighbor_search import NEIGHBOR_PARAMETERS, NeighborSearch
+from correlation_engine import iter_high_correlations
+from data_loader import iter_chunks, load_frame, load_options
 
-# Time series libraries
-try:
-    from statsmodels.tsa.seasonal import seasonal_decompose, STL
-    from statsmodels.tsa.arima.model import ARIMA
-    import ruptures as rpt  # For change point detection
-    HAS_TIME_SERIES_LIBS = True
-except ImportError:
-    print("Warning: Some time series libraries not available", file=sys.stderr)
-    HAS_TIME_SERIES_LIBS = False
+# Heavy and optional dependencies (scikit-learn, SciPy, statsmodels, ruptures,
+# TensorFlow) are imported by the detectors that use them, on first use, so a
+# simple statistical run does not pay for loading them.
+PROFILED_DEPENDENCIES = (
+    'numpy', 'pandas', 'scipy.stats', 'sklearn.ensemble', 'sklearn.neighbors', 'sklearn.svm',
+    'sklearn.covariance', 'sklearn.cluster', 'sklearn.metrics', 'sklearn.preprocessing',
+    'statsmodels.tsa.seasonal', 'ruptures', 'tensorflow'
+)
+_MISSING_MODULES = set()
 
-# Neural network libraries
-try:
-    import tensorflow as tf
-    from tensorflow import keras
-    HAS_TENSORFLOW = True
-except ImportError:
-    HAS_TENSORFLOW = False
+def _optional_import(module_name: str):
+    """Import an optional dependency on first use; None (warning once) if unavailable"""
+    if module_name in _MISSING_MODULES:
+        return None
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        _MISSING_MODULES.add(module_name)
+        print(f"Warning: Optional dependency {module_name} not available", file=sys.stderr)
+        return None
+
+def _keras():
+    tensorflow = _optional_import('tensorflow')
+    return tensorflow.keras if tensorflow is not None else None
 
-# Visualization libraries
-try:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    HAS_PLOTTING = True
-except ImportError:
-    HAS_PLOTTING = False
+def profile_imports(modules: Tuple[str, ...] = PROFILED_DEPENDENCIES) -> Dict[str, Any]:
+    """Cold import cost per dependency, each measured in a fresh interpreter"""
+    def timed_import(statement: str) -> Dict[str, Any]:
+        code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+        process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        if process.returncode != 0:
+            return {'available': False, 'seconds': None}
+        return {'available': True, 'seconds': float(process.stdout.strip().splitlines()[-1])}
+    
+    script_dir = str(Path(__file__).resolve().parent)
+    return {
+        'dependencies': {module_name: timed_import(f"import {module_name}") for module_name in modules},
+        'pattern_detection_module': timed_import(
+            f"import sys; sys.path.insert(0, {script_dir!r}); import pattern_detection"
+        )
+    }
 
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
@@ -98,29 +114,268 @@ class PatternResult:
             'affected_indices': self.affected_indices
         }
 
+SEVERITY_LEVELS = ('low', 'medium', 'high')
+UNIVARIATE_METHODS = ('zscore', 'modified_zscore', 'iqr', 'percentile')
+SCORABLE_METHODS = ('isolation_forest', 'local_outlier_factor', 'one_class_svm',
+                    'elliptic_envelope', 'cluster_anomalies', 'autoencoder')
+# Tuning parameters accepted by the online change point detector
+CHANGE_POINT_PARAMETERS = ('hazard', 'window', 'min_size', 'detection_lag', 'threshold', 'warmup',
+                           'outlier_probability', 'outlier_clip')
+# Parameters that only shape the output and never affect a fitted model
+OUTPUT_PARAMETERS = ('result_mode', 'include_coordinates', 'output_format', 'output_path')
+
+def severity_codes(scores: np.ndarray) -> np.ndarray:
+    """Vectorized counterpart of PatternDetector._classify_severity (codes index SEVERITY_LEVELS)"""
+    scores = np.asarray(scores, dtype=float)
+    return (scores > 1.0).astype(np.int8) + (scores > 2.0).astype(np.int8)
+
+def classical_decompose(values: np.ndarray, period: int,
+                        model: str = 'additive') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Moving-average seasonal decomposition of equal-length series stacked as rows
+    
+    Row-wise equivalent of statsmodels' ``seasonal_decompose`` (two-sided
+    filter, no trend extrapolation): trend and residual are NaN at the edges.
+    Returns (trend, seasonal, residual) arrays shaped like ``values``.
+    """
+    from scipy.ndimage import correlate1d
+    
+    n_series, n_obs = values.shape
+    if period % 2 == 0:
+        weights = np.r_[0.5, np.ones(period - 1), 0.5] / period
+    else:
+        weights = np.full(period, 1.0 / period)
+    half = len(weights) // 2
+    
+    trend = correlate1d(values, weights, axis=1, mode='constant')
+    trend[:, :half] = np.nan
+    trend[:, n_obs - half:] = np.nan
+    
+    multiplicative = model.startswith('m')
+    detrended = values / trend if multiplicative else values - trend
+    
+    # Average each seasonal phase across cycles, padding the last partial cycle with NaN
+    cycles = -(-n_obs // period)
+    padded = np.full((n_series, cycles * period), np.nan)
+    padded[:, :n_obs] = detrended
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        phase_means = np.nanmean(padded.reshape(n_series, cycles, period), axis=1)
+    if multiplicative:
+        phase_means /= phase_means.mean(axis=1, keepdims=True)
+    else:
+        phase_means -= phase_means.mean(axis=1, keepdims=True)
+    seasonal = np.tile(phase_means, cycles)[:, :n_obs]
+    
+    residual = detrended / seasonal if multiplicative else detrended - seasonal
+    return trend, seasonal, residual
+
+@dataclass
+class AnomalyTable:
+    """Array-backed container for anomaly detection results
+    
+    Rows are only turned into AnomalyResult objects when a caller iterates
+    the table, so large detections stay in NumPy until they are serialized.
+    """
+    index: np.ndarray
+    confidence: np.ndarray
+    severity: np.ndarray
+    value: Optional[np.ndarray] = None
+    column: Optional[np.ndarray] = None
+    coordinates: Optional[np.ndarray] = None
+    identifier: Optional[np.ndarray] = None
+    description_template: Optional[str] = None
+    description_fields: Dict[str, Any] = field(default_factory=dict)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def __iter__(self):
+        return (self.result(i) for i in range(len(self)))
+    
+    def description(self, i: int) -> Optional[str]:
+        if self.description_template is None:
+            return None
+        fields = {name: values[i] if isinstance(values, np.ndarray) else values
+                  for name, values in self.description_fields.items()}
+        return self.description_template.format(**fields)
+    
+    def result(self, i: int) -> AnomalyResult:
+        return AnomalyResult(
+            index=int(self.index[i]),
+            value=float(self.value[i]) if self.value is not None else None,
+            coordinates=self.coordinates[i].tolist() if self.coordinates is not None else None,
+            identifier=str(self.identifier[i]) if self.identifier is not None else None,
+            confidence=float(self.confidence[i]),
+            severity=SEVERITY_LEVELS[self.severity[i]],
+            description=self.description(i)
+        )
+    
+    def to_results(self) -> List[AnomalyResult]:
+        return list(self)
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        return [a.to_dict() for a in self]
+    
+    def to_columns(self, include_coordinates: bool = True) -> Dict[str, Any]:
+        """Parallel-array representation of the table
+        
+        ``identifier`` is the series key of grouped seasonal runs and None
+        otherwise, as in the record form; the Arrow and Parquet outputs carry
+        it as a nullable string column.
+        """
+        columns = {
+            'index': self.index.tolist(),
+            'value': self.value.tolist() if self.value is not None else None,
+            'column': self.column.tolist() if self.column is not None else None,
+            'identifier': self.identifier.tolist() if self.identifier is not None else None,
+            'confidence': self.confidence.tolist(),
+            'severity': [SEVERITY_LEVELS[code] for code in self.severity],
+            'description': [self.description(i) for i in range(len(self))]
+        }
+        if include_coordinates and self.coordinates is not None:
+            columns['coordinates'] = self.coordinates.tolist()
+        return columns
+    
+    def to_arrow(self, include_coordinates: bool = True):
+        """Arrow table built directly from the backing arrays"""
+        import pyarrow as pa
+        
+        columns = {
+            'index': pa.array(self.index),
+            'value': pa.array(self.value, from_pandas=True) if self.value is not None else pa.nulls(len(self), pa.float64()),
+            'column': pa.array(self.column.astype(str)) if self.column is not None else pa.nulls(len(self), pa.string()),
+            'identifier': pa.array(self.identifier.astype(str)) if self.identifier is not None else pa.nulls(len(self), pa.string()),
+            'confidence': pa.array(self.confidence, type=pa.float64()),
+            'severity': pa.DictionaryArray.from_arrays(
+                pa.array(self.severity, type=pa.int8()), pa.array(SEVERITY_LEVELS)
+            ),
+            'description': pa.array([self.description(i) for i in range(len(self))], type=pa.string())
+        }
+        if include_coordinates and self.coordinates is not None:
+            coordinates = np.asarray(self.coordinates, dtype=float)
+            columns['coordinates'] = pa.FixedSizeListArray.from_arrays(
+                pa.array(coordinates.ravel()), coordinates.shape[1]
+            )
+        return pa.table(columns)
+    
+    def take(self, positions: np.ndarray) -> 'AnomalyTable':
+        """Select rows by position"""
+        def pick(values):
+            return values[positions] if isinstance(values, np.ndarray) else values
+        return AnomalyTable(
+            index=self.index[positions],
+            confidence=self.confidence[positions],
+            severity=self.severity[positions],
+            value=pick(self.value),
+            column=pick(self.column),
+            coordinates=pick(self.coordinates),
+            identifier=pick(self.identifier),
+            description_template=self.description_template,
+            description_fields={name: pick(values) for name, values in self.description_fields.items()}
+        )
+    
+    @classmethod
+    def empty(cls) -> 'AnomalyTable':
+        return cls(index=np.empty(0, dtype=np.int64), confidence=np.empty(0), severity=np.empty(0, dtype=np.int8))
+    
+    @classmethod
+    def concat(cls, tables: List['AnomalyTable']) -> 'AnomalyTable':
+        """Concatenate tables produced by the same detector"""
+        if not tables:
+            return cls.empty()
+        first = tables[0]
+        
+        def join(values, parts):
+            return np.concatenate(parts) if isinstance(values, np.ndarray) else values
+        
+        return cls(
+            index=np.concatenate([t.index for t in tables]),
+            confidence=np.concatenate([t.confidence for t in tables]),
+            severity=np.concatenate([t.severity for t in tables]),
+            value=join(first.value, [t.value for t in tables]),
+            column=join(first.column, [t.column for t in tables]),
+            coordinates=join(first.coordinates, [t.coordinates for t in tables]),
+            identifier=join(first.identifier, [t.identifier for t in tables]),
+            description_template=first.description_template,
+            description_fields={name: join(values, [t.description_fields[name] for t in tables])
+                                for name, values in first.description_fields.items()}
+        )
+    
+    @classmethod
+    def from_results(cls, results: List[AnomalyResult]) -> 'AnomalyTable':
+        """Build a table from already materialized results"""
+        has_value = any(r.value is not None for r in results)
+        has_coordinates = bool(results) and all(r.coordinates is not None for r in results)
+        has_identifier = any(r.identifier is not None for r in results)
+        return cls(
+            index=np.array([r.index for r in results]),
+            value=np.array([np.nan if r.value is None else r.value for r in results], dtype=float) if has_value else None,
+            coordinates=np.array([r.coordinates for r in results], dtype=float) if has_coordinates else None,
+            identifier=np.array([r.identifier for r in results], dtype=object) if has_identifier else None,
+            confidence=np.array([r.confidence for r in results], dtype=float),
+            severity=np.array([SEVERITY_LEVELS.index(r.severity) for r in results], dtype=np.int8),
+            description_template='{description}',
+            description_fields={'description': np.array([r.description for r in results], dtype=object)}
+        )
+
+@dataclass
+class FittedDetector:
+    """Reference model fitted once and reused to score new partitions"""
+    method: str
+    parameters: Dict[str, Any]
+    columns: List[str]
+    scaler: Any
+    model: Any
+    threshold: Optional[float] = None
+    reference_rows: int = 0
+    fitted_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    
+    def age_hours(self) -> float:
+        return (datetime.now() - datetime.fromisoformat(self.fitted_at)).total_seconds() / 3600
+    
+    def save(self, path: str):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Plain field values: pickling the instance would record __main__.FittedDetector
+        # when run as a script, which the worker's import of this module cannot load
+        state = {f.name: getattr(self, f.name) for f in fields(self)}
+        with open(path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    @classmethod
+    def load(cls, path: str) -> 'FittedDetector':
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        return state if isinstance(state, cls) else cls(**state)
+
 class PatternDetector:
     """Comprehensive pattern detection and anomaly identification"""
     
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
         self.data = None
-        self.scaler = StandardScaler()
-        
-    def load_data(self, data_source: str) -> pd.DataFrame:
-        """Load data from various sources"""
-        try:
-            if data_source.endswith('.csv'):
-                return pd.read_csv(data_source)
-            elif data_source.endswith('.json'):
-                return pd.read_json(data_source)
-            elif data_source.endswith('.xlsx'):
-                return pd.read_excel(data_source)
-            else:
-                raise ValueError(f"Unsupported file format: {data_source}")
-        except Exception as e:
-            # For testing, create mock data
-            print(f"Warning: Could not load {data_source}, creating mock data: {e}", file=sys.stderr)
+        self.scaler = None
+        # (frame, numeric rows, scaled matrix) shared across methods by execute_detection_suite
+        self._shared_matrix = None
+        
+        # Persistent cache of fitted models keyed by dataset fingerprint and parameters
+        cache_config = self.config.get('model_cache', {})
+        self.model_cache = DiskCache(
+            cache_config.get('path', '.cache/pattern-models'),
+            cache_config.get('max_bytes', 512 * 1024 * 1024)
+        ) if cache_config.get('enabled', False) else None
+        self.fingerprint_sample_rows = cache_config.get('fingerprint_sample_rows', 100000)
+        
+    def load_data(self, data_source: str, **options) -> pd.DataFrame:
+        """Load data from various sources
+
+        ``options`` are passed to ``data_loader.load_frame`` (columns, filters,
+        source_type, table, query, ...). Load failures are raised; the source
+        ``'mock'`` selects the built-in test data.
+        """
+        if data_source == 'mock':
             return self._create_mock_data()
+        return load_frame(data_source, **options)
     
     def _create_mock_data(self) -> pd.DataFrame:
         """Create mock data for testing"""
@@ -156,101 +411,229 @@ class PatternDetector:
     # Statistical Anomaly Detection Methods
     def detect_zscore_outliers(self, data: pd.Series, threshold: float = 3.0) -> List[AnomalyResult]:
         """Z-score based outlier detection"""
-        z_scores = np.abs(stats.zscore(data.dropna()))
-        outliers = []
-        
-        for idx, (orig_idx, z_score) in enumerate(zip(data.index, z_scores)):
-            if z_score > threshold:
-                outliers.append(AnomalyResult(
-                    index=int(orig_idx),
-                    value=float(data.iloc[idx]),
-                    confidence=min(z_score / threshold / 2, 1.0),
-                    severity=self._classify_severity(z_score / threshold),
-                    description=f"Z-score: {z_score:.3f} (threshold: {threshold})"
-                ))
-        
-        return outliers
+        return self.detect_univariate_outliers(data.to_frame(), 'zscore', threshold=threshold).to_results()
     
     def detect_iqr_outliers(self, data: pd.Series, multiplier: float = 1.5) -> List[AnomalyResult]:
         """Interquartile range based outlier detection"""
-        Q1 = data.quantile(0.25)
-        Q3 = data.quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - multiplier * IQR
-        upper_bound = Q3 + multiplier * IQR
-        
-        outliers = []
-        for idx, value in data.items():
-            if value < lower_bound or value > upper_bound:
-                distance = max(lower_bound - value, value - upper_bound, 0)
-                confidence = min(distance / IQR, 1.0)
-                
-                outliers.append(AnomalyResult(
-                    index=int(idx),
-                    value=float(value),
-                    confidence=confidence,
-                    severity=self._classify_severity(confidence * 2),
-                    description=f"IQR outlier: {value:.3f} (bounds: {lower_bound:.3f}, {upper_bound:.3f})"
-                ))
-        
-        return outliers
+        return self.detect_univariate_outliers(data.to_frame(), 'iqr', multiplier=multiplier).to_results()
     
     def detect_modified_zscore_outliers(self, data: pd.Series, threshold: float = 3.5) -> List[AnomalyResult]:
         """Modified Z-score using median absolute deviation"""
-        median = data.median()
-        mad = np.median(np.abs(data - median))
-        modified_z_scores = 0.6745 * (data - median) / mad
-        
-        outliers = []
-        for idx, (orig_idx, mod_z_score) in enumerate(zip(data.index, modified_z_scores)):
-            if abs(mod_z_score) > threshold:
-                outliers.append(AnomalyResult(
-                    index=int(orig_idx),
-                    value=float(data.iloc[idx]),
-                    confidence=min(abs(mod_z_score) / threshold / 2, 1.0),
-                    severity=self._classify_severity(abs(mod_z_score) / threshold),
-                    description=f"Modified Z-score: {mod_z_score:.3f} (threshold: {threshold})"
-                ))
-        
-        return outliers
+        return self.detect_univariate_outliers(data.to_frame(), 'modified_zscore', threshold=threshold).to_results()
     
     def detect_percentile_outliers(self, data: pd.Series, lower: float = 1, upper: float = 99) -> List[AnomalyResult]:
         """Percentile-based outlier detection"""
-        lower_bound = data.quantile(lower / 100)
-        upper_bound = data.quantile(upper / 100)
+        return self.detect_univariate_outliers(data.to_frame(), 'percentile', lower=lower, upper=upper).to_results()
+    
+    def detect_univariate_outliers(self, data: pd.DataFrame, method: str, **params) -> AnomalyTable:
+        """Vectorized univariate outlier detection over all numeric columns at once
+        
+        Masks, scores, confidence and severity are computed as (rows x columns)
+        arrays; only the flagged cells are gathered into the returned table.
+        """
+        numeric_data = data.select_dtypes(include=[np.number])
+        values = numeric_data.to_numpy(dtype=float)
+        statistics = self._univariate_statistics(values, method, params)
+        return self._flag_univariate_outliers(values, numeric_data.index, numeric_data.columns,
+                                              method, params, statistics)
+    
+    def detect_univariate_outliers_streaming(self, data_source: str, method: str, chunksize: int = 100000,
+                                             sketch_size: int = 1000, **params) -> Tuple[AnomalyTable, Dict[str, Any]]:
+        """Two-pass, bounded-memory univariate outlier detection over a chunked source
+        
+        The first pass folds every chunk into mergeable sketches (running
+        moments and KLL quantile sketches); the second pass re-reads the source
+        and flags each chunk against the resulting reference statistics.
+        """
+        if method not in UNIVARIATE_METHODS:
+            raise ValueError(f"Streaming mode does not support method: {method}")
+        
+        columns, moments, sketches = None, None, None
+        rows_processed, chunk_count = 0, 0
+        
+        for chunk in self.iter_chunks(data_source, chunksize):
+            if columns is None:
+                columns = chunk.select_dtypes(include=[np.number]).columns
+                moments = RunningMoments(len(columns))
+                sketches = column_sketches(len(columns), k=sketch_size)
+            values = self._numeric_chunk_values(chunk, columns)
+            moments.update(values)
+            if method != 'zscore':
+                update_column_sketches(sketches, values)
+            rows_processed += len(chunk)
+            chunk_count += 1
+        
+        metadata = {
+            'mode': 'streaming',
+            'rows_processed': rows_processed,
+            'chunks': chunk_count,
+            'chunksize': chunksize,
+            'approximate_statistics': method != 'zscore',
+            'sketch_size': sketch_size if method != 'zscore' else None
+        }
         
-        outliers = []
-        for idx, value in data.items():
-            if value < lower_bound or value > upper_bound:
-                if value < lower_bound:
-                    confidence = (lower_bound - value) / (data.max() - data.min())
-                else:
-                    confidence = (value - upper_bound) / (data.max() - data.min())
-                
-                outliers.append(AnomalyResult(
-                    index=int(idx),
-                    value=float(value),
-                    confidence=min(confidence * 5, 1.0),
-                    severity=self._classify_severity(confidence * 5),
-                    description=f"Percentile outlier: {value:.3f} ({lower}%-{upper}% bounds: {lower_bound:.3f}, {upper_bound:.3f})"
-                ))
+        if columns is None or len(columns) == 0:
+            return AnomalyTable.empty(), metadata
         
-        return outliers
+        statistics = self._sketch_univariate_statistics(moments, sketches, method, params)
+        tables = [
+            self._flag_univariate_outliers(self._numeric_chunk_values(chunk, columns), chunk.index, columns,
+                                           method, params, statistics)
+            for chunk in self.iter_chunks(data_source, chunksize)
+        ]
+        table = AnomalyTable.concat(tables)
+        
+        # Restore the column-major ordering of the in-memory detectors
+        order = np.argsort(columns.get_indexer(table.column), kind='stable')
+        return table.take(order), metadata
+    
+    def iter_chunks(self, data_source: str, chunksize: int = 100000, columns: Optional[List[str]] = None):
+        """Yield DataFrame chunks of ``columns`` from a source without loading it whole"""
+        return iter_chunks(data_source, chunksize, columns)
+    
+    def _numeric_chunk_values(self, chunk: pd.DataFrame, columns: pd.Index) -> np.ndarray:
+        # Chunks are typed independently, so coerce to the columns found in the first one
+        return chunk.reindex(columns=columns).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    
+    def _univariate_statistics(self, values: np.ndarray, method: str, params: Dict) -> Dict[str, np.ndarray]:
+        """Exact per-column reference statistics for a univariate method"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if method == 'zscore':
+                return {'mean': np.nanmean(values, axis=0), 'std': np.nanstd(values, axis=0)}
+            
+            if method == 'modified_zscore':
+                median = np.nanmedian(values, axis=0)
+                return {'median': median, 'mad': np.nanmedian(np.abs(values - median), axis=0)}
+            
+            if method == 'iqr':
+                q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+                return {'q1': q1, 'q3': q3}
+            
+            if method == 'percentile':
+                lower, upper = params.get('lower', 1), params.get('upper', 99)
+                lower_bound, upper_bound = np.nanquantile(values, [lower / 100, upper / 100], axis=0)
+                return {
+                    'lower_bound': lower_bound,
+                    'upper_bound': upper_bound,
+                    'minimum': np.nanmin(values, axis=0),
+                    'maximum': np.nanmax(values, axis=0)
+                }
+        
+        raise ValueError(f"Unknown univariate detection method: {method}")
+    
+    def _sketch_univariate_statistics(self, moments: RunningMoments, sketches: List[QuantileSketch],
+                                      method: str, params: Dict) -> Dict[str, np.ndarray]:
+        """Reference statistics approximated from streaming sketches"""
+        if method == 'zscore':
+            return {'mean': moments.mean, 'std': moments.std()}
+        
+        if method == 'modified_zscore':
+            return {
+                'median': np.array([sketch.quantile(0.5) for sketch in sketches]),
+                'mad': np.array([sketch.median_absolute_deviation() for sketch in sketches])
+            }
+        
+        if method == 'iqr':
+            q1, q3 = np.array([sketch.quantile([0.25, 0.75]) for sketch in sketches]).T
+            return {'q1': q1, 'q3': q3}
+        
+        if method == 'percentile':
+            lower, upper = params.get('lower', 1), params.get('upper', 99)
+            lower_bound, upper_bound = np.array([sketch.quantile([lower / 100, upper / 100]) for sketch in sketches]).T
+            return {
+                'lower_bound': lower_bound,
+                'upper_bound': upper_bound,
+                'minimum': moments.minimum,
+                'maximum': moments.maximum
+            }
+        
+        raise ValueError(f"Unknown univariate detection method: {method}")
+    
+    def _flag_univariate_outliers(self, values: np.ndarray, index: pd.Index, columns: pd.Index,
+                                  method: str, params: Dict, statistics: Dict[str, np.ndarray]) -> AnomalyTable:
+        """Flag cells against per-column reference statistics"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if method == 'zscore':
+                threshold = params.get('threshold', 3.0)
+                scores = np.abs((values - statistics['mean']) / statistics['std'])
+                mask = scores > threshold
+                confidence = np.minimum(scores / threshold / 2, 1.0)
+                severity_scores = scores / threshold
+                template = "Z-score: {score:.3f} (threshold: {threshold})"
+                constants = {'threshold': threshold}
+                bounds = {}
+            
+            elif method == 'modified_zscore':
+                threshold = params.get('threshold', 3.5)
+                scores = 0.6745 * (values - statistics['median']) / statistics['mad']
+                mask = np.abs(scores) > threshold
+                confidence = np.minimum(np.abs(scores) / threshold / 2, 1.0)
+                severity_scores = np.abs(scores) / threshold
+                template = "Modified Z-score: {score:.3f} (threshold: {threshold})"
+                constants = {'threshold': threshold}
+                bounds = {}
+            
+            elif method == 'iqr':
+                multiplier = params.get('multiplier', 1.5)
+                iqr = statistics['q3'] - statistics['q1']
+                lower_bound = statistics['q1'] - multiplier * iqr
+                upper_bound = statistics['q3'] + multiplier * iqr
+                mask = (values < lower_bound) | (values > upper_bound)
+                distance = np.maximum(np.maximum(lower_bound - values, values - upper_bound), 0)
+                scores = np.minimum(distance / iqr, 1.0)
+                confidence = scores
+                severity_scores = scores * 2
+                template = "IQR outlier: {value:.3f} (bounds: {lower_bound:.3f}, {upper_bound:.3f})"
+                constants = {}
+                bounds = {'lower_bound': lower_bound, 'upper_bound': upper_bound}
+            
+            elif method == 'percentile':
+                lower_bound, upper_bound = statistics['lower_bound'], statistics['upper_bound']
+                value_range = statistics['maximum'] - statistics['minimum']
+                mask = (values < lower_bound) | (values > upper_bound)
+                scores = np.where(values < lower_bound, lower_bound - values, values - upper_bound) / value_range
+                confidence = np.minimum(scores * 5, 1.0)
+                severity_scores = scores * 5
+                template = ("Percentile outlier: {value:.3f} ({lower}%-{upper}% bounds: "
+                            "{lower_bound:.3f}, {upper_bound:.3f})")
+                constants = {'lower': params.get('lower', 1), 'upper': params.get('upper', 99)}
+                bounds = {'lower_bound': lower_bound, 'upper_bound': upper_bound}
+            
+            else:
+                raise ValueError(f"Unknown univariate detection method: {method}")
+        
+        # Column-major gather keeps the per-column ordering of the row-wise detectors
+        cols, rows = np.nonzero(mask.T)
+        flagged_values = values[rows, cols]
+        fields = {'score': scores[rows, cols], 'value': flagged_values, **constants}
+        fields.update({name: bound[cols] for name, bound in bounds.items()})
+        
+        return AnomalyTable(
+            index=np.asarray(index)[rows],
+            value=flagged_values,
+            column=np.asarray(columns)[cols],
+            confidence=confidence[rows, cols],
+            severity=severity_codes(severity_scores[rows, cols]),
+            description_template=template,
+            description_fields=fields
+        )
     
     # Machine Learning Anomaly Detection Methods
     def detect_isolation_forest_anomalies(self, data: pd.DataFrame, contamination: float = 0.1) -> List[AnomalyResult]:
         """Isolation Forest anomaly detection"""
-        numeric_data = data.select_dtypes(include=[np.number]).dropna()
+        numeric_data, scaled_data = self._numeric_matrix(data)
         
         if numeric_data.empty:
             return []
         
-        # Scale the data
-        scaled_data = self.scaler.fit_transform(numeric_data)
+        from sklearn.ensemble import IsolationForest
         
-        # Fit Isolation Forest
-        iso_forest = IsolationForest(contamination=contamination, random_state=42)
-        outlier_labels = iso_forest.fit_predict(scaled_data)
+        # Fit Isolation Forest (or reuse a cached fit of the same data)
+        iso_forest = self._cached_model(
+            'isolation_forest', numeric_data, {'contamination': contamination},
+            lambda: IsolationForest(contamination=contamination, random_state=42).fit(scaled_data)
+        )
+        outlier_labels = iso_forest.predict(scaled_data)
         
         # Get anomaly scores
         anomaly_scores = iso_forest.decision_function(scaled_data)
@@ -269,22 +652,20 @@ class PatternDetector:
         
         return outliers
     
-    def detect_lof_anomalies(self, data: pd.DataFrame, n_neighbors: int = 20, contamination: float = 0.1) -> List[AnomalyResult]:
-        """Local Outlier Factor anomaly detection"""
-        numeric_data = data.select_dtypes(include=[np.number]).dropna()
+    def detect_lof_anomalies(self, data: pd.DataFrame, n_neighbors: int = 20, contamination: float = 0.1,
+                             search: Optional[NeighborSearch] = None) -> List[AnomalyResult]:
+        """Local Outlier Factor anomaly detection
+        
+        ``search`` selects the neighbor-search backend (exact trees by default).
+        """
+        numeric_data, scaled_data = self._numeric_matrix(data)
         
         if numeric_data.empty:
             return []
         
-        # Scale the data
-        scaled_data = self.scaler.fit_transform(numeric_data)
-        
-        # Fit LOF
-        lof = LocalOutlierFactor(n_neighbors=n_neighbors, contamination=contamination)
-        outlier_labels = lof.fit_predict(scaled_data)
-        
-        # Get negative outlier factor scores
-        lof_scores = -lof.negative_outlier_factor_
+        # Fit LOF and get the outlier factor scores
+        search = search or NeighborSearch()
+        outlier_labels, lof_scores = search.lof(scaled_data, n_neighbors, contamination)
         
         outliers = []
         for idx, (label, score) in enumerate(zip(outlier_labels, lof_scores)):
@@ -302,17 +683,19 @@ class PatternDetector:
     
     def detect_one_class_svm_anomalies(self, data: pd.DataFrame, nu: float = 0.1) -> List[AnomalyResult]:
         """One-Class SVM anomaly detection"""
-        numeric_data = data.select_dtypes(include=[np.number]).dropna()
+        numeric_data, scaled_data = self._numeric_matrix(data)
         
         if numeric_data.empty:
             return []
         
-        # Scale the data
-        scaled_data = self.scaler.fit_transform(numeric_data)
+        from sklearn.svm import OneClassSVM
         
-        # Fit One-Class SVM
-        svm = OneClassSVM(nu=nu, kernel='rbf', gamma='scale')
-        outlier_labels = svm.fit_predict(scaled_data)
+        # Fit One-Class SVM (or reuse a cached fit of the same data)
+        svm = self._cached_model(
+            'one_class_svm', numeric_data, {'nu': nu, 'kernel': 'rbf', 'gamma': 'scale'},
+            lambda: OneClassSVM(nu=nu, kernel='rbf', gamma='scale').fit(scaled_data)
+        )
+        outlier_labels = svm.predict(scaled_data)
         
         # Get distance from separating hyperplane
         decision_scores = svm.decision_function(scaled_data)
@@ -333,13 +716,12 @@ class PatternDetector:
     
     def detect_elliptic_envelope_anomalies(self, data: pd.DataFrame, contamination: float = 0.1) -> List[AnomalyResult]:
         """Elliptic Envelope (Robust Covariance) anomaly detection"""
-        numeric_data = data.select_dtypes(include=[np.number]).dropna()
+        numeric_data, scaled_data = self._numeric_matrix(data)
         
         if numeric_data.empty or numeric_data.shape[1] < 2:
             return []
         
-        # Scale the data
-        scaled_data = self.scaler.fit_transform(numeric_data)
+        from sklearn.covariance import EllipticEnvelope
         
         # Fit Elliptic Envelope
         envelope = EllipticEnvelope(contamination=contamination, random_state=42)
@@ -365,12 +747,14 @@ class PatternDetector:
     # Time Series Anomaly Detection Methods
     def detect_seasonal_anomalies(self, data: pd.Series, model: str = 'additive', period: Optional[int] = None) -> List[AnomalyResult]:
         """Seasonal decomposition based anomaly detection"""
-        if not HAS_TIME_SERIES_LIBS:
+        seasonal_module = _optional_import('statsmodels.tsa.seasonal')
+        if seasonal_module is None:
             return []
+        from scipy import stats
         
         try:
             # Perform seasonal decomposition
-            decomposition = seasonal_decompose(data.dropna(), model=model, period=period)
+            decomposition = seasonal_module.seasonal_decompose(data.dropna(), model=model, period=period)
             residuals = decomposition.resid.dropna()
             
             # Detect anomalies in residuals using Z-score
@@ -397,12 +781,13 @@ class PatternDetector:
     
     def detect_stl_anomalies(self, data: pd.Series, seasonal: int = 7) -> List[AnomalyResult]:
         """STL (Seasonal and Trend decomposition using Loess) based anomaly detection"""
-        if not HAS_TIME_SERIES_LIBS:
+        seasonal_module = _optional_import('statsmodels.tsa.seasonal')
+        if seasonal_module is None:
             return []
         
         try:
             # Perform STL decomposition
-            stl = STL(data.dropna(), seasonal=seasonal)
+            stl = seasonal_module.STL(data.dropna(), seasonal=seasonal)
             decomposition = stl.fit()
             residuals = decomposition.resid
             
@@ -413,9 +798,227 @@ class PatternDetector:
             print(f"Warning: STL decomposition failed: {e}", file=sys.stderr)
             return []
     
+    def detect_grouped_seasonal_anomalies(self, data: pd.DataFrame, key_column: str,
+                                          time_column: str = 'timestamp', value_column: str = 'value',
+                                          method: str = 'seasonal_decompose', period: Optional[int] = None,
+                                          max_workers: Optional[int] = None,
+                                          **params) -> Tuple[AnomalyTable, Dict[str, Any], Dict[str, Any]]:
+        """Seasonal or STL residual anomalies for every series of a long-format frame
+        
+        Rows are grouped by ``key_column`` and ordered by ``time_column``.
+        Classical decompositions of equal-length series are computed together
+        as one matrix, STL fits run per series, and batches of series are
+        spread over a process pool. With ``series_cache`` enabled, series
+        whose content hash matches the previous run reuse that run's
+        anomalies instead of being decomposed.
+        Returns the anomalies (``identifier`` holds the key), a per-series
+        summary and run metadata.
+        """
+        if method not in ('seasonal_decompose', 'stl_anomalies'):
+            raise ValueError(f"Grouped mode does not support method: {method}")
+        if not period:
+            raise ValueError("Grouped mode requires a seasonal period")
+        missing = [c for c in (key_column, time_column, value_column) if c not in data.columns]
+        if missing:
+            raise ValueError(f"Columns not found: {missing}")
+        if method == 'stl_anomalies' and _optional_import('statsmodels.tsa.seasonal') is None:
+            raise ValueError('statsmodels not installed. Run: pip install statsmodels')
+        
+        start_time = time.monotonic()
+        state_key = params.pop('state_key', None)
+        
+        # Sort rows into one contiguous, time-ordered run per key
+        frame = data[[key_column, time_column, value_column]].copy()
+        frame[value_column] = pd.to_numeric(frame[value_column], errors='coerce')
+        frame = frame.dropna()
+        timestamps = frame[time_column]
+        if not pd.api.types.is_numeric_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps)
+        
+        codes, keys = pd.factorize(frame[key_column], sort=True)
+        order = np.lexsort((timestamps.to_numpy(), codes))
+        timestamps = timestamps.to_numpy()[order]
+        values = frame[value_column].to_numpy(dtype=float)[order]
+        index = frame.index.to_numpy()[order]
+        boundaries = np.r_[0, np.flatnonzero(np.diff(codes[order])) + 1, len(order)] if len(order) else np.zeros(1, dtype=int)
+        labels = [str(key) for key in keys]
+        
+        # Content hash per series: one vectorized row hash, then a digest per run
+        row_hashes = pd.util.hash_pandas_object(
+            pd.DataFrame({'time': timestamps, 'value': values, 'index': index}), index=False
+        ).to_numpy()
+        fingerprints = [hashlib.sha256(row_hashes[start:end].tobytes()).hexdigest()
+                        for start, end in zip(boundaries[:-1], boundaries[1:])]
+        
+        state_cache = self._series_state_cache()
+        cache_key = DiskCache.key('grouped_seasonal', state_key, key_column, time_column, value_column,
+                                  method, period, params)
+        previous = state_cache.get(cache_key, {}) if state_cache is not None else {}
+        
+        tables: Dict[int, AnomalyTable] = {}
+        for s, label in enumerate(labels):
+            entry = previous.get(label)
+            if entry is not None and entry[0] == fingerprints[s]:
+                tables[s] = entry[1]
+        unchanged = set(tables)
+        changed = [s for s in range(len(labels)) if s not in unchanged]
+        
+        results, failures, workers = self._decompose_series(method, period, params, values, index,
+                                                            boundaries, changed, max_workers)
+        for s, table in results.items():
+            table.identifier = np.full(len(table), labels[s], dtype=object)
+            tables[s] = table
+        
+        if state_cache is not None:
+            # Failed series are left out so the next run retries them
+            state_cache.put(cache_key, {labels[s]: (fingerprints[s], tables[s]) for s in tables})
+        
+        if failures:
+            print(f"Warning: Decomposition failed for {len(failures)} series "
+                  f"(e.g. {labels[min(failures)]}: {failures[min(failures)]})", file=sys.stderr)
+        
+        series = {}
+        for s, label in enumerate(labels):
+            summary = {
+                'observations': int(boundaries[s + 1] - boundaries[s]),
+                'status': 'unchanged' if s in unchanged else 'failed' if s in failures else 'decomposed',
+                'anomaly_count': len(tables[s]) if s in tables else None
+            }
+            if s in failures:
+                summary['error'] = failures[s]
+            series[label] = summary
+        
+        metadata = {
+            'mode': 'grouped',
+            'method': method,
+            'series_total': len(labels),
+            'series_decomposed': len(results),
+            'series_unchanged': len(unchanged),
+            'series_failed': len(failures),
+            'max_workers': workers,
+            'execution_time_seconds': time.monotonic() - start_time
+        }
+        
+        table = AnomalyTable.concat([tables[s] for s in sorted(tables) if len(tables[s])])
+        return table, series, metadata
+    
+    def _series_state_cache(self) -> Optional[DiskCache]:
+        """Cache of per-series hashes and anomalies from previous grouped runs (opt-in, like model_cache)"""
+        cache_config = self.config.get('series_cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        return DiskCache(
+            cache_config.get('path', '.cache/pattern-series'),
+            cache_config.get('max_bytes', 256 * 1024 * 1024)
+        )
+    
+    def _decompose_series(self, method: str, period: int, params: Dict[str, Any], values: np.ndarray,
+                          index: np.ndarray, boundaries: np.ndarray, series_ids: List[int],
+                          max_workers: Optional[int]) -> Tuple[Dict[int, AnomalyTable], Dict[int, str], int]:
+        """Decompose the given series in batches, across a process pool when worthwhile"""
+        if not series_ids:
+            return {}, {}, 0
+        
+        workers = min(max_workers or multiprocessing.cpu_count(), len(series_ids))
+        if multiprocessing.current_process().daemon:
+            # Pool workers (e.g. inside a detection suite) cannot start their own pool
+            workers = 1
+        batch_size = max(1, -(-len(series_ids) // (workers * 4)))
+        batches = [series_ids[i:i + batch_size] for i in range(0, len(series_ids), batch_size)]
+        workers = min(workers, len(batches))
+        
+        results, failures = {}, {}
+        if workers <= 1:
+            for batch in batches:
+                batch_results, batch_failures = self._decompose_series_batch(method, period, params, values,
+                                                                             index, boundaries, batch)
+                results.update(batch_results)
+                failures.update(batch_failures)
+        else:
+            context = multiprocessing.get_context(
+                'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+            )
+            with context.Pool(
+                processes=workers,
+                initializer=_init_grouped_worker,
+                initargs=(self.config, values, index, boundaries)
+            ) as pool:
+                batch_args = [(method, period, params, batch) for batch in batches]
+                for batch_results, batch_failures in pool.starmap(_run_grouped_batch, batch_args):
+                    results.update(batch_results)
+                    failures.update(batch_failures)
+        
+        return results, failures, workers
+    
+    def _decompose_series_batch(self, method: str, period: int, params: Dict[str, Any], values: np.ndarray,
+                                index: np.ndarray, boundaries: np.ndarray,
+                                series_ids: List[int]) -> Tuple[Dict[int, AnomalyTable], Dict[int, str]]:
+        """Residual anomalies for one batch of series, keyed by series id, plus per-series errors"""
+        results, failures = {}, {}
+        
+        if method == 'stl_anomalies':
+            seasonal_module = _optional_import('statsmodels.tsa.seasonal')
+            for s in series_ids:
+                start, end = boundaries[s], boundaries[s + 1]
+                try:
+                    series = pd.Series(values[start:end], index=index[start:end])
+                    residuals = seasonal_module.STL(series, period=period, seasonal=params.get('seasonal', 7)).fit().resid
+                    results[s] = self.detect_univariate_outliers(
+                        residuals.to_frame(), 'modified_zscore', threshold=params.get('threshold', 3.0)
+                    )
+                except Exception as e:
+                    failures[s] = str(e)
+            return results, failures
+        
+        # Classical decomposition: series of equal length are decomposed together as one matrix
+        model = params.get('model', 'additive')
+        threshold = params.get('threshold', 2.5)
+        lengths = boundaries[1:] - boundaries[:-1]
+        by_length: Dict[int, List[int]] = {}
+        for s in series_ids:
+            if lengths[s] < 2 * period:
+                failures[s] = f"{lengths[s]} observations; decomposition needs two complete cycles ({2 * period})"
+            else:
+                by_length.setdefault(int(lengths[s]), []).append(s)
+        
+        for length, members in by_length.items():
+            members = np.asarray(members)
+            positions = boundaries[members][:, None] + np.arange(length)
+            matrix = values[positions]
+            
+            if model.startswith('m'):
+                positive = (matrix > 0).all(axis=1)
+                for s in members[~positive]:
+                    failures[int(s)] = 'Multiplicative seasonality is not appropriate for zero and negative values'
+                members, positions, matrix = members[positive], positions[positive], matrix[positive]
+                if len(members) == 0:
+                    continue
+            
+            _, _, residuals = classical_decompose(matrix, period, model)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                z_scores = np.abs(residuals - np.nanmean(residuals, axis=1, keepdims=True)) / \
+                    np.nanstd(residuals, axis=1, keepdims=True)
+            rows, cols = np.nonzero(z_scores > threshold)
+            scores = z_scores[rows, cols] / threshold
+            
+            bucket = AnomalyTable(
+                index=index[positions[rows, cols]],
+                value=residuals[rows, cols],
+                confidence=np.minimum(scores / 2, 1.0),
+                severity=severity_codes(scores),
+                description_template='Seasonal anomaly in residuals (Z-score: {z_score:.3f})',
+                description_fields={'z_score': z_scores[rows, cols]}
+            )
+            splits = np.searchsorted(rows, np.arange(len(members) + 1))
+            for row, s in enumerate(members):
+                results[int(s)] = bucket.take(np.arange(splits[row], splits[row + 1]))
+        
+        return results, failures
+    
     def detect_change_points(self, data: pd.Series, penalty: str = 'l2', model: str = 'rbf') -> List[AnomalyResult]:
         """Change point detection in time series"""
-        if not HAS_TIME_SERIES_LIBS:
+        rpt = _optional_import('ruptures')
+        if rpt is None:
             return []
         
         try:
@@ -440,91 +1043,184 @@ class PatternDetector:
             print(f"Warning: Change point detection failed: {e}", file=sys.stderr)
             return []
     
+    def detect_change_points_online(self, data: pd.Series, state_path: Optional[str] = None,
+                                    order: Optional[pd.Series] = None,
+                                    **params) -> Tuple[List[AnomalyResult], Dict[str, Any]]:
+        """Bounded-memory change point detection that can resume from persisted state
+        
+        Bayesian online change-point detection keeps O(window) state instead
+        of refitting the whole series. With ``state_path`` the state is loaded
+        before and saved after the run, and only observations whose ``order``
+        key (e.g. timestamps; the index when omitted) is newer than the last
+        one seen are processed, so scheduled runs only look at new points.
+        """
+        detector = self._load_change_point_state(state_path, params)
+        anomalies, new_observations = self._feed_change_points(detector, data, order)
+        
+        if state_path:
+            detector.save(state_path)
+        else:
+            anomalies.extend(self._change_point_results(detector.flush()))
+        
+        return anomalies, self._change_point_state_summary(detector, new_observations)
+    
+    def detect_change_points_streaming(self, data_source: str, chunksize: int = 100000,
+                                       state_path: Optional[str] = None, time_column: Optional[str] = None,
+                                       **params) -> Tuple[List[AnomalyResult], Dict[str, Any]]:
+        """Online change point detection over a chunked source, one detector per numeric column"""
+        columns, detectors, anomalies, new_observations = None, {}, {}, {}
+        rows_processed, chunk_count = 0, 0
+        
+        for chunk in self.iter_chunks(data_source, chunksize):
+            if columns is None:
+                columns = [c for c in chunk.select_dtypes(include=[np.number]).columns if c != time_column]
+                for col in columns:
+                    detectors[col] = self._load_change_point_state(self._change_point_state_file(state_path, col), params)
+                    anomalies[col], new_observations[col] = [], 0
+            
+            order = chunk[time_column] if time_column else None
+            for col in columns:
+                found, count = self._feed_change_points(detectors[col], chunk[col], order)
+                anomalies[col].extend(found)
+                new_observations[col] += count
+            rows_processed += len(chunk)
+            chunk_count += 1
+        
+        for col, detector in detectors.items():
+            if state_path:
+                detector.save(self._change_point_state_file(state_path, col))
+            else:
+                anomalies[col].extend(self._change_point_results(detector.flush()))
+        
+        metadata = {
+            'mode': 'streaming',
+            'rows_processed': rows_processed,
+            'chunks': chunk_count,
+            'chunksize': chunksize,
+            'columns': {col: self._change_point_state_summary(detector, new_observations[col])
+                        for col, detector in detectors.items()}
+        }
+        return [a for col in detectors for a in anomalies[col]], metadata
+    
+    def _load_change_point_state(self, state_path: Optional[str], params: Dict[str, Any]) -> BayesianOnlineChangePoint:
+        if state_path and Path(state_path).exists():
+            return BayesianOnlineChangePoint.load(state_path)
+        return BayesianOnlineChangePoint(**{key: params[key] for key in CHANGE_POINT_PARAMETERS if key in params})
+    
+    def _change_point_state_file(self, state_path: Optional[str], column: str) -> Optional[str]:
+        return str(Path(state_path) / f'{column}.pkl') if state_path else None
+    
+    def _feed_change_points(self, detector: BayesianOnlineChangePoint, data: pd.Series,
+                            order: Optional[pd.Series]) -> Tuple[List[AnomalyResult], int]:
+        """Feed the observations newer than the detector's last key, in key order"""
+        keys = data.index.to_series() if order is None else order
+        if not pd.api.types.is_numeric_dtype(keys):
+            keys = pd.to_datetime(keys)
+        
+        frame = pd.DataFrame({
+            'value': pd.to_numeric(data, errors='coerce').to_numpy(),
+            'key': keys.to_numpy()
+        }, index=data.index).sort_values('key', kind='stable')
+        if detector.last_key is not None:
+            frame = frame[frame['key'] > detector.last_key]
+        
+        detections = detector.update(frame['value'].to_numpy(), frame.index, frame['key'].to_numpy())
+        return self._change_point_results(detections), len(frame)
+    
+    def _change_point_results(self, detections: List[Dict[str, Any]]) -> List[AnomalyResult]:
+        return [
+            AnomalyResult(
+                index=int(detection['label']),
+                value=float(detection['value']),
+                confidence=detection['probability'],
+                severity='medium',
+                description=f"Change point detected at position {detection['position']} "
+                            f"(posterior probability: {detection['probability']:.3f})"
+            )
+            for detection in detections
+        ]
+    
+    def _change_point_state_summary(self, detector: BayesianOnlineChangePoint, new_observations: int) -> Dict[str, Any]:
+        return {
+            'new_observations': new_observations,
+            'observations_total': detector.position + len(detector.warmup_buffer),
+            'state_size': detector.state_size(),
+            'last_key': None if detector.last_key is None else str(detector.last_key)
+        }
+    
     # Pattern Recognition Methods
-    def detect_correlation_anomalies(self, data: pd.DataFrame, threshold: float = 0.7) -> List[PatternResult]:
-        """Detect unusual correlation patterns"""
+    def detect_correlation_anomalies(self, data: pd.DataFrame, threshold: float = 0.7,
+                                     block_size: int = 256, precision: str = 'float64') -> List[PatternResult]:
+        """Detect unusual correlation patterns
+        
+        The correlation matrix is computed in strips of ``block_size`` columns
+        (in ``precision``, 'float64' or 'float32') and only pairs above the
+        threshold are kept, so wide tables never hold the full matrix.
+        """
         numeric_data = data.select_dtypes(include=[np.number]).dropna()
         
         if numeric_data.shape[1] < 2:
             return []
         
-        correlation_matrix = numeric_data.corr()
+        columns = numeric_data.columns
         patterns = []
         
         # Find high correlations
-        for i in range(len(correlation_matrix.columns)):
-            for j in range(i + 1, len(correlation_matrix.columns)):
-                corr_value = correlation_matrix.iloc[i, j]
-                if abs(corr_value) > threshold:
-                    patterns.append(PatternResult(
-                        pattern_type='high_correlation',
-                        description=f"Strong correlation between {correlation_matrix.columns[i]} and {correlation_matrix.columns[j]}",
-                        confidence=abs(corr_value),
-                        parameters={
-                            'variables': [correlation_matrix.columns[i], correlation_matrix.columns[j]],
-                            'correlation': float(corr_value),
-                            'threshold': threshold
-                        }
-                    ))
+        for left, right, correlations in iter_high_correlations(numeric_data, threshold, block_size, precision):
+            for i, j, corr_value in zip(left.tolist(), right.tolist(), correlations.tolist()):
+                patterns.append(PatternResult(
+                    pattern_type='high_correlation',
+                    description=f"Strong correlation between {columns[i]} and {columns[j]}",
+                    confidence=abs(corr_value),
+                    parameters={
+                        'variables': [columns[i], columns[j]],
+                        'correlation': corr_value,
+                        'threshold': threshold
+                    }
+                ))
         
         return patterns
     
-    def detect_cluster_anomalies(self, data: pd.DataFrame, method: str = 'kmeans', max_clusters: int = 10) -> List[AnomalyResult]:
-        """Clustering-based anomaly detection"""
-        numeric_data = data.select_dtypes(include=[np.number]).dropna()
+    def detect_cluster_anomalies(self, data: pd.DataFrame, method: str = 'kmeans', max_clusters: int = 10,
+                                 sample_size: int = 10000, minibatch_threshold: int = 100000,
+                                 search: Optional[NeighborSearch] = None, eps: float = 0.5,
+                                 min_samples: int = 5) -> List[AnomalyResult]:
+        """Clustering-based anomaly detection
+        
+        The k-means silhouette search runs on a random sample of at most
+        ``sample_size`` rows; above ``minibatch_threshold`` rows the models are
+        fitted with MiniBatchKMeans so the method scales linearly with row count.
+        DBSCAN uses the neighbor-search backend given by ``search``.
+        """
+        numeric_data, scaled_data = self._numeric_matrix(data)
         
         if numeric_data.empty or numeric_data.shape[1] < 2:
             return []
         
-        # Scale the data
-        scaled_data = self.scaler.fit_transform(numeric_data)
-        
         if method == 'kmeans':
-            # Find optimal number of clusters
-            silhouette_scores = []
-            K = range(2, min(max_clusters + 1, len(scaled_data) // 10))
-            
-            for k in K:
-                kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-                cluster_labels = kmeans.fit_predict(scaled_data)
-                score = silhouette_score(scaled_data, cluster_labels)
-                silhouette_scores.append(score)
-            
-            if not silhouette_scores:
+            kmeans = self._fit_kmeans(scaled_data, max_clusters, sample_size, minibatch_threshold)
+            if kmeans is None:
                 return []
+            cluster_labels = kmeans.predict(scaled_data)
             
-            optimal_k = K[np.argmax(silhouette_scores)]
+            # Distances to assigned cluster centers, computed once for all points
+            distances = np.linalg.norm(scaled_data - kmeans.cluster_centers_[cluster_labels], axis=1)
+            # Use 95th percentile of distances as threshold
+            threshold = np.percentile(distances, 95)
+            flagged = np.flatnonzero(distances > threshold)
             
-            # Fit final model
-            kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
-            cluster_labels = kmeans.fit_predict(scaled_data)
-            
-            # Calculate distances to cluster centers
-            centers = kmeans.cluster_centers_
-            outliers = []
-            
-            for idx, (label, point) in enumerate(zip(cluster_labels, scaled_data)):
-                distance = np.linalg.norm(point - centers[label])
-                # Use 95th percentile of distances as threshold
-                distances = [np.linalg.norm(p - centers[l]) for p, l in zip(scaled_data, cluster_labels)]
-                threshold = np.percentile(distances, 95)
-                
-                if distance > threshold:
-                    original_idx = numeric_data.index[idx]
-                    outliers.append(AnomalyResult(
-                        index=int(original_idx),
-                        coordinates=point.tolist(),
-                        confidence=min(distance / threshold / 2, 1.0),
-                        severity=self._classify_severity(distance / threshold),
-                        description=f"Cluster anomaly (distance to center: {distance:.3f}, cluster: {label})"
-                    ))
-            
-            return outliers
+            return AnomalyTable(
+                index=numeric_data.index.to_numpy()[flagged],
+                coordinates=scaled_data[flagged],
+                confidence=np.minimum(distances[flagged] / threshold / 2, 1.0),
+                severity=severity_codes(distances[flagged] / threshold),
+                description_template="Cluster anomaly (distance to center: {distance:.3f}, cluster: {label})",
+                description_fields={'distance': distances[flagged], 'label': cluster_labels[flagged]}
+            ).to_results()
         
         elif method == 'dbscan':
             # DBSCAN clustering
-            dbscan = DBSCAN(eps=0.5, min_samples=5)
-            cluster_labels = dbscan.fit_predict(scaled_data)
+            cluster_labels = (search or NeighborSearch()).dbscan(scaled_data, eps, min_samples)
             
             # Points labeled as -1 are noise/anomalies
             outliers = []
@@ -543,34 +1239,74 @@ class PatternDetector:
         
         return []
     
+    def _fit_kmeans(self, scaled_data: np.ndarray, max_clusters: int = 10, sample_size: int = 10000,
+                    minibatch_threshold: int = 100000):
+        """Fit k-means with k chosen by silhouette score on a sub-sample (None if too few rows)"""
+        from sklearn.cluster import KMeans, MiniBatchKMeans
+        from sklearn.metrics import silhouette_score
+        
+        def make_kmeans(k: int, n_rows: int):
+            if n_rows > minibatch_threshold:
+                return MiniBatchKMeans(n_clusters=k, random_state=42, n_init=3, batch_size=4096)
+            return KMeans(n_clusters=k, random_state=42, n_init=10)
+        
+        # Find optimal number of clusters on a sub-sample
+        if len(scaled_data) > sample_size:
+            rng = np.random.default_rng(42)
+            search_data = scaled_data[rng.choice(len(scaled_data), size=sample_size, replace=False)]
+        else:
+            search_data = scaled_data
+        
+        silhouette_scores = []
+        K = range(2, min(max_clusters + 1, len(search_data) // 10))
+        
+        for k in K:
+            cluster_labels = make_kmeans(k, len(search_data)).fit_predict(search_data)
+            score = silhouette_score(search_data, cluster_labels)
+            silhouette_scores.append(score)
+        
+        if not silhouette_scores:
+            return None
+        
+        optimal_k = K[np.argmax(silhouette_scores)]
+        
+        # Fit final model
+        return make_kmeans(optimal_k, len(scaled_data)).fit(scaled_data)
+    
     # Autoencoder-based detection (if TensorFlow available)
     def detect_autoencoder_anomalies(self, data: pd.DataFrame, threshold: float = 0.95) -> List[AnomalyResult]:
         """Autoencoder-based anomaly detection"""
-        if not HAS_TENSORFLOW:
+        keras = _keras()
+        if keras is None:
             return []
         
-        numeric_data = data.select_dtypes(include=[np.number]).dropna()
+        numeric_data, scaled_data = self._numeric_matrix(data)
         
         if numeric_data.empty:
             return []
         
         try:
-            # Scale the data
-            scaled_data = self.scaler.fit_transform(numeric_data)
-            
-            # Build simple autoencoder
-            input_dim = scaled_data.shape[1]
-            encoding_dim = max(2, input_dim // 2)
-            
-            autoencoder = keras.Sequential([
-                keras.layers.Dense(encoding_dim, activation='relu', input_shape=(input_dim,)),
-                keras.layers.Dense(input_dim, activation='linear')
-            ])
-            
-            autoencoder.compile(optimizer='adam', loss='mse')
+            def train_autoencoder() -> Dict[str, Any]:
+                # Build simple autoencoder
+                input_dim = scaled_data.shape[1]
+                encoding_dim = max(2, input_dim // 2)
+                
+                autoencoder = keras.Sequential([
+                    keras.layers.Dense(encoding_dim, activation='relu', input_shape=(input_dim,)),
+                    keras.layers.Dense(input_dim, activation='linear')
+                ])
+                
+                autoencoder.compile(optimizer='adam', loss='mse')
+                
+                # Train autoencoder
+                autoencoder.fit(scaled_data, scaled_data, epochs=50, batch_size=32, verbose=0)
+                
+                # Architecture and weights pickle reliably across Keras versions
+                return {'architecture': autoencoder.to_json(), 'weights': autoencoder.get_weights()}
             
-            # Train autoencoder
-            autoencoder.fit(scaled_data, scaled_data, epochs=50, batch_size=32, verbose=0)
+            state = self._cached_model('autoencoder', numeric_data, {'epochs': 50, 'batch_size': 32}, train_autoencoder)
+            autoencoder = keras.models.model_from_json(state['architecture'])
+            autoencoder.set_weights(state['weights'])
             
             # Get reconstruction errors
             reconstructions = autoencoder.predict(scaled_data, verbose=0)
@@ -597,7 +1333,256 @@ class PatternDetector:
             print(f"Warning: Autoencoder detection failed: {e}", file=sys.stderr)
             return []
     
+    # Incremental scoring: fit a reference model once, score new partitions
+    def fit(self, method: str, data: pd.DataFrame, parameters: Optional[Dict[str, Any]] = None) -> FittedDetector:
+        """Fit a reference model that can later score unseen rows"""
+        if method not in SCORABLE_METHODS:
+            raise ValueError(f"Method does not support fit/score: {method}")
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.ensemble import IsolationForest
+        from sklearn.neighbors import LocalOutlierFactor
+        from sklearn.svm import OneClassSVM
+        from sklearn.covariance import EllipticEnvelope
+        
+        params = {k: v for k, v in (parameters or {}).items() if k not in OUTPUT_PARAMETERS}
+        numeric_data = data.select_dtypes(include=[np.number]).dropna()
+        if numeric_data.empty:
+            raise ValueError("No complete numeric rows available to fit the reference model")
+        
+        scaler = StandardScaler().fit(numeric_data.to_numpy())
+        scaled_data = scaler.transform(numeric_data.to_numpy())
+        threshold = None
+        
+        if method == 'isolation_forest':
+            model = IsolationForest(contamination=params.get('contamination', 0.1), random_state=42).fit(scaled_data)
+        elif method == 'local_outlier_factor':
+            model = LocalOutlierFactor(
+                n_neighbors=params.get('n_neighbors', 20),
+                contamination=params.get('contamination', 0.1),
+                novelty=True
+            ).fit(scaled_data)
+        elif method == 'one_class_svm':
+            model = OneClassSVM(nu=params.get('nu', 0.1), kernel='rbf', gamma='scale').fit(scaled_data)
+        elif method == 'elliptic_envelope':
+            if scaled_data.shape[1] < 2:
+                raise ValueError("Elliptic Envelope requires at least two numeric columns")
+            model = EllipticEnvelope(contamination=params.get('contamination', 0.1), random_state=42).fit(scaled_data)
+        elif method == 'cluster_anomalies':
+            model = self._fit_kmeans(
+                scaled_data,
+                params.get('max_clusters', 10),
+                params.get('sample_size', 10000),
+                params.get('minibatch_threshold', 100000)
+            )
+            if model is None:
+                raise ValueError("Not enough rows to select a k-means model")
+            # Use 95th percentile of reference distances as threshold
+            threshold = float(np.percentile(model.transform(scaled_data).min(axis=1), 95))
+        else:
+            keras = _keras()
+            if keras is None:
+                raise ValueError("Autoencoder scoring requires TensorFlow")
+            input_dim = scaled_data.shape[1]
+            autoencoder = keras.Sequential([
+                keras.layers.Dense(max(2, input_dim // 2), activation='relu', input_shape=(input_dim,)),
+                keras.layers.Dense(input_dim, activation='linear')
+            ])
+            autoencoder.compile(optimizer='adam', loss='mse')
+            autoencoder.fit(scaled_data, scaled_data, epochs=50, batch_size=32, verbose=0)
+            errors = np.mean(np.square(scaled_data - autoencoder.predict(scaled_data, verbose=0)), axis=1)
+            threshold = float(np.percentile(errors, params.get('threshold', 0.95) * 100))
+            model = {'architecture': autoencoder.to_json(), 'weights': autoencoder.get_weights()}
+        
+        return FittedDetector(
+            method=method,
+            parameters=params,
+            columns=numeric_data.columns.tolist(),
+            scaler=scaler,
+            model=model,
+            threshold=threshold,
+            reference_rows=len(numeric_data)
+        )
+    
+    def score(self, fitted: FittedDetector, data: pd.DataFrame) -> AnomalyTable:
+        """Score rows against a reference model without refitting"""
+        numeric_data = data.reindex(columns=fitted.columns).apply(pd.to_numeric, errors='coerce').dropna()
+        if numeric_data.empty:
+            return AnomalyTable.empty()
+        
+        scaled_data = fitted.scaler.transform(numeric_data.to_numpy())
+        model = fitted.model
+        
+        if fitted.method == 'isolation_forest':
+            scores = model.decision_function(scaled_data)
+            flagged = np.flatnonzero(model.predict(scaled_data) == -1)
+            severity_scores = np.abs(scores[flagged]) * 2
+            confidence = np.minimum(severity_scores, 1.0)
+            template = "Isolation Forest anomaly (score: {score:.3f})"
+        elif fitted.method == 'local_outlier_factor':
+            scores = -model.score_samples(scaled_data)
+            flagged = np.flatnonzero(model.predict(scaled_data) == -1)
+            severity_scores = (scores[flagged] - 1) / 2
+            confidence = np.minimum(severity_scores, 1.0)
+            template = "LOF anomaly (score: {score:.3f})"
+        elif fitted.method == 'one_class_svm':
+            scores = model.decision_function(scaled_data)
+            flagged = np.flatnonzero(model.predict(scaled_data) == -1)
+            severity_scores = np.abs(scores[flagged]) * 3
+            confidence = np.minimum(severity_scores, 1.0)
+            template = "One-Class SVM anomaly (score: {score:.3f})"
+        elif fitted.method == 'elliptic_envelope':
+            scores = model.mahalanobis(scaled_data)
+            flagged = np.flatnonzero(model.predict(scaled_data) == -1)
+            severity_scores = scores[flagged] / 10
+            confidence = np.minimum(severity_scores, 1.0)
+            template = "Elliptic Envelope anomaly (Mahalanobis distance: {score:.3f})"
+        elif fitted.method == 'cluster_anomalies':
+            scores = model.transform(scaled_data).min(axis=1)
+            flagged = np.flatnonzero(scores > fitted.threshold)
+            severity_scores = scores[flagged] / fitted.threshold
+            confidence = np.minimum(severity_scores / 2, 1.0)
+            template = "Cluster anomaly (distance to center: {score:.3f})"
+        else:
+            keras = _keras()
+            if keras is None:
+                raise ValueError("Autoencoder scoring requires TensorFlow")
+            autoencoder = keras.models.model_from_json(model['architecture'])
+            autoencoder.set_weights(model['weights'])
+            scores = np.mean(np.square(scaled_data - autoencoder.predict(scaled_data, verbose=0)), axis=1)
+            flagged = np.flatnonzero(scores > fitted.threshold)
+            severity_scores = scores[flagged] / fitted.threshold
+            confidence = np.minimum(severity_scores / 2, 1.0)
+            template = "Autoencoder anomaly (reconstruction error: {score:.4f})"
+        
+        return AnomalyTable(
+            index=numeric_data.index.to_numpy()[flagged],
+            coordinates=scaled_data[flagged],
+            confidence=confidence,
+            severity=severity_codes(severity_scores),
+            description_template=template,
+            description_fields={'score': scores[flagged]}
+        )
+    
+    def load_or_fit(self, method: str, reference_data: pd.DataFrame, model_path: str,
+                    parameters: Optional[Dict[str, Any]] = None, refit_hours: float = 24) -> Tuple[FittedDetector, bool]:
+        """Reuse the persisted reference model unless it is stale or was fitted differently
+        
+        A model is only reused for the same method, parameters and numeric
+        columns. Reference models fit sklearn's exact estimators, so output
+        and neighbor-search backend options are dropped before fitting and
+        never force a refit. Returns the model and whether it was (re)fitted
+        on this call.
+        """
+        params = {k: v for k, v in (parameters or {}).items()
+                  if k not in OUTPUT_PARAMETERS and k not in NEIGHBOR_PARAMETERS}
+        columns = reference_data.select_dtypes(include=[np.number]).columns.tolist()
+        if Path(model_path).exists():
+            try:
+                fitted = FittedDetector.load(model_path)
+            except Exception as e:
+                print(f"Warning: Could not load reference model {model_path}: {e}", file=sys.stderr)
+                fitted = None
+            if (fitted is not None and fitted.method == method and fitted.parameters == params
+                    and fitted.columns == columns and fitted.age_hours() < refit_hours):
+                return fitted, False
+        
+        fitted = self.fit(method, reference_data, params)
+        fitted.save(model_path)
+        return fitted, True
+    
+    def split_incremental_window(self, data: pd.DataFrame, time_column: str, lookback_hours: float,
+                                 reference_window_hours: Optional[float] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Split rows into a historical reference window and the recent partition to score
+        
+        The recent partition is the last ``lookback_hours`` before the newest
+        timestamp in the data; the reference window precedes it.
+        """
+        timestamps = pd.to_datetime(data[time_column])
+        cutoff = timestamps.max() - pd.Timedelta(hours=lookback_hours)
+        recent_mask = timestamps > cutoff
+        reference_mask = ~recent_mask
+        if reference_window_hours is not None:
+            reference_mask &= timestamps > cutoff - pd.Timedelta(hours=reference_window_hours)
+        return data[reference_mask], data[recent_mask]
+    
+    def execute_incremental_scoring(self, data: pd.DataFrame, method: str, parameters: Dict[str, Any],
+                                    incremental: Dict[str, Any], source: Optional[str] = None) -> Dict[str, Any]:
+        """Score the recent partition against a persisted reference model, refitting on cadence
+        
+        Without an explicit ``model_path`` the model file is named by the
+        method plus a hash of ``source`` and the numeric columns, so
+        different datasets never share a reference model. It is kept in
+        ``model_dir``, a subdirectory of the model cache by default, so the
+        cache's eviction never removes it.
+        """
+        try:
+            time_column = incremental.get('time_column')
+            if time_column:
+                reference_data, recent_data = self.split_incremental_window(
+                    data, time_column,
+                    incremental.get('lookback_hours', 2),
+                    incremental.get('reference_window_hours')
+                )
+            else:
+                reference_data = recent_data = data
+            
+            model_path = incremental.get('model_path')
+            if model_path is None:
+                columns = reference_data.select_dtypes(include=[np.number]).columns.tolist()
+                model_key = DiskCache.key(source, [str(column) for column in columns])[:16]
+                model_dir = incremental.get('model_dir', '.cache/pattern-models/reference')
+                model_path = str(Path(model_dir) / f'{method}_{model_key}.pkl')
+            fitted, refitted = self.load_or_fit(
+                method, reference_data, model_path, parameters, incremental.get('refit_hours', 24)
+            )
+            anomalies = self.score(fitted, recent_data)
+            
+            return self._format_result({
+                'anomalies': anomalies,
+                'metadata': {
+                    'mode': 'incremental',
+                    'model_path': model_path,
+                    'refitted': refitted,
+                    'model_fitted_at': fitted.fitted_at,
+                    'reference_rows': fitted.reference_rows,
+                    'scored_rows': len(recent_data)
+                }
+            }, parameters)
+        except Exception as e:
+            return self._error_result(e)
+    
     # Utility methods
+    def _numeric_matrix(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """Complete-case numeric rows and their standardized matrix
+        
+        Reuses the read-only matrix prepared by execute_detection_suite when
+        called on the same frame.
+        """
+        if self._shared_matrix is not None and self._shared_matrix[0] is data:
+            return self._shared_matrix[1], self._shared_matrix[2]
+        
+        numeric_data = data.select_dtypes(include=[np.number]).dropna()
+        if numeric_data.empty:
+            return numeric_data, None
+        if self.scaler is None:
+            from sklearn.preprocessing import StandardScaler
+            self.scaler = StandardScaler()
+        return numeric_data, self.scaler.fit_transform(numeric_data)
+    
+    def _cached_model(self, method: str, numeric_data: pd.DataFrame, params: Dict[str, Any], fit):
+        """Return a fitted model from the model cache, fitting and storing it on a miss"""
+        if self.model_cache is None:
+            return fit()
+        
+        key = self.model_cache.key(
+            method, params, frame_fingerprint(numeric_data, self.fingerprint_sample_rows)
+        )
+        model = self.model_cache.get(key)
+        if model is None:
+            model = fit()
+            self.model_cache.put(key, model)
+        return model
+    
     def _classify_severity(self, score: float) -> str:
         """Classify anomaly severity based on score"""
         if score > 2.0:
@@ -631,79 +1616,268 @@ class PatternDetector:
             raise ValueError(f"Unknown detection method: {method}")
         
         try:
-            result = method_map[method]()
-            return {
-                'success': True,
-                'anomalies': [a.to_dict() for a in result.get('anomalies', [])],
-                'patterns': [p.to_dict() for p in result.get('patterns', [])],
-                'statistics': result.get('statistics', {}),
-                'confidence_scores': result.get('confidence_scores', []),
-                'metadata': result.get('metadata', {})
-            }
+            return self._format_result(method_map[method](), parameters)
         except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'anomalies': [],
-                'patterns': [],
-                'statistics': {},
-                'confidence_scores': [],
-                'metadata': {}
-            }
+            return self._error_result(e)
     
-    # Method execution helpers
-    def _run_zscore_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        all_anomalies = []
+    def execute_detection_suite(self, data: pd.DataFrame, methods: List[Dict[str, Any]],
+                                max_workers: Optional[int] = None, timeout: float = 300) -> Dict[str, Any]:
+        """Execute several detection methods over one frame with shared preprocessing
+        
+        The numeric matrix and its scaling are computed once and shared
+        read-only with every method. Methods run in a process pool of up to
+        ``max_workers`` processes, one included (forked workers inherit the
+        frame without pickling it), so each method's ``timeout``, measured
+        from the start of the suite, applies for any worker count. Only a
+        daemonic process, which cannot start a pool, runs methods inline and
+        without timeouts.
+        """
+        start_time = time.monotonic()
+        numeric_data, scaled_data = self._numeric_matrix(data)
+        if scaled_data is not None:
+            scaled_data.flags.writeable = False
+        self._shared_matrix = (data, numeric_data, scaled_data)
+        
+        workers = min(max_workers or multiprocessing.cpu_count(), len(methods))
         
-        for col in numeric_columns:
-            anomalies = self.detect_zscore_outliers(data[col], params.get('threshold', 3.0))
-            all_anomalies.extend(anomalies)
+        try:
+            if multiprocessing.current_process().daemon or not methods:
+                workers = min(workers, 1)
+                method_results = []
+                for spec in methods:
+                    try:
+                        result = self.execute_detection(spec['method'], data, spec.get('parameters', {}))
+                    except Exception as e:
+                        result = self._error_result(e)
+                    method_results.append(self._suite_entry(spec, result))
+            else:
+                outcomes = self._execute_suite_pool(data, numeric_data, scaled_data, methods, workers,
+                                                    timeout, start_time)
+                method_results = [self._suite_entry(spec, outcomes[position]) for position, spec in enumerate(methods)]
+        finally:
+            self._shared_matrix = None
         
-        return {'anomalies': all_anomalies}
+        return {
+            'success': True,
+            'method_results': method_results,
+            'metadata': {
+                'total_methods': len(methods),
+                'success_count': sum(1 for r in method_results if r['status'] == 'success'),
+                'failure_count': sum(1 for r in method_results if r['status'] == 'failed'),
+                'timeout_count': sum(1 for r in method_results if r['status'] == 'timeout'),
+                'max_workers': workers,
+                'shared_preprocessing': {
+                    'rows': len(numeric_data),
+                    'numeric_columns': numeric_data.columns.tolist()
+                },
+                'execution_time_seconds': time.monotonic() - start_time,
+                'timestamp': datetime.now().isoformat()
+            }
+        }
     
-    def _run_iqr_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        all_anomalies = []
+    def _execute_suite_pool(self, data: pd.DataFrame, numeric_data: pd.DataFrame, scaled_data: Optional[np.ndarray],
+                            methods: List[Dict[str, Any]], workers: int, timeout: float,
+                            start_time: float) -> Dict[int, Dict[str, Any]]:
+        """Result of every method, keyed by position, from a process pool
+        
+        A pool worker cannot be stopped on its own, so when a method times
+        out the pool is terminated and the methods that had not finished are
+        resubmitted to a fresh one.
+        """
+        context = multiprocessing.get_context(
+            'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+        )
+        outcomes: Dict[int, Dict[str, Any]] = {}
+        remaining = list(range(len(methods)))
+        
+        while remaining:
+            pool = context.Pool(
+                processes=min(workers, len(remaining)),
+                initializer=_init_suite_worker,
+                initargs=(self.config, data, numeric_data, scaled_data)
+            )
+            try:
+                pending = {
+                    position: pool.apply_async(_run_suite_method, (methods[position]['method'],
+                                                                   methods[position].get('parameters', {})))
+                    for position in remaining
+                }
+                for position in remaining:
+                    spec = methods[position]
+                    deadline = start_time + spec.get('timeout', timeout)
+                    try:
+                        outcomes[position] = pending[position].get(max(deadline - time.monotonic(), 0))
+                    except multiprocessing.TimeoutError:
+                        result = self._error_result(TimeoutError(
+                            f"Method {spec['method']} exceeded {spec.get('timeout', timeout)}s timeout"
+                        ))
+                        result['timed_out'] = True
+                        outcomes[position] = result
+                        break
+                    except Exception as e:
+                        outcomes[position] = self._error_result(e)
+                
+                # Keep whatever finished alongside a timed-out method
+                for position in remaining:
+                    if position not in outcomes and pending[position].ready():
+                        try:
+                            outcomes[position] = pending[position].get()
+                        except Exception as e:
+                            outcomes[position] = self._error_result(e)
+            finally:
+                # Terminating also stops a method that is still running past its timeout
+                pool.terminate()
+                pool.join()
+            
+            remaining = [position for position in remaining if position not in outcomes]
         
-        for col in numeric_columns:
-            anomalies = self.detect_iqr_outliers(data[col], params.get('multiplier', 1.5))
-            all_anomalies.extend(anomalies)
+        return outcomes
+    
+    def _suite_entry(self, spec: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        if result.pop('timed_out', False):
+            status = 'timeout'
+        else:
+            status = 'success' if result.get('success') else 'failed'
+        return {'method': spec['method'], 'name': spec.get('name', spec['method']), 'status': status, **result}
+    
+    def execute_streaming_detection(self, method: str, data_source: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a univariate or change point method over a chunked source with bounded memory"""
+        if method == 'change_points':
+            try:
+                anomalies, metadata = self.detect_change_points_streaming(data_source, **{
+                    key: value for key, value in parameters.items()
+                    if key in CHANGE_POINT_PARAMETERS + ('chunksize', 'state_path', 'time_column')
+                })
+                return self._format_result({'anomalies': anomalies, 'metadata': metadata}, parameters)
+            except Exception as e:
+                return self._error_result(e)
+        
+        if method not in UNIVARIATE_METHODS:
+            raise ValueError(f"Streaming mode does not support method: {method}")
+        
+        detection_params = dict(parameters)
+        if method == 'percentile':
+            thresholds = detection_params.pop('thresholds', [1, 99])
+            detection_params.update(lower=thresholds[0], upper=thresholds[1])
         
-        return {'anomalies': all_anomalies}
+        try:
+            anomalies, metadata = self.detect_univariate_outliers_streaming(data_source, method, **{
+                key: value for key, value in detection_params.items() if key not in OUTPUT_PARAMETERS
+            })
+            return self._format_result({'anomalies': anomalies, 'metadata': metadata}, parameters)
+        except Exception as e:
+            return self._error_result(e)
     
-    def _run_modified_zscore_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        all_anomalies = []
+    def _format_result(self, result: Dict, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        anomalies = result.get('anomalies', [])
+        metadata = self._result_metadata(result.get('metadata', {}))
+        output_format = parameters.get('output_format', 'json')
+        
+        if output_format in ('arrow', 'parquet'):
+            # Large anomaly sets go to a file; the JSON result only points at it
+            metadata = {**metadata, 'anomalies_output': self._write_anomaly_file(anomalies, parameters)}
+            anomalies = []
+        elif output_format != 'json':
+            raise ValueError(f"Unsupported output format: {output_format}")
+        else:
+            anomalies = self._serialize_anomalies(anomalies, parameters)
         
-        for col in numeric_columns:
-            anomalies = self.detect_modified_zscore_outliers(data[col], params.get('threshold', 3.5))
-            all_anomalies.extend(anomalies)
+        return {
+            'success': True,
+            'anomalies': anomalies,
+            'patterns': [p.to_dict() for p in result.get('patterns', [])],
+            'statistics': result.get('statistics', {}),
+            'confidence_scores': result.get('confidence_scores', []),
+            'metadata': metadata
+        }
+    
+    def _result_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        if self.model_cache is None:
+            return metadata
+        return {**metadata, 'model_cache': self.model_cache.stats()}
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': str(error),
+            'anomalies': [],
+            'patterns': [],
+            'statistics': {},
+            'confidence_scores': [],
+            'metadata': {}
+        }
+    
+    def _serialize_anomalies(self, anomalies, parameters: Dict[str, Any]) -> Any:
+        """Serialize detector output as a list of records or as parallel arrays"""
+        include_coordinates = parameters.get('include_coordinates', True)
+        
+        if parameters.get('result_mode', 'records') == 'columnar':
+            return self._as_table(anomalies).to_columns(include_coordinates)
+        
+        records = anomalies.to_records() if isinstance(anomalies, AnomalyTable) else [a.to_dict() for a in anomalies]
+        if not include_coordinates:
+            for record in records:
+                record['coordinates'] = None
+        return records
+    
+    def _as_table(self, anomalies) -> AnomalyTable:
+        return anomalies if isinstance(anomalies, AnomalyTable) else AnomalyTable.from_results(anomalies)
+    
+    def _write_anomaly_file(self, anomalies, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Write anomalies as Arrow IPC or Parquet and describe the file for the JSON result"""
+        output_format = parameters['output_format']
+        output_path = parameters.get('output_path')
+        if not output_path:
+            raise ValueError(f"output_path is required for {output_format} output")
         
-        return {'anomalies': all_anomalies}
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError('pyarrow not installed. Run: pip install pyarrow')
+        
+        table = self._as_table(anomalies).to_arrow(parameters.get('include_coordinates', True))
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        if output_format == 'parquet':
+            pq.write_table(table, output_path)
+        else:
+            with pa.ipc.new_file(output_path, table.schema) as writer:
+                writer.write_table(table)
+        
+        return {'format': output_format, 'path': str(output_path), 'rows': table.num_rows}
+    
+    # Method execution helpers
+    def _run_zscore_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
+        anomalies = self.detect_univariate_outliers(data, 'zscore', threshold=params.get('threshold', 3.0))
+        return {'anomalies': anomalies}
+    
+    def _run_iqr_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
+        anomalies = self.detect_univariate_outliers(data, 'iqr', multiplier=params.get('multiplier', 1.5))
+        return {'anomalies': anomalies}
+    
+    def _run_modified_zscore_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
+        anomalies = self.detect_univariate_outliers(data, 'modified_zscore', threshold=params.get('threshold', 3.5))
+        return {'anomalies': anomalies}
     
     def _run_percentile_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        all_anomalies = []
-        
         thresholds = params.get('thresholds', [1, 99])
-        for col in numeric_columns:
-            anomalies = self.detect_percentile_outliers(data[col], thresholds[0], thresholds[1])
-            all_anomalies.extend(anomalies)
-        
-        return {'anomalies': all_anomalies}
+        anomalies = self.detect_univariate_outliers(data, 'percentile', lower=thresholds[0], upper=thresholds[1])
+        return {'anomalies': anomalies}
     
     def _run_isolation_forest_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
         anomalies = self.detect_isolation_forest_anomalies(data, params.get('contamination', 0.1))
         return {'anomalies': anomalies}
     
     def _run_lof_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
+        search = NeighborSearch.from_params(params)
         anomalies = self.detect_lof_anomalies(
             data, 
             params.get('n_neighbors', 20), 
-            params.get('contamination', 0.1)
+            params.get('contamination', 0.1),
+            search
         )
-        return {'anomalies': anomalies}
+        return {'anomalies': anomalies, 'metadata': {'neighbor_search': search.describe()}}
     
     def _run_svm_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
         anomalies = self.detect_one_class_svm_anomalies(data, params.get('nu', 0.1))
@@ -714,6 +1888,9 @@ class PatternDetector:
         return {'anomalies': anomalies}
     
     def _run_seasonal_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
+        if params.get('key_column'):
+            return self._run_grouped_seasonal_detection(data, 'seasonal_decompose', params)
+        
         numeric_columns = data.select_dtypes(include=[np.number]).columns
         all_anomalies = []
         
@@ -728,6 +1905,9 @@ class PatternDetector:
         return {'anomalies': all_anomalies}
     
     def _run_stl_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
+        if params.get('key_column'):
+            return self._run_grouped_seasonal_detection(data, 'stl_anomalies', params)
+        
         numeric_columns = data.select_dtypes(include=[np.number]).columns
         all_anomalies = []
         
@@ -737,7 +1917,24 @@ class PatternDetector:
         
         return {'anomalies': all_anomalies}
     
+    def _run_grouped_seasonal_detection(self, data: pd.DataFrame, method: str, params: Dict) -> Dict:
+        grouping = ('key_column', 'time_column', 'value_column', 'period', 'max_workers')
+        anomalies, series, metadata = self.detect_grouped_seasonal_anomalies(
+            data,
+            params['key_column'],
+            params.get('time_column', 'timestamp'),
+            params.get('value_column', 'value'),
+            method,
+            params.get('period'),
+            params.get('max_workers'),
+            **{key: value for key, value in params.items() if key not in grouping and key not in OUTPUT_PARAMETERS}
+        )
+        return {'anomalies': anomalies, 'statistics': {'series': series}, 'metadata': metadata}
+    
     def _run_changepoint_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
+        if params.get('online', False):
+            return self._run_online_changepoint_detection(data, params)
+        
         numeric_columns = data.select_dtypes(include=[np.number]).columns
         all_anomalies = []
         
@@ -751,49 +1948,159 @@ class PatternDetector:
         
         return {'anomalies': all_anomalies}
     
+    def _run_online_changepoint_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
+        time_column = params.get('time_column')
+        order = data[time_column] if time_column else None
+        columns = [c for c in data.select_dtypes(include=[np.number]).columns if c != time_column]
+        all_anomalies, summaries = [], {}
+        
+        for col in columns:
+            anomalies, summaries[col] = self.detect_change_points_online(
+                data[col],
+                self._change_point_state_file(params.get('state_path'), col),
+                order,
+                **{key: params[key] for key in CHANGE_POINT_PARAMETERS if key in params}
+            )
+            all_anomalies.extend(anomalies)
+        
+        return {'anomalies': all_anomalies, 'metadata': {'mode': 'online', 'columns': summaries}}
+    
     def _run_correlation_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
-        patterns = self.detect_correlation_anomalies(data, params.get('threshold', 0.7))
+        patterns = self.detect_correlation_anomalies(
+            data,
+            params.get('threshold', 0.7),
+            params.get('block_size', 256),
+            params.get('precision', 'float64')
+        )
         return {'patterns': patterns}
     
     def _run_cluster_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
+        search = NeighborSearch.from_params(params)
         anomalies = self.detect_cluster_anomalies(
             data,
             params.get('method', 'kmeans'),
-            params.get('max_clusters', 10)
+            params.get('max_clusters', 10),
+            params.get('sample_size', 10000),
+            params.get('minibatch_threshold', 100000),
+            search,
+            params.get('eps', 0.5),
+            params.get('min_samples', 5)
         )
-        return {'anomalies': anomalies}
+        if params.get('method', 'kmeans') != 'dbscan':
+            return {'anomalies': anomalies}
+        return {'anomalies': anomalies, 'metadata': {'neighbor_search': search.describe()}}
     
     def _run_autoencoder_detection(self, data: pd.DataFrame, params: Dict) -> Dict:
         anomalies = self.detect_autoencoder_anomalies(data, params.get('threshold', 0.95))
         return {'anomalies': anomalies}
 
+# Process-pool workers for execute_detection_suite
+_SUITE_STATE: Dict[str, Any] = {}
+
+def _init_suite_worker(config: Dict, data: pd.DataFrame, numeric_data: pd.DataFrame,
+                       scaled_data: Optional[np.ndarray]):
+    detector = PatternDetector(config)
+    detector._shared_matrix = (data, numeric_data, scaled_data)
+    _SUITE_STATE['detector'] = detector
+    _SUITE_STATE['data'] = data
+
+def _run_suite_method(method: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    detector = _SUITE_STATE['detector']
+    try:
+        return detector.execute_detection(method, _SUITE_STATE['data'], parameters)
+    except Exception as e:
+        return detector._error_result(e)
+
+# Process-pool workers for detect_grouped_seasonal_anomalies
+_GROUPED_STATE: Dict[str, Any] = {}
+
+def _init_grouped_worker(config: Dict, values: np.ndarray, index: np.ndarray, boundaries: np.ndarray):
+    _GROUPED_STATE['detector'] = PatternDetector(config)
+    _GROUPED_STATE['series'] = (values, index, boundaries)
+
+def _run_grouped_batch(method: str, period: int, params: Dict[str, Any],
+                       series_ids: List[int]) -> Tuple[Dict[int, AnomalyTable], Dict[int, str]]:
+    values, index, boundaries = _GROUPED_STATE['series']
+    return _GROUPED_STATE['detector']._decompose_series_batch(method, period, params, values, index,
+                                                              boundaries, series_ids)
+
+def run_command(command: str, params: Dict[str, Any], data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Execute one CLI command and return its result
+
+    ``data`` lets a long-lived caller pass an already loaded frame instead of
+    reading ``params['data_source']`` again; streaming runs always read the source.
+    """
+    # Initialize detector
+    detector = PatternDetector(params.get('config', {}))
+    streaming = command == 'detect' and params.get('streaming', False)
+    
+    if data is None and not streaming:
+        data = detector.load_data(params['data_source'], **load_options(params.get('load')))
+    
+    if command == 'detect_suite':
+        # Run several methods over one load and one preprocessing pass
+        return detector.execute_detection_suite(
+            data,
+            params['methods'],
+            params.get('max_workers'),
+            params.get('timeout', 300)
+        )
+    elif command == 'score':
+        # Score recent rows against a persisted reference model
+        return detector.execute_incremental_scoring(
+            data,
+            params['method'],
+            params.get('parameters', {}),
+            params.get('incremental', {}),
+            params.get('data_source')
+        )
+    elif streaming:
+        # Chunked two-pass detection without loading the whole source
+        return detector.execute_streaming_detection(
+            params['method'],
+            params['data_source'],
+            params.get('parameters', {})
+        )
+    elif command == 'detect':
+        # Execute detection method
+        return detector.execute_detection(
+            params['method'],
+            data,
+            params.get('parameters', {})
+        )
+    else:
+        raise ValueError(f"Unknown command: {command}")
+
 def main():
     """Main execution function"""
     parser = argparse.ArgumentParser(description='Pattern Detection Framework')
-    parser.add_argument('command', choices=['detect'], help='Command to execute')
-    parser.add_argument('parameters', help='JSON string with detection parameters')
+    parser.add_argument('command', nargs='?', choices=['detect', 'detect_suite', 'score'],
+                        help='Command to execute (optional with --profile-imports)')
+    parser.add_argument('parameters', nargs='?', help='JSON string with detection parameters')
+    parser.add_argument('--indent', type=int, default=None,
+                        help='Indent JSON output (compact by default for machine consumers)')
+    parser.add_argument('--profile-imports', action='store_true',
+                        help='Report cold import time per dependency (alone, or alongside a run)')
     
     args = parser.parse_args()
     
+    if args.command is None or args.parameters is None:
+        if not args.profile_imports:
+            parser.error('command and parameters are required unless --profile-imports is given')
+        print(json.dumps({'success': True, 'import_profile': profile_imports()}, indent=args.indent))
+        return
+    
     try:
         # Parse parameters
         params = json.loads(args.parameters)
         
-        # Initialize detector
-        detector = PatternDetector(params.get('config', {}))
-        
-        # Load data
-        data = detector.load_data(params['data_source'])
+        result = run_command(args.command, params)
         
-        # Execute detection method
-        result = detector.execute_detection(
-            params['method'],
-            data,
-            params.get('parameters', {})
-        )
+        if args.profile_imports:
+            result.setdefault('metadata', {})['import_profile'] = profile_imports()
         
         # Output result
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, indent=args.indent))
         
     except Exception as e:
         error_result = {
@@ -805,7 +2112,7 @@ def main():
             'confidence_scores': [],
             'metadata': {'timestamp': datetime.now().isoformat()}
         }
-        print(json.dumps(error_result, indent=2))
+        print(json.dumps(error_result, indent=args.indent))
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Power Analysis
+Analytic statistical power for correlation, t-test, ANOVA and regression hypotheses
+Plus vectorized normality and variance-homogeneity checks for sampled data
+"""
+
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Tuple
+
+from scipy import stats
+
+# Cohen's small/medium/large conventions in each test's effect-size metric:
+# r for correlation, d for the t-test, f for ANOVA and f² for regression
+EFFECT_SIZES = {
+    'correlation': {'small': 0.1, 'medium': 0.3, 'large': 0.5},
+    't_test': {'small': 0.2, 'medium': 0.5, 'large': 0.8},
+    'anova': {'small': 0.1, 'medium': 0.25, 'large': 0.4},
+    'regression': {'small': 0.02, 'medium': 0.15, 'large': 0.35}
+}
+
+# Rule-of-thumb limits for approximate normality; unlike a test they do not reject every large sample
+MAX_ABS_SKEW = 2.0
+MAX_ABS_EXCESS_KURTOSIS = 7.0
+
+
+def n_bucket(n: int) -> int:
+    """``n`` rounded down to two significant digits (exact below 100)
+
+    Power grows with n, so the bucket's power is a slightly conservative
+    value for every n it covers.
+    """
+    n = int(n)
+    if n < 100:
+        return n
+    step = 10 ** (len(str(n)) - 2)
+    return n - n % step
+
+
+@lru_cache(maxsize=4096)
+def _power(test: str, n: int, effect_size: float, alpha: float, k: int) -> float:
+    if test == 'correlation':
+        if n <= 3:
+            return alpha
+        # Fisher z approximation
+        z = np.arctanh(min(abs(effect_size), 0.999999)) * np.sqrt(n - 3)
+        critical = stats.norm.ppf(1 - alpha / 2)
+        return float(stats.norm.cdf(z - critical) + stats.norm.cdf(-z - critical))
+
+    if test == 't_test':
+        # Two independent groups of (nearly) equal size
+        n1, n2 = n // 2, n - n // 2
+        if n1 < 2 or n2 < 2:
+            return alpha
+        df = n - 2
+        noncentrality = abs(effect_size) * np.sqrt(n1 * n2 / n)
+        critical = stats.t.ppf(1 - alpha / 2, df)
+        return float(stats.nct.sf(critical, df, noncentrality) + stats.nct.cdf(-critical, df, noncentrality))
+
+    if test in ('anova', 'regression'):
+        # ANOVA over k groups with Cohen's f; regression on k predictors with f²
+        df1 = k - 1 if test == 'anova' else k
+        df2 = n - k if test == 'anova' else n - k - 1
+        if df1 < 1 or df2 < 1:
+            return alpha
+        noncentrality = (effect_size ** 2 if test == 'anova' else effect_size) * n
+        critical = stats.f.ppf(1 - alpha, df1, df2)
+        return float(stats.ncf.sf(critical, df1, df2, noncentrality))
+
+    raise ValueError(f"Unknown power test: {test}. Available: {list(EFFECT_SIZES)}")
+
+
+def analytic_power(test: str, n: int, effect_size: float, alpha: float = 0.05, k: int = 2) -> float:
+    """Power of a two-sided ``test`` with ``n`` observations at ``effect_size``
+
+    ``k`` is the number of groups for ANOVA and of predictors for
+    regression. Results are memoized per (test, n bucket, effect size,
+    alpha, k), so scoring many hypotheses costs a few distribution calls.
+    """
+    return _power(test, n_bucket(n), round(float(effect_size), 4), float(alpha), int(k))
+
+
+def normality_flags(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Skewness, excess kurtosis and an approximate-normality flag for every column, ignoring NaN"""
+    centered = values - np.nanmean(values, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = np.nanmean(centered ** 2, axis=0)
+        skew = np.nanmean(centered ** 3, axis=0) / variance ** 1.5
+        kurtosis = np.nanmean(centered ** 4, axis=0) / variance ** 2 - 3
+    normal = (np.abs(skew) <= MAX_ABS_SKEW) & (np.abs(kurtosis) <= MAX_ABS_EXCESS_KURTOSIS)
+    return skew, kurtosis, normal
+
+
+def brown_forsythe(values: np.ndarray, codes: np.ndarray) -> float:
+    """p-value of the Brown-Forsythe test (Levene's test about group medians) for equal variances
+
+    ``codes`` are integer group labels; negative codes and NaN values are ignored.
+    """
+    keep = ~np.isnan(values) & (codes >= 0)
+    values, codes = values[keep], codes[keep]
+    _, codes = np.unique(codes, return_inverse=True)
+    groups = codes.max() + 1 if len(codes) else 0
+    if groups < 2 or len(values) <= groups:
+        return 1.0
+
+    deviations = np.abs(values - pd.Series(values).groupby(codes).transform('median').to_numpy())
+    counts = np.bincount(codes, minlength=groups)
+    means = np.bincount(codes, deviations, minlength=groups) / counts
+    between = np.sum(counts * (means - deviations.mean()) ** 2)
+    within = np.sum((deviations - means[codes]) ** 2)
+    if within == 0:
+        return 1.0 if between == 0 else 0.0
+    statistic = (between / (groups - 1)) / (within / (len(values) - groups))
+    return float(stats.f.sf(statistic, groups - 1, len(values) - groups))
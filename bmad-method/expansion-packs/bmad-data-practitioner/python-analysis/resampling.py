@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Resampling Engine
+Permutation tests and bootstrap confidence intervals for two-sample statistics
+Draws resamples as blocks of index matrices, optionally spread over worker processes
+"""
+
+import multiprocessing
+import numpy as np
+from typing import Any, Callable, Dict, Optional
+
+
+def _mean_difference(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return a.mean(axis=-1) - b.mean(axis=-1)
+
+
+def _median_difference(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.median(a, axis=-1) - np.median(b, axis=-1)
+
+
+def _cohens_d(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    n1, n2 = a.shape[-1], b.shape[-1]
+    pooled_std = np.sqrt(((n1 - 1) * a.var(axis=-1, ddof=1) + (n2 - 1) * b.var(axis=-1, ddof=1)) / (n1 + n2 - 2))
+    return (a.mean(axis=-1) - b.mean(axis=-1)) / pooled_std
+
+
+def _hedges_g(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return _cohens_d(a, b) * (1 - 3 / (4 * (a.shape[-1] + b.shape[-1] - 2) - 1))
+
+
+# Two-sample statistics computed along the last axis, so one call scores a whole block of resamples
+STATISTICS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    'mean_difference': _mean_difference,
+    'median_difference': _median_difference,
+    'cohens_d': _cohens_d,
+    'hedges_g': _hedges_g
+}
+
+
+def _permutation_block(a: np.ndarray, b: np.ndarray, statistic: str, size: int,
+                       seed: np.random.SeedSequence) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    pooled = np.concatenate([a, b])
+    # The statistics ignore order within a group, so a random split is enough: the len(a)
+    # smallest of independent uniform keys pick the first group (much cheaper than shuffling)
+    order = np.argpartition(rng.random((size, len(pooled))), len(a) - 1, axis=1)
+    resampled = pooled[order]
+    return STATISTICS[statistic](resampled[:, :len(a)], resampled[:, len(a):])
+
+
+def _bootstrap_block(a: np.ndarray, b: np.ndarray, statistic: str, size: int,
+                     seed: np.random.SeedSequence) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    # Each group is resampled with replacement on its own
+    first = a[rng.integers(0, len(a), size=(size, len(a)))]
+    second = b[rng.integers(0, len(b), size=(size, len(b)))]
+    return STATISTICS[statistic](first, second)
+
+
+_BLOCKS = {'permutation': _permutation_block, 'bootstrap': _bootstrap_block}
+# Bytes held per drawn element: keys, indices and gathered values for a split; indices and values for a bootstrap
+_BYTES_PER_ELEMENT = {'permutation': 24, 'bootstrap': 16}
+
+# Process-pool workers for resample
+_RESAMPLE_STATE: Dict[str, Any] = {}
+
+def _init_resample_worker(a: np.ndarray, b: np.ndarray):
+    _RESAMPLE_STATE['groups'] = (a, b)
+
+def _run_resample_block(kind: str, statistic: str, size: int, seed: np.random.SeedSequence) -> np.ndarray:
+    a, b = _RESAMPLE_STATE['groups']
+    return _BLOCKS[kind](a, b, statistic, size, seed)
+
+
+def resample(a: np.ndarray, b: np.ndarray, kind: str, statistic: str = 'mean_difference',
+             n_resamples: int = 9999, max_block_bytes: int = 64 * 1024 * 1024,
+             max_workers: Optional[int] = 1, random_state: Optional[int] = 42) -> np.ndarray:
+    """Statistic of ``n_resamples`` permutation or bootstrap resamples of two groups
+
+    Resamples are generated in blocks sized so one block's index and value
+    matrices stay under ``max_block_bytes``. Every block draws from its own
+    child of one seed sequence, so the output depends only on
+    ``random_state``, not on ``max_workers`` (None for one per CPU).
+    """
+    if kind not in _BLOCKS:
+        raise ValueError(f"Unknown resampling kind: {kind}")
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic: {statistic}. Available: {list(STATISTICS)}")
+
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    bytes_per_resample = (len(a) + len(b)) * _BYTES_PER_ELEMENT[kind]
+    block_size = int(max(1, min(n_resamples, max_block_bytes // bytes_per_resample)))
+    sizes = [block_size] * (n_resamples // block_size)
+    if n_resamples % block_size:
+        sizes.append(n_resamples % block_size)
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+
+    workers = min(max_workers or multiprocessing.cpu_count(), len(sizes))
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        blocks = [_BLOCKS[kind](a, b, statistic, size, seed) for size, seed in zip(sizes, seeds)]
+    else:
+        context = multiprocessing.get_context(
+            'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+        )
+        with context.Pool(processes=workers, initializer=_init_resample_worker, initargs=(a, b)) as pool:
+            blocks = pool.starmap(_run_resample_block, [(kind, statistic, size, seed) for size, seed in zip(sizes, seeds)])
+
+    return np.concatenate(blocks)
+
+
+def permutation_test(a: np.ndarray, b: np.ndarray, statistic: str = 'mean_difference',
+                     n_resamples: int = 9999, alternative: str = 'two-sided', **options) -> Dict[str, Any]:
+    """Monte Carlo permutation test of a two-sample statistic
+
+    The p-value counts resamples at least as extreme as the observed
+    statistic, plus the observed one itself, so it is never zero.
+    """
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    observed = float(STATISTICS[statistic](a, b))
+    null = resample(a, b, 'permutation', statistic, n_resamples, **options)
+
+    if alternative == 'two-sided':
+        extreme = np.abs(null) >= abs(observed)
+    elif alternative == 'greater':
+        extreme = null >= observed
+    elif alternative == 'less':
+        extreme = null <= observed
+    else:
+        raise ValueError(f"Unknown alternative: {alternative}")
+
+    return {
+        'statistic': observed,
+        'p_value': float((np.count_nonzero(extreme) + 1) / (n_resamples + 1)),
+        'n_resamples': n_resamples,
+        'alternative': alternative
+    }
+
+
+def bootstrap_ci(a: np.ndarray, b: np.ndarray, statistic: str = 'mean_difference', n_resamples: int = 9999,
+                 confidence_level: float = 0.95, method: str = 'percentile', **options) -> Dict[str, Any]:
+    """Bootstrap confidence interval of a two-sample statistic (percentile or basic)"""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    observed = float(STATISTICS[statistic](a, b))
+    replicates = resample(a, b, 'bootstrap', statistic, n_resamples, **options)
+    replicates = replicates[np.isfinite(replicates)]
+
+    tail = (1 - confidence_level) / 2
+    lower, upper = np.quantile(replicates, [tail, 1 - tail])
+    if method == 'basic':
+        lower, upper = 2 * observed - upper, 2 * observed - lower
+    elif method != 'percentile':
+        raise ValueError(f"Unknown bootstrap method: {method}")
+
+    return {
+        'statistic': observed,
+        'lower': float(lower),
+        'upper': float(upper),
+        'confidence_level': confidence_level,
+        'method': method,
+        'standard_error': float(np.std(replicates, ddof=1)),
+        'n_resamples': n_resamples
+    }
+
+
+def resampling_options(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Engine options from a test spec (``resampling_workers``, ``max_block_bytes``, ``random_state``)"""
+    options = {}
+    if 'resampling_workers' in params:
+        options['max_workers'] = params['resampling_workers']
+    for key in ('max_block_bytes', 'random_state'):
+        if key in params:
+            options[key] = params[key]
+    return options
@@ -13,10 +13,17 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import hashlib
+import multiprocessing
+import time
 from datetime import datetime
 
+from analysis_cache import DiskCache, column_fingerprint
+from data_loader import iter_chunks, load_frame, load_options
+from streaming_sketches import RunningMoments, QuantileSketch, StratifiedSample, column_sketches
+from resampling import permutation_test, bootstrap_ci, resampling_options
+
 # Statistical libraries
 from scipy import stats
 from scipy.stats import (
@@ -39,6 +46,15 @@ import pingouin as pg
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
+# Tests the bulk path computes in batched array form
+BULK_TESTS = ('pearson_correlation', 'spearman_correlation', 't_test_independent')
+# Values gathered per side when batching column pairs
+BULK_CHUNK_ELEMENTS = 4_000_000
+# Normality tests the streaming mode computes from accumulators, sketches and samples
+STREAMING_TESTS = ('shapiro_wilk', 'kolmogorov_smirnov', 'anderson_darling', 'jarque_bera')
+# Spec fields that do not affect a test's result
+RESULT_CACHE_IGNORED = ('rationale', 'timeout')
+
 @dataclass
 class TestResult:
     """Container for statistical test results"""
@@ -51,6 +67,8 @@ class TestResult:
     confidence_interval: Optional[Dict[str, float]] = None
     assumptions_met: Optional[Dict[str, bool]] = None
     interpretation: Optional[str] = None
+    # Range the exact statistic lies in when it was computed from a sketch
+    statistic_bounds: Optional[Dict[str, float]] = None
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -62,32 +80,36 @@ class TestResult:
             'effect_size': float(self.effect_size) if self.effect_size is not None else None,
             'confidence_interval': self.confidence_interval,
             'assumptions_met': self.assumptions_met,
-            'interpretation': self.interpretation
+            'interpretation': self.interpretation,
+            'statistic_bounds': self.statistic_bounds
         }
 
 class StatisticalTester:
     """Comprehensive statistical testing framework"""
     
-    def __init__(self, alpha: float = 0.05, correction_method: str = 'benjamini_hochberg'):
+    def __init__(self, alpha: float = 0.05, correction_method: str = 'benjamini_hochberg',
+                 result_cache: Optional[Dict[str, Any]] = None):
         self.alpha = alpha
         self.correction_method = correction_method
         self.results = []
         
-    def load_data(self, data_source: str) -> pd.DataFrame:
-        """Load data from various sources"""
-        try:
-            if data_source.endswith('.csv'):
-                return pd.read_csv(data_source)
-            elif data_source.endswith('.json'):
-                return pd.read_json(data_source)
-            elif data_source.endswith('.xlsx'):
-                return pd.read_excel(data_source)
-            else:
-                raise ValueError(f"Unsupported file format: {data_source}")
-        except Exception as e:
-            # For testing, create mock data
-            print(f"Warning: Could not load {data_source}, creating mock data: {e}", file=sys.stderr)
+        # Persistent cache of test results keyed by test, parameters and the tested columns' contents
+        cache_config = result_cache or {}
+        self.result_cache = DiskCache(
+            cache_config.get('path', '.cache/statistical-tests'),
+            cache_config.get('max_bytes', 256 * 1024 * 1024)
+        ) if cache_config.get('enabled', False) else None
+        
+    def load_data(self, data_source: str, **options) -> pd.DataFrame:
+        """Load data from various sources
+
+        ``options`` are passed to ``data_loader.load_frame`` (columns, filters,
+        source_type, table, query, ...). Load failures are raised; the source
+        ``'mock'`` selects the built-in test data.
+        """
+        if data_source == 'mock':
             return self._create_mock_data()
+        return load_frame(data_source, **options)
     
     def _create_mock_data(self) -> pd.DataFrame:
         """Create mock data for testing purposes"""
@@ -164,9 +186,9 @@ class StatisticalTester:
         )
     
     # Two-sample comparison tests
-    def test_independent_t_test(self, group1: pd.Series, group2: pd.Series) -> TestResult:
-        """Independent samples t-test"""
-        stat, p_value = ttest_ind(group1.dropna(), group2.dropna())
+    def test_independent_t_test(self, group1: pd.Series, group2: pd.Series, equal_var: bool = True) -> TestResult:
+        """Independent samples t-test (Welch's t-test when ``equal_var`` is False)"""
+        stat, p_value = ttest_ind(group1.dropna(), group2.dropna(), equal_var=equal_var)
         
         # Calculate effect size (Cohen's d)
         pooled_std = np.sqrt(((len(group1) - 1) * group1.var() + 
@@ -175,7 +197,7 @@ class StatisticalTester:
         effect_size = (group1.mean() - group2.mean()) / pooled_std
         
         return TestResult(
-            test_name='Independent Samples t-test',
+            test_name='Independent Samples t-test' if equal_var else "Welch's t-test",
             statistic=stat,
             p_value=p_value,
             variables=[group1.name, group2.name],
@@ -428,8 +450,9 @@ class StatisticalTester:
         )
     
     # Effect size calculations
-    def calculate_cohens_d(self, group1: pd.Series, group2: pd.Series) -> TestResult:
-        """Cohen's d effect size"""
+    def calculate_cohens_d(self, group1: pd.Series, group2: pd.Series, bootstrap_resamples: int = 0,
+                           confidence_level: float = 0.95, **resampling) -> TestResult:
+        """Cohen's d effect size, with a bootstrap CI when ``bootstrap_resamples`` is set"""
         clean1, clean2 = group1.dropna(), group2.dropna()
         
         pooled_std = np.sqrt(((len(clean1) - 1) * clean1.var() + 
@@ -444,11 +467,14 @@ class StatisticalTester:
             p_value=None,  # Effect sizes don't have p-values
             variables=[group1.name, group2.name],
             sample_sizes=[len(clean1), len(clean2)],
-            effect_size=d
+            effect_size=d,
+            confidence_interval=self._effect_size_interval(clean1, clean2, 'cohens_d', bootstrap_resamples,
+                                                           confidence_level, resampling)
         )
     
-    def calculate_hedges_g(self, group1: pd.Series, group2: pd.Series) -> TestResult:
-        """Hedges' g effect size (bias-corrected Cohen's d)"""
+    def calculate_hedges_g(self, group1: pd.Series, group2: pd.Series, bootstrap_resamples: int = 0,
+                           confidence_level: float = 0.95, **resampling) -> TestResult:
+        """Hedges' g effect size (bias-corrected Cohen's d), with a bootstrap CI when ``bootstrap_resamples`` is set"""
         clean1, clean2 = group1.dropna(), group2.dropna()
         n1, n2 = len(clean1), len(clean2)
         
@@ -468,23 +494,136 @@ class StatisticalTester:
             p_value=None,
             variables=[group1.name, group2.name],
             sample_sizes=[n1, n2],
-            effect_size=g
+            effect_size=g,
+            confidence_interval=self._effect_size_interval(clean1, clean2, 'hedges_g', bootstrap_resamples,
+                                                           confidence_level, resampling)
+        )
+    
+    def _effect_size_interval(self, clean1: pd.Series, clean2: pd.Series, statistic: str, n_resamples: int,
+                              confidence_level: float, resampling: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        if not n_resamples:
+            return None
+        interval = bootstrap_ci(clean1.to_numpy(), clean2.to_numpy(), statistic, n_resamples,
+                                confidence_level, **resampling)
+        return {'lower': interval['lower'], 'upper': interval['upper'], 'confidence_level': confidence_level}
+    
+    # Resampling-based inference
+    def test_permutation(self, group1: pd.Series, group2: pd.Series, statistic: str = 'mean_difference',
+                         n_resamples: int = 9999, alternative: str = 'two-sided', **resampling) -> TestResult:
+        """Permutation test of a two-sample statistic (distribution-free p-value)"""
+        clean1, clean2 = group1.dropna(), group2.dropna()
+        result = permutation_test(clean1.to_numpy(), clean2.to_numpy(), statistic, n_resamples,
+                                  alternative, **resampling)
+        
+        return TestResult(
+            test_name=f'Permutation Test ({statistic})',
+            statistic=result['statistic'],
+            p_value=result['p_value'],
+            variables=[group1.name, group2.name],
+            sample_sizes=[len(clean1), len(clean2)],
+            effect_size=result['statistic'] if statistic in ('cohens_d', 'hedges_g') else None,
+            interpretation=f"{n_resamples} resamples, {alternative} alternative"
+        )
+    
+    def test_bootstrap(self, group1: pd.Series, group2: pd.Series, statistic: str = 'mean_difference',
+                       n_resamples: int = 9999, confidence_level: float = 0.95, method: str = 'percentile',
+                       **resampling) -> TestResult:
+        """Bootstrap confidence interval of a two-sample statistic"""
+        clean1, clean2 = group1.dropna(), group2.dropna()
+        result = bootstrap_ci(clean1.to_numpy(), clean2.to_numpy(), statistic, n_resamples,
+                              confidence_level, method, **resampling)
+        
+        return TestResult(
+            test_name=f'Bootstrap Confidence Interval ({statistic})',
+            statistic=result['statistic'],
+            p_value=None,
+            variables=[group1.name, group2.name],
+            sample_sizes=[len(clean1), len(clean2)],
+            effect_size=result['statistic'] if statistic in ('cohens_d', 'hedges_g') else None,
+            confidence_interval={
+                'lower': result['lower'],
+                'upper': result['upper'],
+                'confidence_level': confidence_level,
+                'standard_error': result['standard_error']
+            },
+            interpretation=f"{n_resamples} resamples, {method} interval"
         )
     
     # Test execution framework
-    def execute_test_suite(self, data: pd.DataFrame, test_specifications: List[Dict]) -> Dict[str, Any]:
-        """Execute a suite of statistical tests"""
+    def execute_test_suite(self, data: pd.DataFrame, test_specifications: List[Dict],
+                           bulk: bool = False, max_workers: Optional[int] = 1,
+                           timeout: float = 300) -> Dict[str, Any]:
+        """Execute a suite of statistical tests
+        
+        With ``bulk`` the Pearson, Spearman and independent t-test specs are
+        grouped by test and computed together in array form; every other
+        spec, and any spec the batch cannot handle, runs one at a time.
+        
+        With ``max_workers`` above 1 (None for one per CPU) the remaining
+        specs run in a process pool (forked workers inherit the frame without
+        pickling it). Each test there is stopped once it has run for its
+        ``timeout`` (a spec's own ``timeout`` overrides the suite default).
+        Results are always reported in spec order.
+        
+        When the result cache is enabled, specs whose test, parameters and
+        column contents match an earlier run are answered from it.
+        """
         results = []
+        timeout_count = 0
+        cache_keys = self._result_cache_keys(data, test_specifications)
+        outcomes: Dict[int, Any] = self._cached_results(cache_keys)
+        cached = set(outcomes)
         
-        for test_spec in test_specifications:
+        pending = [position for position in range(len(test_specifications)) if position not in outcomes]
+        bulk_results = self._execute_bulk_tests(data, test_specifications, pending) if bulk else {}
+        outcomes.update(bulk_results)
+        
+        pending = [position for position in pending if position not in bulk_results]
+        workers = min(max_workers or multiprocessing.cpu_count(), len(pending))
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes cannot have children
+            workers = 1
+        if workers > 1:
+            outcomes.update(self._execute_parallel(data, test_specifications, pending, workers, timeout))
+        
+        for position, test_spec in enumerate(test_specifications):
             try:
-                result = self._execute_single_test(data, test_spec)
+                if position in outcomes:
+                    result = outcomes[position]
+                    if isinstance(result, Exception):
+                        raise result
+                else:
+                    result = self._execute_single_test(data, test_spec)
                 if result:
+                    if position in cache_keys and position not in cached:
+                        self.result_cache.put(cache_keys[position], asdict(result))
                     results.append(result.to_dict())
             except Exception as e:
+                if isinstance(e, TimeoutError):
+                    timeout_count += 1
                 print(f"Warning: Test {test_spec.get('test', 'unknown')} failed: {e}", file=sys.stderr)
                 continue
         
+        self._apply_suite_correction(results)
+        
+        return {
+            'success': True,
+            'test_results': results,
+            'metadata': {
+                'total_tests_executed': len(results),
+                'bulk_tests_executed': len(bulk_results),
+                'cached_tests': len(cached),
+                'timeout_count': timeout_count,
+                'max_workers': max(workers, 1),
+                'alpha_level': self.alpha,
+                'correction_method': self.correction_method,
+                'result_cache': self.result_cache.stats() if self.result_cache is not None else None,
+                'execution_timestamp': datetime.now().isoformat()
+            }
+        }
+    
+    def _apply_suite_correction(self, results: List[Dict[str, Any]]):
+        """Add corrected p-values to suite results in place"""
         # Apply multiple comparison correction
         if len(results) > 1:
             p_values = [r['p_value'] for r in results if r['p_value'] is not None]
@@ -497,18 +636,402 @@ class StatisticalTester:
                     if result['p_value'] is not None:
                         result['corrected_p_value'] = corrected_p_values[p_idx]
                         p_idx += 1
+    
+    # Large-data mode
+    def iter_chunks(self, data_source: str, chunksize: int = 100000, columns: Optional[List[str]] = None):
+        """Yield DataFrame chunks of ``columns`` from a source without loading it whole"""
+        return iter_chunks(data_source, chunksize, columns)
+    
+    def execute_streaming_test_suite(self, data_source: str, test_specifications: List[Dict],
+                                     chunksize: int = 100000, sample_size: int = 5000,
+                                     sketch_k: int = 4000, random_state: Optional[int] = 42) -> Dict[str, Any]:
+        """Execute the normality tests of a suite in one bounded-memory pass over a source
+        
+        Jarque-Bera is computed exactly from streaming moments.
+        Kolmogorov-Smirnov and Anderson-Darling compare the normal
+        distribution with a mergeable quantile sketch of ``sketch_k`` items per
+        level (rank error roughly 1.7 / sketch_k) and report the sketch's
+        statistic, with the range the exact one lies in as
+        ``statistic_bounds``. Rank errors inflate Anderson-Darling by about
+        n times their square, so the default keeps that well below the
+        statistic's own spread up to a few hundred thousand rows; raise
+        ``sketch_k`` for longer columns. Shapiro-Wilk runs on a
+        proportional stratified sample of ``sample_size`` values. Other tests
+        need the full frame and are skipped with a warning.
+        """
+        start_time = time.monotonic()
+        specs = []
+        for test_spec in test_specifications:
+            variables = test_spec.get('variables', [])
+            if test_spec.get('test') not in STREAMING_TESTS:
+                print(f"Warning: Test {test_spec.get('test', 'unknown')} is not supported in streaming mode",
+                      file=sys.stderr)
+            elif len(variables) != 1:
+                print(f"Warning: Test {test_spec['test']} failed: streaming normality tests require exactly one variable",
+                      file=sys.stderr)
+            else:
+                specs.append(test_spec)
+        
+        columns = list(dict.fromkeys(spec['variables'][0] for spec in specs))
+        sketched = {spec['variables'][0] for spec in specs if spec['test'] in ('kolmogorov_smirnov', 'anderson_darling')}
+        sampled = {spec['variables'][0] for spec in specs if spec['test'] == 'shapiro_wilk'}
+        
+        moments = RunningMoments(len(columns))
+        sketches = dict(zip(columns, column_sketches(len(columns), sketch_k, random_state)))
+        samples = {
+            col: StratifiedSample(sample_size, seed=None if random_state is None else random_state + i)
+            for i, col in enumerate(columns) if col in sampled
+        }
+        
+        rows = 0
+        if columns:
+            for chunk in self.iter_chunks(data_source, chunksize, columns):
+                values = chunk[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+                rows += len(values)
+                moments.update(values)
+                for i, col in enumerate(columns):
+                    if col in sketched:
+                        sketches[col].update(values[:, i])
+                    if col in samples:
+                        samples[col].update(values[:, i])
+        
+        results = []
+        for test_spec in specs:
+            col = test_spec['variables'][0]
+            i = columns.index(col)
+            try:
+                result = self._streaming_normality_test(test_spec['test'], col, moments, i,
+                                                        sketches[col], samples.get(col))
+                results.append(result.to_dict())
+            except Exception as e:
+                print(f"Warning: Test {test_spec['test']} failed: {e}", file=sys.stderr)
+        
+        self._apply_suite_correction(results)
         
         return {
             'success': True,
             'test_results': results,
             'metadata': {
                 'total_tests_executed': len(results),
+                'mode': 'streaming',
+                'rows_processed': rows,
+                'chunksize': chunksize,
+                'sample_size': sample_size,
+                'sketch_k': sketch_k,
                 'alpha_level': self.alpha,
                 'correction_method': self.correction_method,
+                'execution_time_seconds': time.monotonic() - start_time,
                 'execution_timestamp': datetime.now().isoformat()
             }
         }
     
+    def _streaming_normality_test(self, test_name: str, variable: str, moments: RunningMoments, i: int,
+                                  sketch: QuantileSketch, sample: Optional[StratifiedSample]) -> TestResult:
+        n = int(moments.count[i])
+        if n < 3:
+            raise ValueError(f"{variable} has fewer than 3 non-missing values")
+        mean, std = moments.mean[i], float(moments.std(ddof=1)[i])
+        
+        if test_name == 'jarque_bera':
+            skewness, kurtosis = moments.skewness()[i], moments.kurtosis()[i]
+            stat = n / 6 * (skewness ** 2 + kurtosis ** 2 / 4)
+            return TestResult(
+                test_name='Jarque-Bera Normality Test',
+                statistic=stat,
+                p_value=stats.chi2.sf(stat, 2),
+                variables=[variable],
+                sample_sizes=[n]
+            )
+        
+        if test_name == 'shapiro_wilk':
+            values = sample.sample()
+            stat, p_value = shapiro(values)
+            return TestResult(
+                test_name='Shapiro-Wilk Normality Test',
+                statistic=stat,
+                p_value=p_value,
+                variables=[variable],
+                sample_sizes=[len(values)],
+                interpretation=(f'Higher p-value indicates more normal-like distribution; '
+                                f'stratified sample of {len(values)} of {n} values')
+            )
+        
+        # Sketch items in order, with the empirical CDF just before and at each one
+        items, weights = sketch.weighted_items()
+        order = np.argsort(items, kind='mergesort')
+        items, weights = items[order], weights[order]
+        upper = np.cumsum(weights)
+        lower, upper = (upper - weights) / upper[-1], upper / upper[-1]
+        # The statistics are those of the sketch's CDF; the exact CDF differs by at most the rank error
+        rank_error = sketch.rank_error()
+        note = f'Computed from a quantile sketch; empirical CDF within {rank_error:.4f} of exact'
+        # Kept off 0 and 1 so items far in the tails add a large but finite amount
+        normal_cdf = np.clip(stats.norm.cdf(items, mean, std), 1e-15, 1 - 1e-15)
+        
+        if test_name == 'kolmogorov_smirnov':
+            stat = float(max(np.max(upper - normal_cdf), np.max(normal_cdf - lower), 0.0))
+            bounds = {'lower': max(stat - rank_error, 0.0), 'upper': min(stat + rank_error, 1.0)}
+            return TestResult(
+                test_name='Kolmogorov-Smirnov Normality Test',
+                statistic=stat,
+                p_value=stats.kstwo.sf(stat, n),
+                variables=[variable],
+                sample_sizes=[n],
+                interpretation=(f'{note}; exact p-value between {stats.kstwo.sf(bounds["upper"], n):.4g} '
+                                f'and {stats.kstwo.sf(bounds["lower"], n):.4g}'),
+                statistic_bounds=bounds
+            )
+        
+        stat = n * _anderson_darling_linear(normal_cdf, (lower + upper) / 2)
+        # Same critical-value mapping as test_anderson_darling
+        critical_value = 0.787 / (1.0 + 4.0 / n - 25.0 / n ** 2)
+        return TestResult(
+            test_name='Anderson-Darling Normality Test',
+            statistic=stat,
+            p_value=0.05 if stat > critical_value else 0.10,
+            variables=[variable],
+            sample_sizes=[n],
+            interpretation=note,
+            # The integral weights the tails without limit, so a rank error only bounds it from below
+            statistic_bounds={'lower': n * _anderson_darling_integral(normal_cdf, upper, rank_error)}
+        )
+    
+    def _result_cache_keys(self, data: pd.DataFrame, test_specifications: List[Dict]) -> Dict[int, str]:
+        """Cache key of every spec whose columns are all present, keyed by position"""
+        if self.result_cache is None or not data.columns.is_unique:
+            return {}
+        
+        # Each column is hashed once, so changing one column only invalidates the tests that use it
+        fingerprints: Dict[Any, str] = {}
+        keys = {}
+        for position, test_spec in enumerate(test_specifications):
+            variables = test_spec.get('variables', [])
+            if 'test' not in test_spec or not all(var in data.columns for var in variables):
+                continue
+            for var in variables:
+                if var not in fingerprints:
+                    fingerprints[var] = column_fingerprint(data[var])
+            parameters = {name: value for name, value in test_spec.items() if name not in RESULT_CACHE_IGNORED}
+            keys[position] = self.result_cache.key(parameters, [fingerprints[var] for var in variables])
+        return keys
+    
+    def _cached_results(self, cache_keys: Dict[int, str]) -> Dict[int, TestResult]:
+        results = {}
+        for position, key in cache_keys.items():
+            fields = self.result_cache.get(key)
+            if fields is not None:
+                results[position] = TestResult(**fields)
+        return results
+    
+    def _execute_parallel(self, data: pd.DataFrame, test_specifications: List[Dict], positions: List[int],
+                          workers: int, timeout: float) -> Dict[int, Any]:
+        """Run the specs at ``positions`` in a process pool
+        
+        Values are the TestResult (or None) of each spec, or the exception it
+        raised. A pool worker cannot be stopped on its own, so when a test
+        times out the pool is terminated and the specs that had not finished
+        are resubmitted to a fresh one.
+        """
+        context = multiprocessing.get_context(
+            'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+        )
+        # Wall-clock start of each test, written by the worker that picks it up
+        task_starts = context.RawArray('d', len(test_specifications))
+        outcomes: Dict[int, Any] = {}
+        remaining = list(positions)
+        
+        while remaining:
+            pool = context.Pool(
+                processes=min(workers, len(remaining)),
+                initializer=_init_suite_worker,
+                initargs=(self.alpha, self.correction_method, data, task_starts)
+            )
+            try:
+                pending = {}
+                for position in remaining:
+                    task_starts[position] = 0.0
+                    pending[position] = pool.apply_async(_run_suite_test, (position, test_specifications[position]))
+                
+                for position in remaining:
+                    async_result = pending[position]
+                    limit = test_specifications[position].get('timeout', timeout)
+                    while not async_result.ready():
+                        started = task_starts[position]
+                        if started and time.time() - started > limit:
+                            break
+                        async_result.wait(0.05)
+                    
+                    if not async_result.ready():
+                        outcomes[position] = TimeoutError(
+                            f"Test {test_specifications[position].get('test', 'unknown')} exceeded {limit}s timeout"
+                        )
+                        break
+                    try:
+                        outcomes[position] = async_result.get()
+                    except Exception as e:
+                        outcomes[position] = e
+                
+                # Keep whatever finished alongside a timed-out test
+                for position in remaining:
+                    if position not in outcomes and pending[position].ready():
+                        try:
+                            outcomes[position] = pending[position].get()
+                        except Exception as e:
+                            outcomes[position] = e
+            finally:
+                # Terminating also stops a test that is still running past its timeout
+                pool.terminate()
+                pool.join()
+            
+            remaining = [position for position in remaining if position not in outcomes]
+        
+        return outcomes
+    
+    def _execute_bulk_tests(self, data: pd.DataFrame, test_specifications: List[Dict],
+                            positions: List[int]) -> Dict[int, TestResult]:
+        """Batched results for the bulk-capable specs at ``positions``, keyed by position in the suite"""
+        if not data.columns.is_unique:
+            return {}
+        
+        groups: Dict[str, List[Tuple[int, Dict]]] = {}
+        for position in positions:
+            test_spec = test_specifications[position]
+            variables = test_spec.get('variables', [])
+            if test_spec.get('test') not in BULK_TESTS or len(variables) != 2:
+                continue
+            if not all(var in data.columns and pd.api.types.is_numeric_dtype(data[var]) for var in variables):
+                continue
+            groups.setdefault(test_spec['test'], []).append((position, test_spec))
+        
+        if not groups:
+            return {}
+        
+        # One float matrix of every column the batch touches
+        columns = list(dict.fromkeys(var for specs in groups.values() for _, spec in specs for var in spec['variables']))
+        column_index = {name: i for i, name in enumerate(columns)}
+        values = data[columns].to_numpy(dtype=float)
+        
+        results = {}
+        for test_name, specs in groups.items():
+            left = np.array([column_index[spec['variables'][0]] for _, spec in specs])
+            right = np.array([column_index[spec['variables'][1]] for _, spec in specs])
+            if test_name == 't_test_independent':
+                equal_var = np.array([bool(spec.get('equal_var', True)) for _, spec in specs])
+                batch = self._bulk_t_tests(values, left, right, equal_var)
+            else:
+                batch = self._bulk_correlations(values, left, right, test_name)
+            
+            for (position, spec), result in zip(specs, batch):
+                if result is not None:
+                    result.variables = list(spec['variables'])
+                    results[position] = result
+        
+        return results
+    
+    def _bulk_correlations(self, values: np.ndarray, left: np.ndarray, right: np.ndarray,
+                           test_name: str) -> List[Optional[TestResult]]:
+        """Pearson or Spearman correlations of column pairs over their pairwise-complete rows"""
+        from scipy.stats import rankdata
+        
+        spearman = test_name == 'spearman_correlation'
+        correlation = np.empty(len(left))
+        counts = np.empty(len(left), dtype=int)
+        
+        # Pairs are gathered in chunks so at most BULK_CHUNK_ELEMENTS values per side are held
+        chunk = max(1, BULK_CHUNK_ELEMENTS // max(len(values), 1))
+        for start in range(0, len(left), chunk):
+            part = slice(start, start + chunk)
+            x, y = values[:, left[part]], values[:, right[part]]
+            complete = ~(np.isnan(x) | np.isnan(y))
+            x, y = np.where(complete, x, np.nan), np.where(complete, y, np.nan)
+            if spearman:
+                x = rankdata(x, axis=0, nan_policy='omit')
+                y = rankdata(y, axis=0, nan_policy='omit')
+            
+            x_centered = np.where(complete, x - np.nanmean(x, axis=0), 0.0)
+            y_centered = np.where(complete, y - np.nanmean(y, axis=0), 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                r = (np.einsum('ij,ij->j', x_centered, y_centered)
+                     / np.sqrt(np.einsum('ij,ij->j', x_centered, x_centered)
+                               * np.einsum('ij,ij->j', y_centered, y_centered)))
+            correlation[part] = np.clip(r, -1.0, 1.0)
+            counts[part] = complete.sum(axis=0)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if spearman:
+                dof = counts - 2
+                t_stat = correlation * np.sqrt((dof / ((correlation + 1.0) * (1.0 - correlation))).clip(0))
+                p_values = 2 * stats.t.sf(np.abs(t_stat), dof)
+            else:
+                # Null distribution of r is beta on (-1, 1) with a = b = n/2 - 1, as in pearsonr
+                ab = counts / 2 - 1
+                p_values = 2 * stats.beta.sf(np.abs(correlation), ab, ab, loc=-1, scale=2)
+                z_r = 0.5 * np.log((1 + correlation) / (1 - correlation))
+                se = 1 / np.sqrt(counts - 3)
+                z_lower, z_upper = z_r - 1.96 * se, z_r + 1.96 * se
+                ci_lower = (np.exp(2 * z_lower) - 1) / (np.exp(2 * z_lower) + 1)
+                ci_upper = (np.exp(2 * z_upper) - 1) / (np.exp(2 * z_upper) + 1)
+        
+        results = []
+        for i in range(len(left)):
+            # Very small samples are left to the single-test path and its error handling
+            if counts[i] < 3:
+                results.append(None)
+                continue
+            result = TestResult(
+                test_name='Spearman Rank Correlation' if spearman else 'Pearson Product-Moment Correlation',
+                statistic=correlation[i],
+                p_value=p_values[i],
+                variables=[],
+                sample_sizes=[int(counts[i])],
+                effect_size=correlation[i]
+            )
+            if not spearman:
+                result.confidence_interval = {'lower': float(ci_lower[i]), 'upper': float(ci_upper[i])}
+            results.append(result)
+        return results
+    
+    def _bulk_t_tests(self, values: np.ndarray, left: np.ndarray, right: np.ndarray,
+                      equal_var: np.ndarray) -> List[Optional[TestResult]]:
+        """Independent-samples t-tests of column pairs from per-column moments"""
+        counts = (~np.isnan(values)).sum(axis=0)
+        means = np.nanmean(values, axis=0)
+        variances = np.nanvar(values, axis=0, ddof=1)
+        
+        n1, n2 = counts[left], counts[right]
+        mean1, mean2 = means[left], means[right]
+        var1, var2 = variances[left], variances[right]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pooled_dof = n1 + n2 - 2
+            pooled_se = np.sqrt(((n1 - 1) * var1 + (n2 - 1) * var2) / pooled_dof * (1 / n1 + 1 / n2))
+            welch_a, welch_b = var1 / n1, var2 / n2
+            welch_se = np.sqrt(welch_a + welch_b)
+            welch_dof = (welch_a + welch_b) ** 2 / (welch_a ** 2 / (n1 - 1) + welch_b ** 2 / (n2 - 1))
+            
+            dof = np.where(equal_var, pooled_dof, welch_dof)
+            t_stat = (mean1 - mean2) / np.where(equal_var, pooled_se, welch_se)
+            p_values = 2 * stats.t.sf(np.abs(t_stat), dof)
+            
+            # Cohen's d as in test_independent_t_test, which weights by the full column length
+            n_rows = len(values)
+            effect_sizes = (mean1 - mean2) / np.sqrt((n_rows - 1) * (var1 + var2) / (2 * n_rows - 2))
+        
+        results = []
+        for i in range(len(left)):
+            if n1[i] < 2 or n2[i] < 2:
+                results.append(None)
+                continue
+            results.append(TestResult(
+                test_name='Independent Samples t-test' if equal_var[i] else "Welch's t-test",
+                statistic=t_stat[i],
+                p_value=p_values[i],
+                variables=[],
+                sample_sizes=[int(n1[i]), int(n2[i])],
+                effect_size=effect_sizes[i]
+            ))
+        return results
+    
     def _execute_single_test(self, data: pd.DataFrame, test_spec: Dict) -> Optional[TestResult]:
         """Execute a single statistical test"""
         test_name = test_spec['test']
@@ -537,7 +1060,9 @@ class StatisticalTester:
             'kpss_test': self._run_kpss_test,
             'ljung_box': self._run_ljung_box,
             'cohens_d': self._run_cohens_d,
-            'hedges_g': self._run_hedges_g
+            'hedges_g': self._run_hedges_g,
+            'permutation_test': self._run_permutation_test,
+            'bootstrap_ci': self._run_bootstrap_ci
         }
         
         if test_name not in test_methods:
@@ -570,7 +1095,8 @@ class StatisticalTester:
     def _run_independent_t_test(self, data: pd.DataFrame, variables: List[str], test_spec: Dict) -> TestResult:
         if len(variables) != 2:
             raise ValueError("Independent t-test requires exactly two variables")
-        return self.test_independent_t_test(data[variables[0]], data[variables[1]])
+        return self.test_independent_t_test(data[variables[0]], data[variables[1]],
+                                            test_spec.get('equal_var', True))
     
     def _run_paired_t_test(self, data: pd.DataFrame, variables: List[str], test_spec: Dict) -> TestResult:
         if len(variables) != 2:
@@ -650,12 +1176,37 @@ class StatisticalTester:
     def _run_cohens_d(self, data: pd.DataFrame, variables: List[str], test_spec: Dict) -> TestResult:
         if len(variables) != 2:
             raise ValueError("Cohen's d requires exactly two variables")
-        return self.calculate_cohens_d(data[variables[0]], data[variables[1]])
+        return self.calculate_cohens_d(data[variables[0]], data[variables[1]],
+                                       test_spec.get('bootstrap_resamples', 0),
+                                       test_spec.get('confidence_level', 0.95),
+                                       **resampling_options(test_spec))
     
     def _run_hedges_g(self, data: pd.DataFrame, variables: List[str], test_spec: Dict) -> TestResult:
         if len(variables) != 2:
             raise ValueError("Hedges' g requires exactly two variables")
-        return self.calculate_hedges_g(data[variables[0]], data[variables[1]])
+        return self.calculate_hedges_g(data[variables[0]], data[variables[1]],
+                                       test_spec.get('bootstrap_resamples', 0),
+                                       test_spec.get('confidence_level', 0.95),
+                                       **resampling_options(test_spec))
+    
+    def _run_permutation_test(self, data: pd.DataFrame, variables: List[str], test_spec: Dict) -> TestResult:
+        if len(variables) != 2:
+            raise ValueError("Permutation test requires exactly two variables")
+        return self.test_permutation(data[variables[0]], data[variables[1]],
+                                     test_spec.get('statistic', 'mean_difference'),
+                                     test_spec.get('n_resamples', 9999),
+                                     test_spec.get('alternative', 'two-sided'),
+                                     **resampling_options(test_spec))
+    
+    def _run_bootstrap_ci(self, data: pd.DataFrame, variables: List[str], test_spec: Dict) -> TestResult:
+        if len(variables) != 2:
+            raise ValueError("Bootstrap confidence interval requires exactly two variables")
+        return self.test_bootstrap(data[variables[0]], data[variables[1]],
+                                   test_spec.get('statistic', 'mean_difference'),
+                                   test_spec.get('n_resamples', 9999),
+                                   test_spec.get('confidence_level', 0.95),
+                                   test_spec.get('bootstrap_method', 'percentile'),
+                                   **resampling_options(test_spec))
     
     def _apply_multiple_comparison_correction(self, p_values: List[float]) -> List[float]:
         """Apply multiple comparison correction"""
@@ -670,6 +1221,124 @@ class StatisticalTester:
         
         return corrected_p_values.tolist()
 
+def _anderson_darling_integral(points: np.ndarray, levels: np.ndarray, tolerance: float = 0.0) -> float:
+    """Integral of (G(u) - u)^2 / (u (1 - u)) over [0, 1] for a step function G
+    
+    G is 0 below ``points[0]`` and ``levels[j]`` from ``points[j]`` on (both
+    ascending, ``levels[-1]`` = 1). Times n this is the Anderson-Darling A^2
+    of an empirical CDF against the reference distribution that maps the
+    sample to ``points``. With ``tolerance`` only the part of each deviation
+    beyond it counts.
+    """
+    from scipy.special import xlogy
+    
+    def antiderivative(a, u):
+        # (a - u)^2 / (u (1 - u)) = a^2 / u + (1 - a)^2 / (1 - u) - 1
+        return -u + xlogy(a ** 2, u) - xlogy((1 - a) ** 2, 1 - u)
+    
+    def segment(a, start, stop):
+        return np.where(stop > start, antiderivative(a, stop) - antiderivative(a, start), 0.0)
+    
+    starts = np.concatenate([[0.0], points])
+    stops = np.concatenate([points, [1.0]])
+    values = np.concatenate([[0.0], levels])
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Where u < G - tolerance the integrand is (G - tolerance - u)^2, where u > G + tolerance it is (u - G - tolerance)^2
+        below = segment(values - tolerance, starts, np.minimum(stops, values - tolerance))
+        above = segment(values + tolerance, np.maximum(starts, values + tolerance), stops)
+    return float(np.sum(below) + np.sum(above))
+
+def _anderson_darling_linear(points: np.ndarray, levels: np.ndarray) -> float:
+    """Integral of (G(u) - u)^2 / (u (1 - u)) over [0, 1] for a piecewise linear G
+    
+    G runs through (0, 0), every ``(points[j], levels[j])`` and (1, 1).
+    Used with the sketch items' mid-ranks it approximates the empirical CDF
+    between retained items, which a step at each heavily weighted item
+    would overstate.
+    """
+    from scipy.special import xlogy
+    
+    u = np.concatenate([[0.0], points, [1.0]])
+    g = np.concatenate([[0.0], levels, [1.0]])
+    start, stop = u[:-1], u[1:]
+    keep = stop > start
+    start, stop = start[keep], stop[keep]
+    # On each segment G(u) - u = c0 + c1 u, and (c0 + c1 u)^2 / (u (1 - u)) = c0^2 / u + (c0 + c1)^2 / (1 - u) - c1^2.
+    # c0 and c0 + c1 are the deviations extrapolated to u = 0 and u = 1; the end segments pass through
+    # (0, 0) and (1, 1), so they are set to exactly 0 there to keep the log terms finite
+    first, last = g[:-1][keep] - start, g[1:][keep] - stop
+    change = (last - first) / (stop - start)
+    c0 = first - change * start
+    c0_c1 = first + change * (1 - start)
+    c0[0] = c0_c1[-1] = 0.0
+    
+    def antiderivative(v):
+        return -change ** 2 * v + xlogy(c0 ** 2, v) - xlogy(c0_c1 ** 2, 1 - v)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.sum(antiderivative(stop) - antiderivative(start)))
+
+# Process-pool workers for execute_test_suite
+_SUITE_STATE: Dict[str, Any] = {}
+
+def _init_suite_worker(alpha: float, correction_method: str, data: pd.DataFrame, task_starts):
+    _SUITE_STATE['tester'] = StatisticalTester(alpha, correction_method)
+    _SUITE_STATE['data'] = data
+    _SUITE_STATE['task_starts'] = task_starts
+
+def _run_suite_test(position: int, test_spec: Dict) -> Optional[TestResult]:
+    _SUITE_STATE['task_starts'][position] = time.time()
+    return _SUITE_STATE['tester']._execute_single_test(_SUITE_STATE['data'], test_spec)
+
+def suite_load_options(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Load options for a test suite, projected to the columns its tests use
+
+    Every test reads only its own ``variables``, so unless ``params['load']``
+    names the columns itself, only their union is read from the source.
+    """
+    options = load_options(params.get('load'))
+    specs = params.get('tests', [])
+    if 'columns' not in options and specs and all(spec.get('variables') for spec in specs):
+        options['columns'] = list(dict.fromkeys(var for spec in specs for var in spec['variables']))
+    return options
+
+def run_tests(params: Dict[str, Any], data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Execute the test suite described by ``params``
+
+    A preloaded ``data`` frame is used instead of reading ``params['data_source']``.
+    With ``streaming`` the normality tests run in one chunked pass over the source.
+    """
+    # Initialize tester
+    tester = StatisticalTester(
+        alpha=params.get('alpha_level', 0.05),
+        correction_method=params.get('correction_method', 'benjamini_hochberg'),
+        result_cache=params.get('result_cache')
+    )
+    
+    if params.get('streaming', False):
+        return tester.execute_streaming_test_suite(
+            params['data_source'],
+            params['tests'],
+            params.get('chunksize', 100000),
+            params.get('sample_size', 5000),
+            params.get('sketch_k', 4000),
+            params.get('random_state', 42)
+        )
+    
+    # Load data
+    if data is None:
+        data = tester.load_data(params['data_source'], **suite_load_options(params))
+    
+    # Execute tests
+    return tester.execute_test_suite(
+        data,
+        params['tests'],
+        params.get('bulk', False),
+        params.get('max_workers', 1),
+        params.get('timeout', 300)
+    )
+
 def main():
     """Main execution function"""
     parser = argparse.ArgumentParser(description='Statistical Testing Framework')
@@ -682,17 +1351,7 @@ def main():
         # Parse input parameters
         params = json.loads(args.input)
         
-        # Initialize tester
-        tester = StatisticalTester(
-            alpha=params.get('alpha_level', 0.05),
-            correction_method=params.get('correction_method', 'benjamini_hochberg')
-        )
-        
-        # Load data
-        data = tester.load_data(params['data_source'])
-        
-        # Execute tests
-        results = tester.execute_test_suite(data, params['tests'])
+        results = run_tests(params)
         
         # Output results as JSON
         print(json.dumps(results, indent=2))
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Streaming Sketches
+Mergeable summary structures for analysing data that is read in chunks
+Supports bounded-memory moments, quantiles and distinct counts for the streaming analysis modes
+"""
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+
+def weighted_quantile(values: np.ndarray, weights: np.ndarray, q) -> np.ndarray:
+    """Quantiles of a weighted sample (values need not be sorted)"""
+    order = np.argsort(values, kind='mergesort')
+    sorted_values = values[order]
+    cumulative = np.cumsum(weights[order])
+    if len(cumulative) == 0:
+        return np.full(np.shape(q), np.nan)
+    targets = np.asarray(q, dtype=float) * cumulative[-1]
+    positions = np.minimum(np.searchsorted(cumulative, targets, side='left'), len(sorted_values) - 1)
+    return sorted_values[positions]
+
+
+class RunningMoments:
+    """Per-column count, mean, central moments, min and max
+
+    Chunk statistics are combined with the pairwise update formulas of
+    Chan et al. and Pébay, so partial results from different chunks or
+    workers can be merged in any order.
+    """
+
+    def __init__(self, n_columns: int):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.m3 = np.zeros(n_columns)
+        self.m4 = np.zeros(n_columns)
+        self.minimum = np.full(n_columns, np.inf)
+        self.maximum = np.full(n_columns, -np.inf)
+
+    def update(self, values: np.ndarray) -> 'RunningMoments':
+        """Fold a (rows x columns) chunk, ignoring NaNs"""
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[:, None]
+
+        chunk = RunningMoments(values.shape[1])
+        valid = ~np.isnan(values)
+        chunk.count = valid.sum(axis=0).astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            chunk.mean = np.where(chunk.count > 0, np.nansum(values, axis=0) / chunk.count, 0.0)
+        deviations = np.where(valid, values - chunk.mean, 0.0)
+        chunk.m2 = np.sum(deviations ** 2, axis=0)
+        chunk.m3 = np.sum(deviations ** 3, axis=0)
+        chunk.m4 = np.sum(deviations ** 4, axis=0)
+        chunk.minimum = np.where(chunk.count > 0, np.nanmin(np.where(valid, values, np.inf), axis=0), np.inf)
+        chunk.maximum = np.where(chunk.count > 0, np.nanmax(np.where(valid, values, -np.inf), axis=0), -np.inf)
+
+        return self.merge(chunk)
+
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        """Combine another accumulator into this one in place"""
+        na, nb = self.count, other.count
+        n = na + nb
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = other.mean - self.mean
+            safe_n = np.where(n > 0, n, 1.0)
+
+            mean = self.mean + delta * nb / safe_n
+            m2 = self.m2 + other.m2 + delta ** 2 * na * nb / safe_n
+            m3 = (self.m3 + other.m3
+                  + delta ** 3 * na * nb * (na - nb) / safe_n ** 2
+                  + 3 * delta * (na * other.m2 - nb * self.m2) / safe_n)
+            m4 = (self.m4 + other.m4
+                  + delta ** 4 * na * nb * (na ** 2 - na * nb + nb ** 2) / safe_n ** 3
+                  + 6 * delta ** 2 * (na ** 2 * other.m2 + nb ** 2 * self.m2) / safe_n ** 2
+                  + 4 * delta * (na * other.m3 - nb * self.m3) / safe_n)
+
+        self.count, self.mean, self.m2, self.m3, self.m4 = n, mean, m2, m3, m4
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        return self
+
+    def variance(self, ddof: int = 0) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def std(self, ddof: int = 0) -> np.ndarray:
+        return np.sqrt(self.variance(ddof))
+
+    def skewness(self) -> np.ndarray:
+        """Biased sample skewness (matches scipy.stats.skew defaults)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    def kurtosis(self) -> np.ndarray:
+        """Biased excess kurtosis (matches scipy.stats.kurtosis defaults)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.count * self.m4 / self.m2 ** 2 - 3.0
+
+
+class QuantileSketch:
+    """KLL-style mergeable quantile sketch for a single column
+
+    Memory stays O(k log(n / k)) items; rank error is roughly 1.7 / k.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = 42):
+        self.k = k
+        self.count = 0
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        while True:
+            compacted = False
+            for level in range(len(self.compactors)):
+                items = self.compactors[level]
+                if len(items) <= self._capacity(level):
+                    continue
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+
+                items = np.sort(items)
+                leftover = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(leftover)]
+                promoted = pairs[self._rng.integers(2)::2]
+
+                self.compactors[level] = leftover
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+                compacted = True
+            if not compacted:
+                return
+
+    def update(self, values: np.ndarray) -> 'QuantileSketch':
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.compactors[0] = np.concatenate([self.compactors[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Retained items and their weights (each item at level h stands for 2**h inputs)"""
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(c), 2.0 ** level) for level, c in enumerate(self.compactors)])
+        return items, weights
+
+    def quantile(self, q) -> np.ndarray:
+        items, weights = self.weighted_items()
+        return weighted_quantile(items, weights, q)
+
+    def cdf(self, x) -> np.ndarray:
+        """Approximate empirical CDF evaluated at x"""
+        items, weights = self.weighted_items()
+        order = np.argsort(items, kind='mergesort')
+        cumulative = np.cumsum(weights[order])
+        if len(cumulative) == 0:
+            return np.full(np.shape(x), np.nan)
+        positions = np.searchsorted(items[order], x, side='right')
+        return np.where(positions > 0, cumulative[np.maximum(positions - 1, 0)], 0.0) / cumulative[-1]
+
+    def rank_error(self) -> float:
+        """Conservative bound on the normalized rank error of ``cdf`` and ``quantile``
+
+        Zero while nothing has been compacted; observed errors otherwise stay
+        below about 2.3 / k.
+        """
+        return 0.0 if len(self.compactors) == 1 else 3.0 / self.k
+
+    def median_absolute_deviation(self) -> float:
+        """MAD approximated from the retained items around the sketch median"""
+        items, weights = self.weighted_items()
+        median = weighted_quantile(items, weights, 0.5)
+        return float(weighted_quantile(np.abs(items - median), weights, 0.5))
+
+
+class StratifiedSample:
+    """Proportional stratified sample over contiguous blocks of a stream
+
+    Every update becomes a stratum holding a uniform sample of at most
+    ``size`` of its values (the lowest of independent random priorities).
+    Past ``max_strata`` the adjacent pair with the fewest values is merged,
+    which keeps the union's lowest priorities and so stays uniform. Memory
+    is O(size * max_strata) however long the stream is.
+    """
+
+    def __init__(self, size: int = 5000, max_strata: int = 16, seed: Optional[int] = 42):
+        self.size = size
+        self.max_strata = max_strata
+        self.count = 0
+        # (values seen, retained values, their priorities sorted ascending)
+        self.strata: List[Tuple[int, np.ndarray, np.ndarray]] = []
+        self._rng = np.random.default_rng(seed)
+
+    def _lowest(self, values: np.ndarray, priorities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if len(values) > self.size:
+            keep = np.argpartition(priorities, self.size - 1)[:self.size]
+            values, priorities = values[keep], priorities[keep]
+        order = np.argsort(priorities)
+        return values[order], priorities[order]
+
+    def update(self, values: np.ndarray) -> 'StratifiedSample':
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+
+        self.count += len(values)
+        self.strata.append((len(values), *self._lowest(values, self._rng.random(len(values)))))
+        while len(self.strata) > self.max_strata:
+            pair = np.array([self.strata[i][0] + self.strata[i + 1][0] for i in range(len(self.strata) - 1)])
+            i = int(np.argmin(pair))
+            (count_a, values_a, priorities_a), (count_b, values_b, priorities_b) = self.strata[i:i + 2]
+            self.strata[i:i + 2] = [(count_a + count_b, *self._lowest(np.concatenate([values_a, values_b]),
+                                                                      np.concatenate([priorities_a, priorities_b])))]
+        return self
+
+    def sample(self) -> np.ndarray:
+        """At most ``size`` values, allocated to strata in proportion to their counts"""
+        if self.count <= self.size:
+            return np.concatenate([values for _, values, _ in self.strata]) if self.strata else np.empty(0)
+
+        counts = np.array([count for count, _, _ in self.strata], dtype=float)
+        quotas = self.size * counts / self.count
+        allocation = np.floor(quotas).astype(int)
+        # Largest remainders take the values left over by rounding down
+        allocation[np.argsort(allocation - quotas)[:self.size - allocation.sum()]] += 1
+        return np.concatenate([values[:n] for (_, values, _), n in zip(self.strata, allocation)])
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Bit length of every uint64 value (0 for 0)
+
+    Each 32-bit half converts to float64 exactly, and ``frexp`` returns the
+    exponent that is the bit length of a positive integer.
+    """
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """Approximate distinct count of a stream of 64-bit hashes
+
+    ``2 ** precision`` registers keep the longest run of leading zeros seen
+    per hash bucket; the relative standard error is about
+    1.04 / sqrt(2 ** precision) (1.6% at the default of 12). Small counts
+    use linear counting over the empty registers. Sketches of the same
+    precision merge by taking register maxima.
+    """
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"HyperLogLog precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update_hashes(self, hashes: np.ndarray) -> 'HyperLogLog':
+        hashes = np.asarray(hashes, dtype=np.uint64).ravel()
+        if not len(hashes):
+            return self
+
+        width = 64 - self.precision
+        buckets = (hashes >> np.uint64(width)).astype(np.intp)
+        ranks = width + 1 - _bit_length(hashes & np.uint64((1 << width) - 1)).astype(np.intp)
+        # Count every (bucket, rank) pair at once; a register is the highest rank its bucket saw
+        counts = np.bincount(buckets * (width + 2) + ranks, minlength=len(self.registers) * (width + 2))
+        seen = counts.reshape(len(self.registers), width + 2) > 0
+        highest = width + 1 - np.argmax(seen[:, ::-1], axis=1)
+        np.maximum(self.registers, np.where(seen.any(axis=1), highest, 0).astype(np.uint8), out=self.registers)
+        return self
+
+    def update(self, values) -> 'HyperLogLog':
+        """Add the non-null ``values`` of any dtype (hashed by pandas)"""
+        import pandas as pd
+
+        values = pd.Series(values)
+        return self.update_hashes(pd.util.hash_pandas_object(values.dropna(), index=False).to_numpy())
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and empty:
+            return float(m * np.log(m / empty))
+        # 64-bit hashes make the large-range correction unnecessary
+        return float(raw)
+
+
+def column_sketches(n_columns: int, k: int = 200, seed: Optional[int] = 42) -> List[QuantileSketch]:
+    """One quantile sketch per column, seeded deterministically"""
+    return [QuantileSketch(k=k, seed=None if seed is None else seed + i) for i in range(n_columns)]
+
+
+def update_column_sketches(sketches: Sequence[QuantileSketch], values: np.ndarray):
+    """Feed each column of a (rows x columns) chunk into its sketch"""
+    for i, sketch in enumerate(sketches):
+        sketch.update(values[:, i])
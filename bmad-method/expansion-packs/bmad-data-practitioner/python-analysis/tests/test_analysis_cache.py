@@ -0,0 +1,112 @@
+"""
+Analysis cache: hits, misses, least-recently-used eviction and corrupt entries,
+fingerprints that change with the data they describe
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_cache import DiskCache, column_fingerprint, frame_fingerprint  # noqa: E402
+
+
+class DiskCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _age(self, cache, key, seconds_ago):
+        entry = cache._entry_path(key)
+        mtime = entry.stat().st_mtime - seconds_ago
+        os.utime(entry, (mtime, mtime))
+
+    def test_hit_and_miss(self):
+        cache = DiskCache(self.directory.name)
+        key = DiskCache.key('isolation_forest', {'contamination': 0.1})
+        self.assertIsNone(cache.get(key))
+        cache.put(key, {'model': [1, 2, 3]})
+        self.assertEqual(cache.get(key), {'model': [1, 2, 3]})
+        # A second instance reads the same directory
+        self.assertEqual(DiskCache(self.directory.name).get(key), {'model': [1, 2, 3]})
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.stats()['entries'], 1)
+
+    def test_keys_are_stable_and_distinct(self):
+        self.assertEqual(DiskCache.key({'a': 1, 'b': 2}), DiskCache.key({'b': 2, 'a': 1}))
+        self.assertNotEqual(DiskCache.key('lof', 'x'), DiskCache.key('lof', 'y'))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        payload = np.zeros(1000)
+        cache = DiskCache(self.directory.name, max_bytes=10 ** 9)
+        for name in ('a', 'b', 'c'):
+            cache.put(name, payload)
+        entry_size = cache._entry_path('a').stat().st_size
+        for name, seconds_ago in (('a', 300), ('b', 200), ('c', 100)):
+            self._age(cache, name, seconds_ago)
+        # Reading the oldest entry makes it the most recently used
+        cache.get('a')
+
+        cache.max_bytes = 3 * entry_size
+        cache.put('d', payload)
+        self.assertIsNone(cache.get('b'))
+        for name in ('a', 'c', 'd'):
+            self.assertIsNotNone(cache.get(name), name)
+        self.assertLessEqual(cache.stats()['bytes'], cache.max_bytes)
+
+    def test_other_files_in_the_directory_are_left_alone(self):
+        other = os.path.join(self.directory.name, 'reference.pkl')
+        with open(other, 'wb') as f:
+            f.write(b'x' * 10000)
+        os.utime(other, (0, 0))
+
+        cache = DiskCache(self.directory.name, max_bytes=1)
+        cache.put('model', np.zeros(100))
+        self.assertTrue(os.path.exists(other))
+        self.assertEqual(cache.stats()['entries'], 0)
+        self.assertEqual(DiskCache(self.directory.name, prefix='reference').stats()['entries'], 1)
+
+    def test_corrupt_entry_is_dropped(self):
+        cache = DiskCache(self.directory.name)
+        cache.put('model', [1, 2, 3])
+        cache._entry_path('model').write_bytes(b'not a pickle')
+        self.assertEqual(cache.get('model', 'fallback'), 'fallback')
+        self.assertFalse(cache._entry_path('model').exists())
+        self.assertEqual(cache.misses, 1)
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.frame = pd.DataFrame({'a': rng.normal(size=1000), 'b': rng.integers(0, 9, 1000)})
+
+    def test_frame_fingerprint_tracks_content_and_schema(self):
+        fingerprint = frame_fingerprint(self.frame)
+        self.assertEqual(frame_fingerprint(self.frame.copy()), fingerprint)
+        changed = self.frame.copy()
+        changed.loc[500, 'a'] += 1
+        self.assertNotEqual(frame_fingerprint(changed), fingerprint)
+        self.assertNotEqual(frame_fingerprint(self.frame.astype({'b': float})), fingerprint)
+        self.assertNotEqual(frame_fingerprint(self.frame.rename(columns={'b': 'c'})), fingerprint)
+
+    def test_sampled_fingerprint_always_covers_the_last_row(self):
+        changed = self.frame.copy()
+        changed.loc[999, 'a'] += 1
+        self.assertNotEqual(frame_fingerprint(changed, sample_rows=10), frame_fingerprint(self.frame, sample_rows=10))
+
+    def test_column_fingerprint_ignores_other_columns(self):
+        self.assertEqual(column_fingerprint(self.frame['a']),
+                         column_fingerprint(self.frame.assign(b=0)['a']))
+        self.assertNotEqual(column_fingerprint(self.frame['a']), column_fingerprint(self.frame['a'] * 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Analysis worker: NDJSON requests round-trip to the same results as a direct call,
+loaded datasets are reused until their file changes
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pattern_detection  # noqa: E402
+from analysis_worker import AnalysisWorker, serve_stdio  # noqa: E402
+
+
+class AnalysisWorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=500)
+        values[[10, 200]] = [8.0, -9.0]
+        self.csv = os.path.join(self.directory.name, 'data.csv')
+        pd.DataFrame({'value': values, 'other': rng.normal(size=500)}).to_csv(self.csv, index=False)
+
+    def _request(self, request_id):
+        return {'id': request_id, 'script': 'pattern_detection', 'command': 'detect',
+                'params': {'data_source': self.csv, 'method': 'zscore', 'parameters': {'threshold': 3}}}
+
+    def _serve(self, worker, requests):
+        lines = ''.join(json.dumps(request) + '\n' for request in requests)
+        with mock.patch('sys.stdin', io.StringIO(lines)), mock.patch('sys.stdout', io.StringIO()) as output:
+            serve_stdio(worker)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_ndjson_round_trip_matches_direct_call(self):
+        worker = AnalysisWorker()
+        responses = self._serve(worker, [self._request(1), {'command': 'ping'}, 'not an object',
+                                         {'command': 'shutdown'}, self._request(2)])
+
+        # Requests after shutdown are not served
+        self.assertEqual([response['id'] for response in responses], [1, None, None, None])
+        expected = json.loads(json.dumps(pattern_detection.run_command('detect', self._request(1)['params'])))
+        self.assertTrue(responses[0]['success'])
+        self.assertEqual(responses[0]['result']['anomalies'], expected['anomalies'])
+        self.assertEqual(responses[1]['result'], {'status': 'ok'})
+        self.assertFalse(responses[2]['success'])
+        self.assertEqual(responses[3]['result'], {'status': 'shutdown'})
+
+    def test_errors_are_returned_not_raised(self):
+        response = AnalysisWorker().handle({'id': 'x', 'script': 'unknown'})
+        self.assertEqual(response['id'], 'x')
+        self.assertFalse(response['success'])
+        self.assertIn('Unknown script', response['error'])
+
+    def test_dataset_is_reused_until_the_file_changes(self):
+        worker = AnalysisWorker()
+        first = worker.handle(self._request(1))
+        second = worker.handle(self._request(2))
+        self.assertEqual(worker.datasets.stats()['hits'], 1)
+        self.assertEqual(second['result']['anomalies'], first['result']['anomalies'])
+
+        frame = pd.read_csv(self.csv)
+        frame.loc[300, 'value'] = 12.0
+        frame.to_csv(self.csv, index=False)
+        stat = os.stat(self.csv)
+        os.utime(self.csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        third = worker.handle(self._request(3))
+        self.assertEqual(worker.datasets.stats()['misses'], 2)
+        self.assertIn(300, [anomaly['index'] for anomaly in third['result']['anomalies']])
+        self.assertNotIn(300, [anomaly['index'] for anomaly in first['result']['anomalies']])
+
+
+if __name__ == '__main__':
+    unittest.main()
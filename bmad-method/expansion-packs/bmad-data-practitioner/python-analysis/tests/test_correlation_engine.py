@@ -0,0 +1,51 @@
+"""
+Correlation engine: blocked correlations match DataFrame.corr()
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from correlation_engine import correlation_matrix, iter_high_correlations  # noqa: E402
+
+
+def _frame(n: int = 500) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=n)
+    frame = pd.DataFrame({'x': x, 'y': 2 * x + rng.normal(size=n) * 0.3, 'z': rng.normal(size=n),
+                          'w': rng.integers(0, 10, n)})
+    frame.loc[rng.random(n) < 0.2, 'y'] = np.nan
+    return frame
+
+
+class CorrelationEngineTest(unittest.TestCase):
+
+    def test_matrix_matches_pandas(self):
+        frame = _frame()
+        for block_size in (1, 2, 256):
+            np.testing.assert_allclose(correlation_matrix(frame, block_size), frame.corr().to_numpy(), atol=1e-12)
+
+    def test_nullable_dtypes_with_missing_values(self):
+        frame = _frame()
+        nullable = frame.astype({'w': 'Int64', 'y': 'Float64'})
+        nullable.loc[::7, 'w'] = pd.NA
+        expected = nullable.astype({'w': float, 'y': float}).corr().to_numpy()
+        np.testing.assert_allclose(correlation_matrix(nullable), expected, atol=1e-12)
+
+        pairs = [(int(i), int(j)) for left, right, _ in iter_high_correlations(nullable, 0.7)
+                 for i, j in zip(left, right)]
+        self.assertEqual(pairs, [(0, 1)])
+
+    def test_float32_stays_close(self):
+        frame = _frame()
+        np.testing.assert_allclose(correlation_matrix(frame, 2, np.float32), frame.corr().to_numpy(), atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Shared loader: sampled and unsampled loads agree, stratified samples cover every stratum and do not
+depend on row order, memory optimization never changes arithmetic results, every streamable format
+chunks with projection
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import iter_chunks, load_frame, optimize_memory  # noqa: E402
+
+
+class SampledLoadTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        n = 100_000
+        # Few distinct values per column, so most rows have exact duplicates
+        frame = pd.DataFrame({
+            'g': rng.choice(['a', 'b', 'c'], n, p=[0.45, 0.45, 0.1]),
+            'k': rng.integers(0, 100, n),
+            'm': np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 5, n)),
+            'flag': np.where(rng.random(n) < 0.1, None, rng.random(n) < 0.5)
+        })
+        cls.csv = os.path.join(cls.directory.name, 'sample.csv')
+        frame.to_csv(cls.csv, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_sampled_dtypes_match_unsampled(self):
+        full = load_frame(self.csv)
+        for sample in ({'method': 'reservoir', 'size': 1000},
+                       {'method': 'stratified', 'strata': 'g', 'size': 1000}):
+            sampled = load_frame(self.csv, sample=sample)
+            self.assertEqual(sampled.dtypes.to_dict(), full.dtypes.to_dict(), sample['method'])
+            # Nullable integers come back as float64 with NaN
+            self.assertEqual(sampled['m'].dtype, np.float64)
+            sampled[['k', 'm']].to_numpy(dtype=float)
+
+    def test_stratified_sample_covers_duplicate_rows(self):
+        sample = {'method': 'stratified', 'strata': 'g', 'size': 1000}
+        frame = load_frame(self.csv, columns=['k'], sample=sample)
+        strata = {tuple(s['values'].values()): s for s in frame.attrs['sampling']['strata']}
+
+        self.assertEqual(len(frame), 1000)
+        self.assertEqual(list(frame.columns), ['k'])
+        self.assertEqual(sorted(strata), [('a',), ('b',), ('c',)])
+        for stratum in strata.values():
+            expected = 1000 * stratum['population_rows'] / 100_000
+            self.assertLessEqual(abs(stratum['sample_rows'] - expected), 1)
+        # Duplicate rows are drawn independently, not kept or dropped as a block
+        self.assertGreater(frame['k'].nunique(), 90)
+        self.assertLess(frame['k'].value_counts().max(), 30)
+
+    def test_stratified_sample_is_reproducible(self):
+        sample = {'method': 'stratified', 'strata': ['g'], 'size': 500, 'seed': 7}
+        first = load_frame(self.csv, sample=sample)
+        second = load_frame(self.csv, sample=sample)
+        pd.testing.assert_frame_equal(first.reset_index(drop=True), second.reset_index(drop=True))
+
+    def test_stratified_sample_does_not_depend_on_row_order(self):
+        sample = {'method': 'stratified', 'strata': ['g'], 'size': 500, 'seed': 7}
+        shuffled = os.path.join(self.directory.name, 'shuffled.csv')
+        pd.read_csv(self.csv).sample(frac=1, random_state=3).to_csv(shuffled, index=False)
+
+        def rows(frame):
+            return frame.sort_values(list(frame.columns)).reset_index(drop=True)
+
+        pd.testing.assert_frame_equal(rows(load_frame(shuffled, sample=sample)),
+                                      rows(load_frame(self.csv, sample=sample)))
+
+    def test_stratified_sample_of_a_table_is_reproducible(self):
+        import duckdb
+
+        database = os.path.join(self.directory.name, 'sample.duckdb')
+        conn = duckdb.connect(database)
+        conn.execute(f"CREATE TABLE rows AS SELECT * FROM read_csv_auto('{self.csv}')")
+        conn.close()
+        sample = {'method': 'stratified', 'strata': ['g'], 'size': 500, 'seed': 7}
+        first = load_frame(database, table='rows', sample=sample)
+        pd.testing.assert_frame_equal(first, load_frame(database, table='rows', sample=sample))
+        self.assertEqual(len(first), 500)
+        # Query sources have no row ids and are numbered in value order instead
+        queried = load_frame(database, query='SELECT * FROM rows', sample=sample)
+        self.assertEqual(len(queried), 500)
+
+
+class OptimizeMemoryTest(unittest.TestCase):
+
+    def test_differences_of_downcast_integers_do_not_wrap(self):
+        frame = pd.DataFrame({'a': [100, -100, 50, -50, 120, 30], 'b': [-100, 100, -60, 60, -120, -20]})
+        optimized = optimize_memory(frame, log=False)
+        self.assertGreaterEqual(optimized['a'].dtype.itemsize, 4)
+        np.testing.assert_array_equal((optimized['a'] - optimized['b']).to_numpy(),
+                                      (frame['a'] - frame['b']).to_numpy())
+
+    def test_integers_near_the_int32_limit_stay_int64(self):
+        frame = pd.DataFrame({'a': [2 ** 31 - 1, 0], 'b': [-(2 ** 31), 0]})
+        optimized = optimize_memory(frame, log=False)
+        self.assertEqual(optimized['a'].dtype, np.int64)
+        self.assertEqual((optimized['a'] - optimized['b']).iloc[0], 2 ** 32 - 1)
+
+    def test_optimization_is_lossless(self):
+        rng = np.random.default_rng(1)
+        frame = pd.DataFrame({
+            'small': rng.integers(-5, 5, 1000),
+            'exact': rng.integers(0, 100, 1000) / 4,
+            'inexact': rng.normal(size=1000),
+            'label': rng.choice(['x', 'y', 'z'], 1000)
+        })
+        optimized = optimize_memory(frame, log=False)
+        self.assertEqual(str(optimized['label'].dtype), 'category')
+        for column in frame.columns:
+            np.testing.assert_array_equal(optimized[column].to_numpy(dtype=frame[column].dtype),
+                                          frame[column].to_numpy())
+
+
+class ChunkedReadTest(unittest.TestCase):
+
+    def test_every_streamable_format_yields_projected_chunks(self):
+        rng = np.random.default_rng(2)
+        frame = pd.DataFrame({'a': rng.normal(size=2500), 'b': rng.integers(0, 9, 2500), 'c': 'x'})
+        with tempfile.TemporaryDirectory() as directory:
+            sources = [os.path.join(directory, name) for name in ('data.csv', 'data.ndjson', 'data.parquet',
+                                                                  'data.feather')]
+            frame.to_csv(sources[0], index=False)
+            frame.to_json(sources[1], orient='records', lines=True, double_precision=15)
+            frame.to_parquet(sources[2], row_group_size=1000)
+            frame.to_feather(sources[3])
+            dataset = os.path.join(directory, 'dataset')
+            os.mkdir(dataset)
+            frame.iloc[:1200].to_parquet(os.path.join(dataset, 'part-0.parquet'))
+            frame.iloc[1200:].to_parquet(os.path.join(dataset, 'part-1.parquet'))
+
+            for source in sources + [dataset]:
+                chunks = list(iter_chunks(source, 1000, ['b', 'a']))
+                self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks), source)
+                combined = pd.concat(chunks, ignore_index=True)
+                self.assertEqual(list(combined.columns), ['b', 'a'], source)
+                np.testing.assert_allclose(combined['a'], frame['a'], err_msg=source)
+                np.testing.assert_array_equal(combined['b'], frame['b'], err_msg=source)
+
+            with self.assertRaises(ValueError):
+                list(iter_chunks(os.path.join(directory, 'data.xlsx'), 1000))
+
+
+if __name__ == '__main__':
+    unittest.main()
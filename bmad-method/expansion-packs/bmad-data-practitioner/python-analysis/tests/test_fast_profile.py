@@ -0,0 +1,102 @@
+"""
+Fast profile: HyperLogLog stays within its error bound, per-column stats
+and correlations agree with pandas, nullable dtypes are profiled
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fast_profile import profile_frame  # noqa: E402
+from streaming_sketches import HyperLogLog  # noqa: E402
+
+
+class HyperLogLogTest(unittest.TestCase):
+
+    def test_relative_error_within_three_standard_errors(self):
+        bound = 3 * 1.04 / np.sqrt(2 ** 12)
+        rng = np.random.default_rng(0)
+        for cardinality in (10, 1000, 5000, 20000, 300000):
+            values = rng.choice(rng.integers(0, 2 ** 62, cardinality), 2 * cardinality)
+            distinct = len(np.unique(values))
+            estimate = HyperLogLog(12).update(values).estimate()
+            self.assertLess(abs(estimate - distinct) / distinct, bound, cardinality)
+
+    def test_merge_equals_union(self):
+        rng = np.random.default_rng(1)
+        first, second = rng.integers(0, 50000, 40000), rng.integers(25000, 90000, 40000)
+        merged = HyperLogLog().update(first).merge(HyperLogLog().update(second))
+        union = HyperLogLog().update(np.concatenate([first, second]))
+        np.testing.assert_array_equal(merged.registers, union.registers)
+        with self.assertRaises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+    def test_nulls_are_not_counted(self):
+        sketch = HyperLogLog().update(pd.Series(['a', None, 'b', np.nan, 'a']))
+        self.assertEqual(round(sketch.estimate()), 2)
+
+
+class ProfileFrameTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(2)
+        n = 5000
+        x = rng.normal(size=n)
+        cls.frame = pd.DataFrame({
+            'x': np.where(rng.random(n) < 0.1, np.nan, x),
+            'y': 2 * x + rng.normal(scale=0.1, size=n),
+            'count': pd.array(np.where(rng.random(n) < 0.2, None, rng.integers(0, 4, n)), dtype='Int64'),
+            'label': rng.choice(['red', 'green', 'blue'], n, p=[0.5, 0.3, 0.2]),
+            'flag': rng.random(n) < 0.3,
+            'id': [f'row-{i}' for i in range(n)]
+        })
+        # Blocks of one column, so the block loop is exercised too
+        cls.profile = profile_frame(cls.frame, max_top_k_distinct=1000, max_block_bytes=8 * n)
+
+    def test_numeric_stats_match_pandas(self):
+        for column in ('x', 'y', 'count'):
+            series = self.frame[column].astype(float)
+            stats = self.profile['columns'][column]
+            self.assertEqual(stats['count'], series.count())
+            self.assertEqual(stats['null_count'], series.isna().sum())
+            self.assertAlmostEqual(stats['mean'], series.mean())
+            self.assertAlmostEqual(stats['std'], series.std())
+            self.assertEqual((stats['min'], stats['max']), (series.min(), series.max()))
+            for label, q in (('25%', 0.25), ('50%', 0.5), ('75%', 0.75)):
+                self.assertAlmostEqual(stats['quartiles'][label], series.quantile(q))
+            self.assertEqual(stats['zeros'], (series == 0).sum())
+            self.assertEqual(sum(stats['histogram']['counts']), series.count())
+
+    def test_top_values_and_distinct_estimates(self):
+        columns = self.profile['columns']
+        self.assertEqual(columns['label']['top_values'],
+                         [{'value': v, 'count': int(c)} for v, c in self.frame['label'].value_counts().items()])
+        self.assertEqual(columns['count']['distinct_estimate'], 4)
+        self.assertEqual(columns['flag']['distinct_estimate'], 2)
+        self.assertNotIn('mean', columns['flag'])
+        # Unique identifiers exceed max_top_k_distinct, and are flagged as high cardinality
+        self.assertNotIn('top_values', columns['id'])
+        self.assertIn({'type': 'high_cardinality', 'column': 'id'},
+                      [{k: w[k] for k in ('type', 'column')} for w in self.profile['warnings']])
+
+    def test_correlations_match_pandas(self):
+        expected = self.frame[['x', 'y', 'count']].astype(float).corr()
+        pairs = {(c['variable_1'], c['variable_2']): c['correlation'] for c in self.profile['correlations']}
+        self.assertEqual(list(pairs), [('x', 'y')])
+        self.assertAlmostEqual(pairs[('x', 'y')], expected.loc['x', 'y'], places=6)
+
+    def test_dataset_info(self):
+        info = self.profile['dataset_info']
+        self.assertEqual((info['n_rows'], info['n_columns']), self.frame.shape)
+        self.assertEqual(info['missing_cells'], self.frame.isna().sum().sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
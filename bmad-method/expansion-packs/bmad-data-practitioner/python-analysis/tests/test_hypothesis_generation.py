@@ -0,0 +1,72 @@
+"""
+Hypothesis generation: predictor screening keeps only predictors with real signal
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hypothesis_generation import HypothesisGenerator  # noqa: E402
+
+
+def _frame(n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    a, b = rng.normal(size=n), rng.normal(size=n)
+    frame = pd.DataFrame({
+        'a': a,
+        'b': b,
+        'y': a + b + rng.normal(size=n) * 1.5,
+        'noise': rng.normal(size=n),
+        'noise2': rng.normal(size=n),
+        'empty': np.nan,
+        'group': rng.choice(['p', 'q', 'r'], n)
+    })
+    frame['counts'] = pd.array(rng.integers(0, 9, n), dtype='Int64')
+    frame.loc[::5, 'counts'] = pd.NA
+    return frame
+
+
+def _predictions(config, data):
+    generator = HypothesisGenerator(config)
+    generator.data = data
+    return {h.variables[0]: h.variables[1:] for h in generator._generate_prediction_hypotheses()}
+
+
+class PredictorScreeningTest(unittest.TestCase):
+
+    def test_linear_scores_match_references(self):
+        data = _frame()
+        generator = HypothesisGenerator()
+        numeric = ['a', 'b', 'y', 'noise']
+        scores = generator._screen_predictors(data, ['y'], numeric, ['group'])
+        for var in numeric:
+            self.assertAlmostEqual(scores.loc['y', var], data['y'].corr(data[var]) ** 2)
+
+        # ω² of a one-way ANOVA
+        groups = [data.loc[data['group'] == level, 'y'] for level in ('p', 'q', 'r')]
+        ss_total = ((data['y'] - data['y'].mean()) ** 2).sum()
+        ss_between = sum(len(g) * (g.mean() - data['y'].mean()) ** 2 for g in groups)
+        ms_within = (ss_total - ss_between) / (len(data) - 3)
+        expected = max((ss_between - 2 * ms_within) / (ss_total + ms_within), 0.0)
+        self.assertAlmostEqual(scores.loc['y', 'group'], expected)
+
+    def test_mutual_info_ignores_noise_and_missing_columns(self):
+        for seed in range(3):
+            predictions = _predictions({'screening_method': 'mutual_info'}, _frame(seed=seed))
+            self.assertEqual(sorted(predictions.get('y', [])), ['a', 'b'])
+            for outcome, predictors in predictions.items():
+                self.assertNotIn(outcome, ('noise', 'noise2', 'counts'))
+                self.assertFalse({'noise', 'noise2', 'counts', 'empty'} & set(predictors))
+
+    def test_linear_screening_handles_nullable_and_missing_columns(self):
+        self.assertEqual(sorted(_predictions({}, _frame())['y']), ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
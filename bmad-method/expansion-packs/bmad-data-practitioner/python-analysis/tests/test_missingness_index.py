@@ -0,0 +1,56 @@
+"""
+Missingness index: complete-case counts and null counts agree with pandas
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import itertools
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from missingness_index import MissingnessIndex  # noqa: E402
+
+
+class MissingnessIndexTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        # Row count not a multiple of 8, so the last packed byte has padding bits
+        n = 1003
+        cls.frame = pd.DataFrame({
+            'full': rng.normal(size=n),
+            'float': np.where(rng.random(n) < 0.2, np.nan, rng.normal(size=n)),
+            'nullable': pd.array(np.where(rng.random(n) < 0.3, None, rng.integers(0, 9, n)), dtype='Int64'),
+            'text': np.where(rng.random(n) < 0.1, None, rng.choice(['a', 'b'], n)),
+            'empty': np.full(n, np.nan)
+        })
+        cls.index = MissingnessIndex(cls.frame)
+
+    def test_complete_cases_match_dropna(self):
+        for size in range(1, len(self.frame.columns) + 1):
+            for columns in itertools.combinations(self.frame.columns, size):
+                self.assertEqual(self.index.complete_cases(columns),
+                                 len(self.frame.dropna(subset=list(columns))), columns)
+        self.assertEqual(self.index.complete_cases([]), len(self.frame))
+
+    def test_null_counts_match_isna(self):
+        self.assertEqual(self.index.null_counts, self.frame.isna().sum().to_dict())
+        self.assertAlmostEqual(self.index.null_ratio('float'), self.frame['float'].isna().mean())
+
+    def test_unknown_columns_are_entirely_missing(self):
+        self.assertEqual(self.index.complete_cases(['full', 'missing']), 0)
+
+    def test_empty_frame(self):
+        index = MissingnessIndex(pd.DataFrame({'a': pd.Series([], dtype=float)}))
+        self.assertEqual(index.complete_cases(['a']), 0)
+        self.assertEqual(index.null_ratio('a'), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Neighbor search: the random-projection forest recovers most exact nearest neighbors,
+and LOF and DBSCAN on the approximate backends agree with the exact ones
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score
+from sklearn.neighbors import NearestNeighbors
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neighbor_search import NeighborSearch, random_projection_knn  # noqa: E402
+
+
+def _clusters(seed: int = 0, outliers: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    blocks = [rng.normal(center, 1.0, (1000, 8)) for center in (0, 5, 10)]
+    return np.vstack(blocks + [rng.uniform(-20, 30, (outliers, 8))])
+
+
+def _recall(indices: np.ndarray, exact: np.ndarray) -> float:
+    return float(np.mean([len(np.intersect1d(found, true)) for found, true in zip(indices, exact)]) / exact.shape[1])
+
+
+class RandomProjectionKnnTest(unittest.TestCase):
+
+    def test_recall_against_exact_neighbors(self):
+        data = _clusters()
+        _, exact = NearestNeighbors(n_neighbors=10).fit(data).kneighbors(data)
+        recalls = []
+        for n_trees in (1, 4):
+            distances, indices = random_projection_knn(data, 10, n_trees=n_trees)
+            recalls.append(_recall(indices, exact))
+
+            # Every row is its own first neighbor, and reported distances are exact for what was found
+            np.testing.assert_array_equal(indices[:, 0], np.arange(len(data)))
+            np.testing.assert_allclose(distances, np.linalg.norm(data[indices] - data[:, None, :], axis=2), atol=1e-6)
+            self.assertTrue(np.all(np.diff(distances, axis=1) >= 0))
+        self.assertGreater(recalls[1], 0.9)
+        self.assertGreater(recalls[1], recalls[0])
+
+    def test_recall_probes_estimate_recall(self):
+        data = _clusters(1)
+        search = NeighborSearch('random_projection', recall_probes=200)
+        _, indices = search._approximate_knn(data, 11)
+        _, exact = NearestNeighbors(n_neighbors=11).fit(data).kneighbors(data)
+        self.assertLess(abs(search.stats['estimated_recall'] - _recall(indices, exact)), 0.05)
+
+
+class DetectorBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data = _clusters(2, outliers=20)
+        self.planted = set(range(3000, 3020))
+
+    def test_lof_labels_agree_with_exact(self):
+        exact, _ = NeighborSearch('exact').lof(self.data, 20, 0.01)
+        for search in (NeighborSearch('random_projection'), NeighborSearch('sample', sample_size=1500)):
+            labels, scores = search.lof(self.data, 20, 0.01)
+            self.assertGreater(np.mean(labels == exact), 0.99, search.backend)
+            self.assertTrue(self.planted <= set(np.nonzero(labels == -1)[0]), search.backend)
+            self.assertEqual(search.describe()['backend'], search.backend)
+
+    def test_dbscan_clusters_agree_with_exact(self):
+        exact = NeighborSearch('exact').dbscan(self.data, eps=1.5, min_samples=5)
+        approximate = NeighborSearch('random_projection').dbscan(self.data, eps=1.5, min_samples=5)
+        self.assertGreater(adjusted_rand_score(exact, approximate), 0.9)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            NeighborSearch('annoy')
+
+
+if __name__ == '__main__':
+    unittest.main()
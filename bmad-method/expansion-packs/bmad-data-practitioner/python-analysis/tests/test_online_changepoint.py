@@ -0,0 +1,85 @@
+"""
+Online change point detection: mean shifts are found near where they happen,
+isolated spikes are not, and saved state resumes exactly where it stopped
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from online_changepoint import BayesianOnlineChangePoint  # noqa: E402
+from pattern_detection import PatternDetector  # noqa: E402
+
+
+def _shifted_series(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = np.concatenate([rng.normal(0, 1, 300), rng.normal(4, 1, 300), rng.normal(-1, 1, 300)])
+    values[150] += 9
+    return values
+
+
+class BayesianOnlineChangePointTest(unittest.TestCase):
+
+    def test_mean_shifts_are_detected_and_spikes_ignored(self):
+        for seed in range(3):
+            detector = BayesianOnlineChangePoint()
+            positions = [d['position'] for d in detector.update(_shifted_series(seed))]
+            self.assertEqual(len(positions), 2, seed)
+            self.assertLessEqual(abs(positions[0] - 300), 3)
+            self.assertLessEqual(abs(positions[1] - 600), 3)
+            self.assertLessEqual(detector.state_size(), detector.window)
+
+    def test_saved_state_resumes_exactly(self):
+        values = _shifted_series()
+        uninterrupted = BayesianOnlineChangePoint().update(values)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'state', 'bocpd.pkl')
+            detector = BayesianOnlineChangePoint()
+            resumed = detector.update(values[:450], keys=np.arange(450))
+            detector.save(path)
+            detector = BayesianOnlineChangePoint.load(path)
+            self.assertEqual(detector.last_key, 449)
+            resumed += detector.update(values[450:], labels=range(450, len(values)))
+
+        self.assertEqual(resumed, uninterrupted)
+
+    def test_nan_values_are_skipped(self):
+        values = _shifted_series()
+        with_gaps = np.insert(values, [100, 400], np.nan)
+        detections = BayesianOnlineChangePoint().update(with_gaps)
+        self.assertEqual([d['value'] for d in detections],
+                         [d['value'] for d in BayesianOnlineChangePoint().update(values)])
+
+
+class IncrementalChangePointTest(unittest.TestCase):
+
+    def test_scheduled_runs_only_process_new_points(self):
+        values = _shifted_series()
+        frame = pd.DataFrame({'t': pd.date_range('2024-01-01', periods=len(values), freq='min'), 'value': values})
+        detector = PatternDetector()
+
+        with tempfile.TemporaryDirectory() as directory:
+            state = os.path.join(directory, 'value.pkl')
+            found, summary = detector.detect_change_points_online(frame['value'][:500], state, frame['t'][:500])
+            self.assertEqual(summary['new_observations'], 500)
+            # The next run sees overlapping rows again; only the last 400 are new
+            more, summary = detector.detect_change_points_online(frame['value'][100:], state, frame['t'][100:])
+            self.assertEqual(summary['new_observations'], 400)
+            self.assertEqual(summary['observations_total'], len(values))
+
+        indices = [anomaly.index for anomaly in found + more]
+        self.assertEqual(len(indices), 2)
+        self.assertLessEqual(abs(indices[0] - 300), 3)
+        self.assertLessEqual(abs(indices[1] - 600), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
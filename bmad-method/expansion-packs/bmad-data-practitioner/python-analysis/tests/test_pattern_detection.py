@@ -0,0 +1,178 @@
+"""
+Pattern detection: persisted reference models are reused only for the data they were fitted on,
+grouped series are only cached on request, suite methods time out for any worker count,
+neighbor-search backend options never force a refit
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ANALYSIS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ANALYSIS_DIR)
+
+from pattern_detection import FittedDetector, PatternDetector  # noqa: E402
+
+
+def _frame(columns, n: int = 300, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({column: rng.normal(size=n) for column in columns})
+
+
+class IncrementalScoringTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_model_is_refitted_for_different_columns(self):
+        detector = PatternDetector()
+        path = os.path.join(self.directory.name, 'model.pkl')
+        _, refitted = detector.load_or_fit('isolation_forest', _frame(['a', 'b']), path)
+        self.assertTrue(refitted)
+        _, refitted = detector.load_or_fit('isolation_forest', _frame(['a', 'b'], seed=1), path)
+        self.assertFalse(refitted)
+        fitted, refitted = detector.load_or_fit('isolation_forest', _frame(['c', 'd', 'e']), path)
+        self.assertTrue(refitted)
+        self.assertEqual(fitted.columns, ['c', 'd', 'e'])
+
+    def test_neighbor_backend_options_do_not_refit(self):
+        detector = PatternDetector()
+        path = os.path.join(self.directory.name, 'lof.pkl')
+        detector.load_or_fit('local_outlier_factor', _frame(['a', 'b']), path, {'n_neighbors': 10})
+        fitted, refitted = detector.load_or_fit('local_outlier_factor', _frame(['a', 'b']), path, {
+            'n_neighbors': 10, 'neighbor_backend': 'random_projection', 'recall_probes': 50
+        })
+        self.assertFalse(refitted)
+        self.assertEqual(fitted.parameters, {'n_neighbors': 10})
+        _, refitted = detector.load_or_fit('local_outlier_factor', _frame(['a', 'b']), path, {'n_neighbors': 15})
+        self.assertTrue(refitted)
+
+    def test_default_model_path_depends_on_source_and_columns(self):
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        self.addCleanup(os.chdir, cwd)
+        detector = PatternDetector()
+        paths = {
+            detector.execute_incremental_scoring(frame, 'isolation_forest', {}, {}, source)['metadata']['model_path']
+            for frame, source in ((_frame(['a', 'b']), 'a.csv'), (_frame(['a', 'b']), 'b.csv'),
+                                  (_frame(['c', 'd']), 'a.csv'))
+        }
+        self.assertEqual(len(paths), 3)
+
+    def test_reference_models_survive_model_cache_eviction(self):
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        self.addCleanup(os.chdir, cwd)
+        detector = PatternDetector({'model_cache': {'enabled': True, 'max_bytes': 1}})
+        frame = _frame(['a', 'b'])
+        # The default location, and an explicit path inside the cache directory itself
+        settings = ({}, {'model_path': os.path.join('.cache', 'pattern-models', 'hourly.pkl')})
+        paths = [detector.execute_incremental_scoring(frame, 'isolation_forest', {}, incremental, 'a.csv')
+                 ['metadata']['model_path'] for incremental in settings]
+        for path in paths:
+            os.utime(path, (0, 0))
+
+        # Every put overflows max_bytes and evicts the cache's own entries, oldest first
+        self.assertTrue(detector.execute_detection('isolation_forest', frame, {})['success'])
+        self.assertTrue(detector.execute_detection('isolation_forest', _frame(['a', 'b'], seed=1), {})['success'])
+        self.assertEqual(detector.model_cache.stats()['entries'], 0)
+        for path, incremental in zip(paths, settings):
+            self.assertTrue(os.path.exists(path))
+            result = detector.execute_incremental_scoring(frame, 'isolation_forest', {}, incremental, 'a.csv')
+            self.assertFalse(result['metadata']['refitted'])
+
+    def test_model_saved_by_the_cli_loads_from_an_import(self):
+        source = os.path.join(self.directory.name, 'data.csv')
+        _frame(['a', 'b']).to_csv(source, index=False)
+        params = json.dumps({'data_source': source, 'method': 'isolation_forest'})
+        for expected_refit in (True, False):
+            output = subprocess.run(
+                [sys.executable, os.path.join(ANALYSIS_DIR, 'pattern_detection.py'), 'score', params],
+                cwd=self.directory.name, capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output)
+            self.assertEqual(result['metadata']['refitted'], expected_refit)
+
+        fitted = FittedDetector.load(os.path.join(self.directory.name, result['metadata']['model_path']))
+        self.assertEqual(fitted.columns, ['a', 'b'])
+
+
+class GroupedSeasonalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        self.addCleanup(os.chdir, cwd)
+
+    @staticmethod
+    def _series() -> pd.DataFrame:
+        rng = np.random.default_rng(4)
+        hours = pd.date_range('2024-01-01', periods=24 * 14, freq='h')
+        frames = []
+        for key in ('a', 'b', 'c'):
+            values = 10 * np.sin(2 * np.pi * np.arange(len(hours)) / 24) + rng.normal(size=len(hours))
+            values[100] += 40
+            frames.append(pd.DataFrame({'key': key, 'timestamp': hours, 'value': values}))
+        return pd.concat(frames, ignore_index=True)
+
+    def test_series_cache_is_opt_in(self):
+        table, _, metadata = PatternDetector().detect_grouped_seasonal_anomalies(
+            self._series(), 'key', period=24, max_workers=1
+        )
+        self.assertFalse(os.path.exists(os.path.join('.cache', 'pattern-series')))
+        self.assertEqual(set(table.identifier), {'a', 'b', 'c'})
+
+        config = {'series_cache': {'enabled': True, 'path': os.path.join(self.directory.name, 'series')}}
+        for expected_unchanged in (0, 3):
+            _, _, metadata = PatternDetector(config).detect_grouped_seasonal_anomalies(
+                self._series(), 'key', period=24, max_workers=1
+            )
+            self.assertEqual(metadata['series_unchanged'], expected_unchanged)
+
+
+class DetectionSuiteTest(unittest.TestCase):
+
+    def test_slow_method_times_out_with_one_worker(self):
+        original = PatternDetector._run_zscore_detection
+
+        def slow_zscore_detection(detector, data, parameters):
+            time.sleep(30 if parameters.get('slow') else 0)
+            return original(detector, data, parameters)
+
+        methods = [{'method': 'zscore', 'parameters': {'slow': True}, 'timeout': 1},
+                   {'method': 'iqr'}, {'method': 'zscore'}]
+        # Forked workers inherit the patched method
+        with mock.patch.object(PatternDetector, '_run_zscore_detection', slow_zscore_detection):
+            start = time.monotonic()
+            result = PatternDetector().execute_detection_suite(_frame(['a', 'b']), methods, max_workers=1)
+        self.assertLess(time.monotonic() - start, 15)
+
+        self.assertEqual(result['metadata']['timeout_count'], 1)
+        self.assertEqual([entry['status'] for entry in result['method_results']], ['timeout', 'success', 'success'])
+
+
+class CommandLineTest(unittest.TestCase):
+
+    def test_profile_imports_runs_without_a_command(self):
+        completed = subprocess.run(
+            [sys.executable, os.path.join(ANALYSIS_DIR, 'pattern_detection.py'), '--profile-imports'],
+            capture_output=True, text=True, check=True
+        )
+        profile = json.loads(completed.stdout)['import_profile']
+        self.assertIn('pattern_detection_module', profile)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Power analysis: analytic power agrees with statsmodels, the vectorized
+Brown-Forsythe test and normality checks agree with scipy
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from power_analysis import analytic_power, brown_forsythe, n_bucket, normality_flags  # noqa: E402
+
+try:
+    from statsmodels.stats import power as sm_power
+except ImportError:
+    sm_power = None
+
+
+@unittest.skipIf(sm_power is None, 'statsmodels not installed')
+class AnalyticPowerTest(unittest.TestCase):
+    # Sizes below 100 or on a bucket boundary, so bucketing does not move them
+    SIZES = (20, 57, 100, 340, 2500)
+
+    def test_t_test_matches_statsmodels(self):
+        for n in self.SIZES:
+            for d in (0.2, 0.5, 0.8):
+                n1 = n // 2
+                expected = sm_power.TTestIndPower().power(d, nobs1=n1, alpha=0.05, ratio=(n - n1) / n1)
+                self.assertAlmostEqual(analytic_power('t_test', n, d), expected, places=6)
+
+    def test_anova_matches_statsmodels(self):
+        for n in self.SIZES:
+            for k in (3, 5):
+                expected = sm_power.FTestAnovaPower().power(0.25, nobs=n, alpha=0.05, k_groups=k)
+                self.assertAlmostEqual(analytic_power('anova', n, 0.25, k=k), expected, places=6)
+
+    def test_regression_matches_statsmodels(self):
+        for n in self.SIZES:
+            for k in (1, 4):
+                # Cohen's f = sqrt(f²); statsmodels' noncentrality f² (df_num + df_denom + 1) is f² n
+                expected = sm_power.FTestPower().power(np.sqrt(0.15), df_num=n - k - 1, df_denom=k, alpha=0.05)
+                self.assertAlmostEqual(analytic_power('regression', n, 0.15, k=k), expected, places=6)
+
+    def test_correlation_matches_fisher_z_normal_power(self):
+        for n in self.SIZES:
+            for r in (0.1, 0.3, -0.5):
+                # One-sample normal power on Fisher's z with n - 3 observations
+                expected = sm_power.NormalIndPower().power(np.arctanh(abs(r)), nobs1=n - 3, alpha=0.05, ratio=0)
+                self.assertAlmostEqual(analytic_power('correlation', n, r), expected, places=6)
+
+    def test_degenerate_designs_have_power_alpha(self):
+        self.assertEqual(analytic_power('t_test', 3, 0.5), 0.05)
+        self.assertEqual(analytic_power('anova', 3, 0.25, k=3), 0.05)
+        with self.assertRaises(ValueError):
+            analytic_power('chi_square', 100, 0.3)
+
+
+class BucketTest(unittest.TestCase):
+
+    def test_buckets_round_down_to_two_significant_digits(self):
+        self.assertEqual([n_bucket(n) for n in (7, 99, 100, 123, 4567, 98765)], [7, 99, 100, 120, 4500, 98000])
+
+    def test_bucketed_power_is_conservative(self):
+        self.assertLessEqual(analytic_power('correlation', 4599, 0.05), analytic_power('correlation', 4600, 0.05))
+
+
+class SampleChecksTest(unittest.TestCase):
+
+    def test_brown_forsythe_matches_scipy_levene(self):
+        rng = np.random.default_rng(0)
+        codes = rng.integers(0, 4, 500)
+        values = rng.normal(scale=1 + 0.3 * codes)
+        values[rng.random(500) < 0.05] = np.nan
+        codes[rng.random(500) < 0.05] = -1
+
+        keep = ~np.isnan(values) & (codes >= 0)
+        groups = [values[keep & (codes == g)] for g in range(4)]
+        self.assertAlmostEqual(brown_forsythe(values, codes), stats.levene(*groups, center='median').pvalue)
+        self.assertEqual(brown_forsythe(values, np.zeros(500, dtype=int)), 1.0)
+
+    def test_normality_flags_match_scipy_moments(self):
+        rng = np.random.default_rng(1)
+        values = np.column_stack([rng.normal(size=2000), rng.lognormal(sigma=1.2, size=2000)])
+        values[::17, 0] = np.nan
+        skew, kurtosis, normal = normality_flags(values)
+
+        for column in range(2):
+            observed = values[~np.isnan(values[:, column]), column]
+            self.assertAlmostEqual(skew[column], stats.skew(observed))
+            self.assertAlmostEqual(kurtosis[column], stats.kurtosis(observed))
+        self.assertEqual(normal.tolist(), [True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
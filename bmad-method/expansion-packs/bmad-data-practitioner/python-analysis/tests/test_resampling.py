@@ -0,0 +1,84 @@
+"""
+Resampling engine: permutation p-values and bootstrap intervals agree with scipy,
+results depend only on the seed, not on block size or worker count
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resampling import STATISTICS, bootstrap_ci, permutation_test, resample  # noqa: E402
+
+
+class PermutationTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.a = rng.normal(0.0, 1.0, 40)
+        self.b = rng.normal(0.5, 1.5, 55)
+
+    def test_p_values_match_scipy(self):
+        for statistic in ('mean_difference', 'median_difference', 'cohens_d'):
+            for alternative in ('two-sided', 'greater', 'less'):
+                ours = permutation_test(self.a, self.b, statistic, n_resamples=20000, alternative=alternative)
+                reference = stats.permutation_test(
+                    (self.a, self.b), lambda x, y, axis: STATISTICS[statistic](x, y),
+                    vectorized=True, n_resamples=20000, alternative=alternative, random_state=1
+                )
+                self.assertAlmostEqual(ours['statistic'], reference.statistic)
+                # Monte Carlo error of each p-value is at most 0.5 / sqrt(20000)
+                self.assertLess(abs(ours['p_value'] - reference.pvalue), 0.015, (statistic, alternative))
+
+    def test_p_value_is_never_zero(self):
+        result = permutation_test(self.a, self.a + 10, n_resamples=999)
+        self.assertEqual(result['p_value'], 1 / 1000)
+
+
+class BootstrapTest(unittest.TestCase):
+
+    def test_percentile_interval_matches_scipy(self):
+        rng = np.random.default_rng(2)
+        a, b = rng.exponential(1.0, 60), rng.exponential(1.5, 80)
+        ours = bootstrap_ci(a, b, 'mean_difference', n_resamples=20000)
+        reference = stats.bootstrap((a, b), lambda x, y, axis: STATISTICS['mean_difference'](x, y),
+                                    vectorized=True, n_resamples=20000, method='percentile', random_state=3)
+        # Each tail quantile carries Monte Carlo error of a few percent of the standard error
+        scale = reference.standard_error
+        self.assertLess(abs(ours['lower'] - reference.confidence_interval.low), 0.15 * scale)
+        self.assertLess(abs(ours['upper'] - reference.confidence_interval.high), 0.15 * scale)
+        self.assertLess(abs(ours['standard_error'] - scale), 0.03 * scale)
+
+    def test_basic_interval_reflects_percentile_interval(self):
+        rng = np.random.default_rng(4)
+        a, b = rng.normal(size=30), rng.normal(size=30)
+        percentile = bootstrap_ci(a, b, n_resamples=2000)
+        basic = bootstrap_ci(a, b, n_resamples=2000, method='basic')
+        self.assertAlmostEqual(basic['lower'], 2 * percentile['statistic'] - percentile['upper'])
+        self.assertAlmostEqual(basic['upper'], 2 * percentile['statistic'] - percentile['lower'])
+
+
+class DeterminismTest(unittest.TestCase):
+
+    def test_output_depends_only_on_the_seed(self):
+        rng = np.random.default_rng(5)
+        a, b = rng.normal(size=200), rng.normal(size=300)
+        for kind in ('permutation', 'bootstrap'):
+            serial = resample(a, b, kind, n_resamples=5000, max_block_bytes=2 ** 20, max_workers=1)
+            parallel = resample(a, b, kind, n_resamples=5000, max_block_bytes=2 ** 20, max_workers=3)
+            np.testing.assert_array_equal(serial, parallel)
+            reseeded = resample(a, b, kind, n_resamples=5000, max_block_bytes=2 ** 20, random_state=6)
+            self.assertFalse(np.array_equal(serial, reseeded))
+
+    def test_unknown_statistic_is_rejected(self):
+        with self.assertRaises(ValueError):
+            resample([1.0, 2.0], [3.0, 4.0], 'permutation', statistic='ratio')
+
+
+if __name__ == '__main__':
+    unittest.main()
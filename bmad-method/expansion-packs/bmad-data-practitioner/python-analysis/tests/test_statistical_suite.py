@@ -0,0 +1,161 @@
+"""
+Statistical test suites: batched results equal the per-test path and scipy,
+pooled suites keep spec order and report timeouts, cached results equal computed ones
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from statistical_testing import StatisticalTester
+except ImportError:  # optional statistics packages are not installed
+    StatisticalTester = None
+
+
+def _frame(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({column: rng.normal(size=n) for column in 'abcd'})
+    frame['b'] += 0.3 * frame['a']
+    frame.loc[rng.random(n) < 0.1, 'c'] = np.nan
+    frame['e'] = rng.integers(0, 5, n)
+    return frame
+
+
+@unittest.skipIf(StatisticalTester is None, 'statistical_testing dependencies are not installed')
+class BulkExecutionTest(unittest.TestCase):
+    PAIRS = (['a', 'b'], ['a', 'c'], ['c', 'e'])
+
+    def setUp(self):
+        self.frame = _frame()
+        self.specs = [{'test': test, 'variables': pair}
+                      for test in ('pearson_correlation', 'spearman_correlation') for pair in self.PAIRS]
+        self.specs += [{'test': 't_test_independent', 'variables': pair, 'equal_var': equal_var}
+                       for pair in self.PAIRS for equal_var in (True, False)]
+
+    def _assert_same(self, first, second):
+        if isinstance(first, dict):
+            self.assertEqual(first.keys(), second.keys())
+            for key in first:
+                self._assert_same(first[key], second[key])
+        elif isinstance(first, float):
+            self.assertAlmostEqual(first, second, places=10)
+        else:
+            self.assertEqual(first, second)
+
+    def test_bulk_results_equal_per_test_results(self):
+        tester = StatisticalTester()
+        bulk = tester.execute_test_suite(self.frame, self.specs, bulk=True)
+        single = tester.execute_test_suite(self.frame, self.specs, bulk=False)
+        self.assertEqual(bulk['metadata']['bulk_tests_executed'], len(self.specs))
+        self.assertEqual(len(bulk['test_results']), len(self.specs))
+        for batched, reference in zip(bulk['test_results'], single['test_results']):
+            self._assert_same(batched, reference)
+
+    def test_bulk_p_values_match_scipy(self):
+        results = StatisticalTester().execute_test_suite(self.frame, self.specs, bulk=True)['test_results']
+        for spec, result in zip(self.specs, results):
+            x, y = self.frame[spec['variables'][0]], self.frame[spec['variables'][1]]
+            if spec['test'] == 't_test_independent':
+                expected = stats.ttest_ind(x.dropna(), y.dropna(), equal_var=spec['equal_var'])
+            else:
+                complete = x.notna() & y.notna()
+                test = stats.pearsonr if spec['test'] == 'pearson_correlation' else stats.spearmanr
+                expected = test(x[complete], y[complete])
+            self.assertAlmostEqual(result['statistic'], expected.statistic, places=10)
+            self.assertAlmostEqual(result['p_value'], expected.pvalue, places=10)
+
+    def test_other_specs_run_one_at_a_time(self):
+        specs = self.specs[:1] + [{'test': 'shapiro_wilk', 'variables': ['a']}, {'test': 'pearson_correlation',
+                                                                                 'variables': ['a', 'missing']}]
+        result = StatisticalTester().execute_test_suite(self.frame, specs, bulk=True)
+        self.assertEqual(result['metadata']['bulk_tests_executed'], 1)
+        self.assertEqual([r['test_name'] for r in result['test_results']],
+                         ['Pearson Product-Moment Correlation', 'Shapiro-Wilk Normality Test'])
+
+
+@unittest.skipIf(StatisticalTester is None, 'statistical_testing dependencies are not installed')
+class ProcessPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = _frame()
+        self.specs = [{'test': test, 'variables': [column]}
+                      for column in 'abcd' for test in ('shapiro_wilk', 'jarque_bera')]
+
+    def test_results_come_back_in_spec_order(self):
+        tester = StatisticalTester()
+        serial = tester.execute_test_suite(self.frame, self.specs, max_workers=1)
+        pooled = tester.execute_test_suite(self.frame, self.specs, max_workers=3)
+        self.assertEqual(pooled['metadata']['max_workers'], 3)
+        self.assertEqual(pooled['test_results'], serial['test_results'])
+
+    def test_timed_out_test_is_reported_and_the_rest_resubmitted(self):
+        original = StatisticalTester._run_shapiro_wilk
+
+        def slow_shapiro_wilk(tester, data, variables, test_spec):
+            # Every test waits a little, so tests are still queued when the slow one times out
+            time.sleep(30 if test_spec.get('slow') else 0.3)
+            return original(tester, data, variables, test_spec)
+
+        specs = [{'test': 'shapiro_wilk', 'variables': ['a'], 'slow': True, 'timeout': 1}]
+        specs += [{'test': 'shapiro_wilk', 'variables': [column]} for column in 'bcdbcdbcd']
+        # Forked workers inherit the patched method
+        with mock.patch.object(StatisticalTester, '_run_shapiro_wilk', slow_shapiro_wilk):
+            start = time.monotonic()
+            result = StatisticalTester().execute_test_suite(self.frame, specs, max_workers=2)
+        self.assertLess(time.monotonic() - start, 15)
+
+        self.assertEqual(result['metadata']['timeout_count'], 1)
+        self.assertEqual([r['variables'] for r in result['test_results']], [spec['variables'] for spec in specs[1:]])
+
+
+@unittest.skipIf(StatisticalTester is None, 'statistical_testing dependencies are not installed')
+class ResultCacheTest(unittest.TestCase):
+    SPECS = [
+        {'test': 't_test_independent', 'variables': ['x', 'z']},
+        {'test': 'pearson_correlation', 'variables': ['x', 'y']},
+        {'test': 'shapiro_wilk', 'variables': ['y'], 'rationale': 'ignored by the cache key'}
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        rng = np.random.default_rng(0)
+        self.frame = pd.DataFrame({
+            'x': rng.normal(size=200), 'y': rng.normal(size=200), 'z': rng.normal(0.5, 1, 200)
+        })
+
+    def _run(self, frame, specs=None):
+        tester = StatisticalTester(result_cache={'enabled': True, 'path': self.directory.name})
+        return tester.execute_test_suite(frame, specs or self.SPECS, max_workers=1)
+
+    def test_cached_results_equal_computed_results(self):
+        first = self._run(self.frame)
+        second = self._run(self.frame)
+        self.assertEqual(first['metadata']['cached_tests'], 0)
+        self.assertEqual(second['metadata']['cached_tests'], len(self.SPECS))
+        self.assertEqual(second['test_results'], first['test_results'])
+
+    def test_changed_column_invalidates_only_its_tests(self):
+        self._run(self.frame)
+        changed = self.frame.assign(y=self.frame['y'] + 1)
+        self.assertEqual(self._run(changed)['metadata']['cached_tests'], 1)
+        specs = [dict(spec, alpha=0.01) if spec['test'] == 'shapiro_wilk' else spec for spec in self.SPECS]
+        self.assertEqual(self._run(self.frame, specs)['metadata']['cached_tests'], 2)
+
+    def test_cache_is_disabled_by_default(self):
+        self.assertIsNone(StatisticalTester().result_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
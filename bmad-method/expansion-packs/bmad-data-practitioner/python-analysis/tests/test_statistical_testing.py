@@ -0,0 +1,84 @@
+"""
+Statistical tests: results do not depend on how the data was loaded or summarized
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from statistical_testing import StatisticalTester
+except ImportError:  # optional statistics packages are not installed
+    StatisticalTester = None
+
+
+@unittest.skipIf(StatisticalTester is None, 'statistical_testing dependencies are not installed')
+class OptimizedLoadTest(unittest.TestCase):
+
+    def test_paired_t_test_on_optimized_integers(self):
+        frame = pd.DataFrame({'a': [100, -100, 50, -50, 120, 30], 'b': [-100, 100, -60, 60, -120, -20]})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'paired.csv')
+            frame.to_csv(path, index=False)
+            tester = StatisticalTester()
+            data = tester.load_data(path, optimize=True)
+
+        result = tester.test_paired_t_test(data['a'], data['b'])
+        expected = stats.ttest_rel(frame['a'], frame['b'])
+        self.assertAlmostEqual(result.statistic, expected.statistic)
+        self.assertAlmostEqual(result.p_value, expected.pvalue)
+
+
+@unittest.skipIf(StatisticalTester is None, 'statistical_testing dependencies are not installed')
+class StreamingNormalityTest(unittest.TestCase):
+
+    def _compare(self, values: np.ndarray):
+        frame = pd.DataFrame({'x': values})
+        specs = [{'test': test, 'variables': ['x']} for test in ('kolmogorov_smirnov', 'anderson_darling', 'jarque_bera')]
+        tester = StatisticalTester()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'values.csv')
+            frame.to_csv(path, index=False)
+            streamed = tester.execute_streaming_test_suite(path, specs, chunksize=5000)['test_results']
+        in_memory = [tester.test_kolmogorov_smirnov_normality(frame['x']), tester.test_anderson_darling(frame['x']),
+                     tester.test_jarque_bera(frame['x'])]
+        return dict(zip(('ks', 'ad', 'jb'), zip(streamed, in_memory)))
+
+    def test_normal_column_matches_in_memory(self):
+        results = self._compare(np.random.default_rng(0).normal(size=50_000))
+        streamed, exact = results['ks']
+        bounds = streamed['statistic_bounds']
+        self.assertGreater(streamed['statistic'], 0.0)
+        self.assertLessEqual(bounds['lower'], exact.statistic)
+        self.assertLessEqual(exact.statistic, bounds['upper'])
+        self.assertGreater(streamed['p_value'], 0.05)
+
+        streamed, exact = results['ad']
+        self.assertGreater(streamed['statistic'], 0.0)
+        self.assertLessEqual(streamed['statistic_bounds']['lower'], exact.statistic)
+        self.assertAlmostEqual(streamed['statistic'], exact.statistic, delta=0.1)
+        self.assertEqual(streamed['p_value'], exact.p_value)
+
+        streamed, exact = results['jb']
+        self.assertAlmostEqual(streamed['statistic'], exact.statistic, places=6)
+
+    def test_skewed_column_matches_in_memory(self):
+        results = self._compare(np.random.default_rng(1).lognormal(0, 0.3, 50_000))
+        for name in ('ks', 'ad'):
+            streamed, exact = results[name]
+            self.assertAlmostEqual(streamed['statistic'], exact.statistic, delta=0.05 * exact.statistic)
+            self.assertLessEqual(streamed['statistic_bounds']['lower'], exact.statistic)
+        self.assertLess(results['ks'][0]['p_value'], 0.05)
+        self.assertEqual(results['ad'][0]['p_value'], results['ad'][1].p_value)
+
+
+if __name__ == '__main__':
+    unittest.main()
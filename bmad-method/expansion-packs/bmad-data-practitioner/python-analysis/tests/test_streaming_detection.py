@@ -0,0 +1,63 @@
+"""
+Streaming detection: the chunked two-pass detectors agree with in-memory detection,
+exactly for z-scores and up to sketch error for the quantile-based methods
+Run from python-analysis with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pattern_detection import PatternDetector  # noqa: E402
+
+
+class StreamingDetectionTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        n = 20000
+        frame = pd.DataFrame({
+            'normal': rng.normal(size=n),
+            'heavy': 3 * rng.standard_t(4, size=n) + 10,
+            'skewed': np.where(rng.random(n) < 0.05, np.nan, rng.exponential(size=n))
+        })
+        cls.cells = frame.count().sum()
+        cls.csv = os.path.join(cls.directory.name, 'data.csv')
+        frame.to_csv(cls.csv, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def _flags(self, method, parameters):
+        detector = PatternDetector()
+        in_memory = detector.execute_detection(method, pd.read_csv(self.csv), dict(parameters))
+        streaming = detector.execute_streaming_detection(method, self.csv, dict(parameters, chunksize=3000))
+        self.assertTrue(in_memory['success'] and streaming['success'])
+        self.assertEqual(streaming['metadata']['chunks'], 7)
+        return ({(a['index'], a['value']) for a in in_memory['anomalies']},
+                {(a['index'], a['value']) for a in streaming['anomalies']})
+
+    def test_zscore_matches_in_memory_detection(self):
+        in_memory, streaming = self._flags('zscore', {'threshold': 3})
+        self.assertEqual(streaming, in_memory)
+
+    def test_sketch_methods_differ_only_near_the_bounds(self):
+        for method, parameters in (('iqr', {'multiplier': 1.5}), ('modified_zscore', {'threshold': 3.5}),
+                                   ('percentile', {'thresholds': [1, 99]})):
+            in_memory, streaming = self._flags(method, parameters)
+            # Sketched quantiles are off by a fraction of a percent in rank
+            self.assertGreater(len(in_memory), 0.01 * self.cells)
+            self.assertLess(len(in_memory ^ streaming), 0.002 * self.cells, method)
+
+
+if __name__ == '__main__':
+    unittest.main()